@@ -1,4 +1,5 @@
 import httpx
+import json
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any
@@ -8,14 +9,42 @@ class ExpiryTracker:
         self.api_url = api_url
         self.threshold_days = threshold_days
         self.logger = logging.getLogger(__name__)
+        # Last blob listing per account with its ETag / Last-Modified
+        self._listings: Dict[str, Dict[str, Any]] = {}
+
+    async def _fetch_blobs(self, client: httpx.AsyncClient, account_name: str) -> List[Dict[str, Any]]:
+        """Fetch an account's blobs, revalidating the previous listing if there is one"""
+        cached = self._listings.get(account_name)
+        headers = {}
+        if cached and cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = await client.get(
+            f"{self.api_url}/api/blob", params={"account": account_name}, headers=headers
+        )
+        if cached and response.status_code == 304:
+            return json.loads(cached["body"])
+
+        response.raise_for_status()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if isinstance(etag, str) or isinstance(last_modified, str):
+            self._listings[account_name] = {
+                "etag": etag if isinstance(etag, str) else None,
+                "last_modified": last_modified if isinstance(last_modified, str) else None,
+                "body": response.content,
+            }
+        else:
+            self._listings.pop(account_name, None)
+        return response.json()
 
     async def get_expiring_blobs(self, account_name: str) -> List[Dict[str, Any]]:
         """Fetch blobs that are expiring within the threshold"""
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.api_url}/api/blob", params={"account": account_name})
-                response.raise_for_status()
-                all_blobs = response.json()
+                all_blobs = await self._fetch_blobs(client, account_name)
 
                 expiring = []
                 now = datetime.now().astimezone()
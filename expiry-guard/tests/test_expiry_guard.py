@@ -2,6 +2,7 @@
 Tests for Expiry Guard - Tracker, Alerter, and Renewal
 """
 
+import httpx
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from datetime import datetime, timedelta
@@ -82,6 +83,34 @@ class TestExpiryTracker:
             result = await tracker.get_expiring_blobs("test-account")
             assert result == []
 
+    @pytest.mark.asyncio
+    async def test_get_expiring_blobs_revalidates_with_etag(self, tracker):
+        """Should send If-None-Match and reuse the cached listing on 304"""
+        expiring_date = (datetime.now() + timedelta(days=3)).isoformat()
+        request = httpx.Request("GET", "http://localhost:3000/api/blob")
+        full = httpx.Response(
+            200,
+            json=[{"id": "blob-1", "fileName": "a.txt", "expiresAt": expiring_date}],
+            headers={"ETag": '"v1"'},
+            request=request,
+        )
+        not_modified = httpx.Response(304, headers={"ETag": '"v1"'}, request=request)
+
+        with patch("expiry_monitor.tracker.httpx.AsyncClient") as mock_client:
+            instance = AsyncMock()
+            instance.get.side_effect = [full, not_modified]
+            instance.__aenter__ = AsyncMock(return_value=instance)
+            instance.__aexit__ = AsyncMock(return_value=None)
+            mock_client.return_value = instance
+
+            first = await tracker.get_expiring_blobs("test-account")
+            second = await tracker.get_expiring_blobs("test-account")
+
+            assert first == second
+            assert second[0]["id"] == "blob-1"
+            assert instance.get.call_args_list[0].kwargs["headers"] == {}
+            assert instance.get.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"v1"'}
+
 
 class TestExpiryAlerter:
     """Tests for ExpiryAlerter class"""
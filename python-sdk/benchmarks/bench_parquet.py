@@ -0,0 +1,126 @@
+"""
+Parquet projection benchmark for Shelby SDK
+Compares a column-projected read_parquet against a full download and read
+
+Usage:
+    python benchmarks/bench_parquet.py --columns 200 --select 3 --rows 20000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shelby_sdk import ShelbyClient, ShelbyConfig, UploadManager, DownloadManager
+from shelby_sdk.parquet import read_parquet
+from shelby_sdk.utils import format_size
+
+
+def start_server() -> tuple[subprocess.Popen, str]:
+    """Run the stand-in server in its own process"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "shelby_sdk.testing"],
+        cwd=Path(__file__).parent.parent,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    url = process.stdout.readline().strip()
+    return process, url
+
+
+async def traffic(url: str) -> dict:
+    """Read the server's body byte counters"""
+    async with httpx.AsyncClient() as session:
+        response = await session.get(f"{url}/_traffic")
+        return response.json()
+
+
+def write_dataset(path: str, columns: int, rows: int, row_group_size: int) -> None:
+    """Write a Parquet file of random float columns"""
+    rng = random.Random(0)
+    table = pa.table({
+        f"col_{i}": pa.array([rng.random() for _ in range(rows)]) for i in range(columns)
+    })
+    pq.write_table(table, path, row_group_size=row_group_size)
+
+
+async def measure(url: str, name: str, run) -> dict:
+    """Time a read and count the bytes the server sent for it"""
+    before = await traffic(url)
+    started = time.perf_counter()
+    table = await run()
+    seconds = time.perf_counter() - started
+    after = await traffic(url)
+    return {
+        "name": name,
+        "seconds": seconds,
+        "wire_down": after["sent"] - before["sent"],
+        "rows": table.num_rows,
+        "columns": table.num_columns,
+    }
+
+
+async def main() -> None:
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--columns", type=int, default=200, help="columns in the dataset")
+    parser.add_argument("--select", type=int, default=3, help="columns read back")
+    parser.add_argument("--rows", type=int, default=20000, help="rows in the dataset")
+    parser.add_argument("--row-group-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    selected = [f"col_{i}" for i in range(0, args.columns, max(1, args.columns // args.select))]
+    selected = selected[:args.select]
+
+    process, url = start_server()
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            source = os.path.join(workdir, "dataset.parquet")
+            write_dataset(source, args.columns, args.rows, args.row_group_size)
+            size = os.path.getsize(source)
+
+            async with ShelbyClient(ShelbyConfig(api_url=url, rpc_url=url)) as client:
+                result = await UploadManager(client).upload_file(source, account_name="bench")
+                blob_id = result["blob_id"]
+                downloader = DownloadManager(client)
+
+                async def full_download():
+                    output = os.path.join(workdir, "download.parquet")
+                    await downloader.download_file(blob_id, output, "bench")
+                    return pq.read_table(output, columns=selected)
+
+                async def projected():
+                    return await read_parquet(downloader, blob_id, "bench", columns=selected)
+
+                results = [
+                    await measure(url, "full", full_download),
+                    await measure(url, "projected", projected),
+                ]
+    finally:
+        process.terminate()
+        process.wait()
+
+    print(f"Dataset: {format_size(size)}, {args.columns} columns, {args.rows} rows; "
+          f"reading {len(selected)} columns\n")
+    print(f"{'read':<12}{'seconds':>10}{'wire down':>14}{'rows':>10}{'columns':>10}")
+    for r in results:
+        print(
+            f"{r['name']:<12}{r['seconds']:>10.2f}{format_size(r['wire_down']):>14}"
+            f"{r['rows']:>10}{r['columns']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+"""
+Chunk transport benchmark for Shelby SDK
+Compares hex JSON and binary chunk transfers against a local stand-in server
+
+Usage:
+    python benchmarks/bench_transfer.py --size-mb 64
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import httpx
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shelby_sdk import ShelbyClient, ShelbyConfig, UploadManager, DownloadManager
+from shelby_sdk.utils import format_size
+
+
+def start_server() -> tuple[subprocess.Popen, str]:
+    """Run the stand-in server in its own process so it doesn't skew memory numbers"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "shelby_sdk.testing"],
+        cwd=Path(__file__).parent.parent,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    url = process.stdout.readline().strip()
+    return process, url
+
+
+async def traffic(url: str) -> dict:
+    """Read the server's body byte counters"""
+    async with httpx.AsyncClient() as session:
+        response = await session.get(f"{url}/_traffic")
+        return response.json()
+
+
+async def run_mode(url: str, mode: str, source: str, workdir: str) -> dict:
+    """Upload then download the source file using one transfer mode"""
+    config = ShelbyConfig(api_url=url, rpc_url=url, transfer_mode=mode)
+    client = ShelbyClient(config)
+    uploader = UploadManager(client)
+    downloader = DownloadManager(client)
+    size = os.path.getsize(source)
+
+    before = await traffic(url)
+    tracemalloc.start()
+
+    started = time.perf_counter()
+    result = await uploader.upload_file(source, account_name="bench")
+    upload_seconds = time.perf_counter() - started
+    _, upload_peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+
+    started = time.perf_counter()
+    await downloader.download_file(
+        result["blob_id"], os.path.join(workdir, f"download-{mode}.bin"), "bench"
+    )
+    download_seconds = time.perf_counter() - started
+    _, download_peak = tracemalloc.get_traced_memory()
+
+    tracemalloc.stop()
+    after = await traffic(url)
+    await client.close()
+
+    return {
+        "mode": mode,
+        "upload_mbps": size / upload_seconds / 1024 / 1024,
+        "download_mbps": size / download_seconds / 1024 / 1024,
+        "upload_peak": upload_peak,
+        "download_peak": download_peak,
+        "wire_up": after["received"] - before["received"],
+        "wire_down": after["sent"] - before["sent"],
+    }
+
+
+async def main() -> None:
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=int, default=64, help="payload size in MB")
+    args = parser.parse_args()
+
+    process, url = start_server()
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            source = os.path.join(workdir, "payload.bin")
+            with open(source, "wb") as f:
+                f.write(os.urandom(args.size_mb * 1024 * 1024))
+
+            results = [await run_mode(url, mode, source, workdir) for mode in ("hex", "binary")]
+    finally:
+        process.terminate()
+        process.wait()
+
+    print(f"Payload: {args.size_mb} MB\n")
+    print(f"{'mode':<8}{'up MB/s':>10}{'down MB/s':>12}"
+          f"{'up peak':>12}{'down peak':>12}{'wire up':>12}{'wire down':>12}")
+    for r in results:
+        print(
+            f"{r['mode']:<8}{r['upload_mbps']:>10.1f}{r['download_mbps']:>12.1f}"
+            f"{format_size(r['upload_peak']):>12}{format_size(r['download_peak']):>12}"
+            f"{format_size(r['wire_up']):>12}{format_size(r['wire_down']):>12}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -61,6 +61,15 @@ async def download_dataset(
     print(f"📊 Dataset loaded: {len(df)} rows, {len(df.columns)} columns")
 
 
+def read_dataset_in_place(blob_id: str, account_name: str, config: ShelbyConfig):
+    """Read a dataset straight from Shelby, without a local copy
+
+    Needs `pip install shelby-sdk[fsspec]`.
+    """
+    df = pd.read_csv(f"shelby://{account_name}/{blob_id}", storage_options={"config": config})
+    print(f"📊 Dataset read in place: {len(df)} rows, {len(df.columns)} columns")
+
+
 async def main():
     """Main data science example"""
     config = ShelbyConfig.from_env()
@@ -103,6 +112,9 @@ async def main():
         output_path = "./downloaded_data.csv"
         await download_dataset(client, downloader, blob_id, output_path, account_name)
 
+        # Or skip the download and let pandas read the blob directly
+        await asyncio.to_thread(read_dataset_in_place, blob_id, account_name, config)
+
         print(f"\n✅ Data science workflow complete!")
         print(f"   Uploaded: {dataset_path}")
         print(f"   Downloaded: {output_path}")
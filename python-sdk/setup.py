@@ -38,6 +38,15 @@ setup(
         "aiofiles>=23.0",
     ],
     extras_require={
+        "http2": [
+            "httpx[http2]>=0.27.0",
+        ],
+        "fsspec": [
+            "fsspec>=2023.1.0",
+        ],
+        "parquet": [
+            "pyarrow>=12.0",
+        ],
         "dev": [
             "pytest>=7.0",
             "pytest-asyncio>=0.21.0",
@@ -46,4 +55,9 @@ setup(
             "ruff>=0.1.0",
         ],
     },
+    entry_points={
+        "fsspec.specs": [
+            "shelby = shelby_sdk.filesystem:ShelbyFileSystem",
+        ],
+    },
 )
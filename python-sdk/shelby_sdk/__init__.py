@@ -7,9 +7,23 @@ from .client import ShelbyClient
 from .config import ShelbyConfig
 from .upload import UploadManager
 from .download import DownloadManager
+from .reader import BlobReader
+from .blob import BlobManager
+from .account import AccountManager
+from .cache import MetadataCache
+from .journal import UploadJournal
+from .retry import RetryPolicy, RetryBudget
+from .breaker import CircuitBreaker
+from .ratelimit import RateLimiter, AdaptiveConcurrencyLimiter
+from .routing import EndpointRouter
+from .hedge import HedgePolicy
+from .chunk_cache import ChunkCache
+from .metrics import Metrics
+from .tracing import Tracer, JsonLinesExporter, InMemoryExporter
 from .exceptions import (
     ShelbyError,
     ShelbyConnectionError,
+    ShelbyCircuitOpenError,
     ShelbyUploadError,
     ShelbyDownloadError,
     ShelbyBlobError,
@@ -22,8 +36,26 @@ __all__ = [
     "ShelbyConfig",
     "UploadManager",
     "DownloadManager",
+    "BlobReader",
+    "BlobManager",
+    "AccountManager",
+    "MetadataCache",
+    "UploadJournal",
+    "RetryPolicy",
+    "RetryBudget",
+    "CircuitBreaker",
+    "RateLimiter",
+    "AdaptiveConcurrencyLimiter",
+    "EndpointRouter",
+    "HedgePolicy",
+    "ChunkCache",
+    "Metrics",
+    "Tracer",
+    "JsonLinesExporter",
+    "InMemoryExporter",
     "ShelbyError",
     "ShelbyConnectionError",
+    "ShelbyCircuitOpenError",
     "ShelbyUploadError",
     "ShelbyDownloadError",
     "ShelbyBlobError",
@@ -5,15 +5,22 @@ Handles account operations
 
 from typing import Optional, Dict, Any, List
 from .client import ShelbyClient
+from .cache import MetadataCache
 from .exceptions import ShelbyAccountError
 
 
 class AccountManager:
     """Handle account operations on Shelby network"""
 
-    def __init__(self, client: ShelbyClient):
-        """Initialize account manager"""
+    def __init__(self, client: ShelbyClient, cache: Optional[MetadataCache] = None):
+        """Initialize account manager
+
+        Args:
+            client: Shelby client to call the API through
+            cache: Optional metadata cache for get_account and get_address
+        """
         self.client = client
+        self.cache = cache
 
     async def list_accounts(self) -> List[Dict[str, Any]]:
         """List all accounts
@@ -38,12 +45,21 @@ class AccountManager:
         Returns:
             Account details including balance, address
         """
-        return await self.client._request(
+        if self.cache is not None:
+            cached: Optional[Dict[str, Any]] = self.cache.get("account", (account_name,))
+            if cached is not None:
+                return cached
+
+        account = await self.client._request(
             "GET",
             f"account/{account_name}",
             retries=self.client.config.max_retries,
         )
 
+        if self.cache is not None:
+            self.cache.set("account", (account_name,), account)
+        return account
+
     async def get_balance(self, account_name: str) -> Dict[str, Any]:
         """Get account balance
 
@@ -95,13 +111,18 @@ class AccountManager:
             Funding transaction result
         """
         # This would integrate with actual funding mechanism
-        return await self.client._request(
+        result = await self.client._request(
             "POST",
             f"account/{account_name}/fund",
             data={"amount": amount, "currency": currency},
             retries=self.client.config.max_retries,
         )
 
+        # Cached account details include the balance
+        if self.cache is not None:
+            self.cache.invalidate("account", (account_name,))
+        return result
+
     async def create_account(
         self,
         account_name: str,
@@ -5,21 +5,29 @@ Handles blob storage operations
 
 from typing import Optional, Dict, Any, List
 from .client import ShelbyClient
+from .cache import MetadataCache
 from .exceptions import ShelbyBlobError
 
 
 class BlobManager:
     """Handle blob operations on Shelby network"""
 
-    def __init__(self, client: ShelbyClient):
-        """Initialize blob manager"""
+    def __init__(self, client: ShelbyClient, cache: Optional[MetadataCache] = None):
+        """Initialize blob manager
+
+        Args:
+            client: Shelby client to call the API through
+            cache: Optional metadata cache for get_blob and get_blob_metadata
+        """
         self.client = client
+        self.cache = cache
 
     async def list_blobs(
         self,
         account_name: Optional[str] = None,
         limit: int = 100,
         offset: int = 0,
+        conditional: bool = False,
     ) -> List[Dict[str, Any]]:
         """List blobs
 
@@ -27,6 +35,7 @@ class BlobManager:
             account_name: Filter by account name
             limit: Maximum number of blobs to return
             offset: Pagination offset
+            conditional: Revalidate a previous listing instead of re-downloading it
 
         Returns:
             List of blob metadata
@@ -40,6 +49,7 @@ class BlobManager:
             "blob/list",
             params=params,
             retries=self.client.config.max_retries,
+            conditional=conditional,
         )
 
         return response.get("blobs", [])
@@ -53,12 +63,21 @@ class BlobManager:
         Returns:
             Blob metadata
         """
-        return await self.client._request(
+        if self.cache is not None:
+            cached: Optional[Dict[str, Any]] = self.cache.get("blob", (blob_id,))
+            if cached is not None:
+                return cached
+
+        blob = await self.client._request(
             "GET",
             f"blob/{blob_id}",
             retries=self.client.config.max_retries,
         )
 
+        if self.cache is not None:
+            self.cache.set("blob", (blob_id,), blob)
+        return blob
+
     async def get_blob_metadata(
         self,
         blob_id: str,
@@ -73,13 +92,24 @@ class BlobManager:
         Returns:
             Detailed metadata including expiry, size, hash
         """
-        return await self.client._request(
+        if self.cache is not None:
+            cached: Optional[Dict[str, Any]] = self.cache.get(
+                "blob_metadata", (blob_id, account_name)
+            )
+            if cached is not None:
+                return cached
+
+        metadata = await self.client._request(
             "GET",
             f"blob/{blob_id}/metadata",
             params={"account": account_name},
             retries=self.client.config.max_retries,
         )
 
+        if self.cache is not None:
+            self.cache.set("blob_metadata", (blob_id, account_name), metadata)
+        return metadata
+
     async def delete_blob(self, blob_id: str, account_name: str) -> bool:
         """Delete a blob
 
@@ -96,6 +126,7 @@ class BlobManager:
             params={"account": account_name},
             retries=self.client.config.max_retries,
         )
+        self._invalidate(blob_id)
         return True
 
     async def update_blob_metadata(
@@ -114,13 +145,21 @@ class BlobManager:
         Returns:
             Updated blob metadata
         """
-        return await self.client._request(
+        updated = await self.client._request(
             "PUT",
             f"blob/{blob_id}/metadata",
             params={"account": account_name},
             data={"metadata": metadata},
             retries=self.client.config.max_retries,
         )
+        self._invalidate(blob_id)
+        return updated
+
+    def _invalidate(self, blob_id: str) -> None:
+        """Drop every cached entry for a blob"""
+        if self.cache is not None:
+            self.cache.invalidate("blob", (blob_id,))
+            self.cache.invalidate("blob_metadata", (blob_id,))
 
     async def check_blob_expiry(self, blob_id: str) -> Dict[str, Any]:
         """Check if blob is expired or nearing expiry
@@ -0,0 +1,93 @@
+"""
+Circuit breaker for Shelby SDK
+Fails requests fast while an endpoint family is known to be unhealthy
+"""
+
+import time
+from typing import Dict, Any
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def endpoint_family(endpoint: str) -> str:
+    """Group an endpoint by its first path segment, e.g. blob/123/chunk/0 -> blob"""
+    return endpoint.strip("/").split("/", 1)[0] or "root"
+
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker
+
+    Closed: requests flow; consecutive failures are counted.
+    Open: after failure_threshold consecutive failures requests are
+    rejected until reset_timeout seconds have passed.
+    Half-open: up to half_open_max_calls trial requests are let through;
+    a success closes the circuit, a failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        """Initialize a closed breaker"""
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the timeout passes"""
+        if self._state == OPEN and self.retry_in() == 0:
+            self._state = HALF_OPEN
+            self._trials = 0
+        return self._state
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a trial request through"""
+        if self._state != OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent, reserving a trial slot if half-open"""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._trials < self.half_open_max_calls:
+            self._trials += 1
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Record a request that reached a healthy server"""
+        self._state = CLOSED
+        self._failures = 0
+        self._trials = 0
+
+    def record_failure(self) -> None:
+        """Record a request that failed because the server is unhealthy"""
+        self._failures += 1
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self._state = OPEN
+            self._opened_at = time.monotonic()
+            self._trials = 0
+
+    def release(self) -> None:
+        """Give back a trial slot for a request that ended without a verdict"""
+        if self._state == HALF_OPEN and self._trials > 0:
+            self._trials -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Inspectable view of the breaker"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "retry_in": self.retry_in(),
+        }
@@ -0,0 +1,96 @@
+"""
+Metadata cache for Shelby SDK
+In-memory TTL + LRU cache for blob and account lookups
+"""
+
+import copy
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+DEFAULT_TTLS = {
+    "blob": 60.0,
+    "blob_metadata": 60.0,
+    "account": 300.0,
+}
+
+
+class MetadataCache:
+    """Bounded LRU cache whose entries expire after a per-resource TTL
+
+    Entries are keyed by a resource name ("blob", "blob_metadata",
+    "account", ...) plus a key tuple. Values are copied on the way in and
+    out, so callers can't mutate what is cached.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 60.0,
+    ):
+        """Initialize the cache
+
+        Args:
+            max_entries: Entries kept before least recently used ones are evicted
+            ttls: Seconds entries of each resource stay fresh, overriding DEFAULT_TTLS
+            default_ttl: TTL for resources missing from ttls
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[Tuple[str, tuple], Tuple[float, Any]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, resource: str, key: tuple) -> Optional[Any]:
+        """Get a fresh cached value, or None on a miss"""
+        entry_key = (resource, key)
+        entry = self._entries.get(entry_key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[entry_key]
+            self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(entry_key)
+        self._stats["hits"] += 1
+        return copy.deepcopy(value)
+
+    def set(self, resource: str, key: tuple, value: Any) -> None:
+        """Cache a value, evicting the least recently used entry if full"""
+        ttl = self.ttls.get(resource, self.default_ttl)
+        entry_key = (resource, key)
+        self._entries[entry_key] = (time.monotonic() + ttl, copy.deepcopy(value))
+        self._entries.move_to_end(entry_key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def invalidate(self, resource: str, key_prefix: tuple = ()) -> int:
+        """Drop entries of a resource whose key starts with key_prefix
+
+        Returns:
+            Number of entries removed
+        """
+        stale = [
+            entry_key for entry_key in self._entries
+            if entry_key[0] == resource and entry_key[1][:len(key_prefix)] == key_prefix
+        ]
+        for entry_key in stale:
+            del self._entries[entry_key]
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        self._entries.clear()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss, eviction and expiration counts plus current size"""
+        return {**self._stats, "size": len(self._entries)}
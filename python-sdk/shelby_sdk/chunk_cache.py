@@ -0,0 +1,186 @@
+"""
+Chunk cache for Shelby SDK
+On-disk, content-addressed cache of downloaded chunks shared between processes
+"""
+
+import hashlib
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Optional, Dict, Iterator, List, Tuple
+from .metrics import Metrics
+from .utils import ensure_config_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process eviction lock
+    fcntl = None  # type: ignore[assignment]
+
+_TMP_SUFFIX = ".tmp"
+_STALE_TMP_AGE = 3600  # Seconds before an abandoned temp file is removed
+_RESULTS = {"hits": "hit", "misses": "miss"}  # Stat -> metric label
+
+
+class ChunkCache:
+    """Chunks stored by their SHA-256 under <directory>/<hash[:2]>/<hash>
+
+    Writes go to a temp file that is atomically renamed into place, so
+    readers never see partial chunks and several processes can share one
+    directory. Reads re-verify the hash, so a corrupted file is a miss.
+    Once the cache grows past max_bytes, least recently used chunks (by
+    mtime, refreshed on every hit) are evicted down to 90% of the budget
+    under an exclusive file lock.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_bytes: int = 10 * 1024 * 1024 * 1024,
+        metrics: Optional[Metrics] = None,
+    ):
+        """Open (and create if needed) a cache directory
+
+        Args:
+            directory: Cache location (default ~/.shelby/chunks)
+            max_bytes: Byte budget for cached chunks
+            metrics: Registry to count hits, misses and evictions in
+        """
+        if directory is None:
+            directory = str(ensure_config_dir() / "chunks")
+        self.directory = os.path.expanduser(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.metrics = metrics
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "evicted_bytes": 0}
+        self._size = sum(size for _, size, _ in self._entries())
+
+    def _path(self, chunk_hash: str) -> str:
+        return os.path.join(self.directory, chunk_hash[:2], chunk_hash)
+
+    def _count(self, stat: str, amount: int = 1) -> None:
+        self.stats[stat] += amount
+        if self.metrics is not None:
+            if stat in _RESULTS:
+                self.metrics.inc("shelby_chunk_cache_requests_total", amount, result=_RESULTS[stat])
+            elif stat == "evictions":
+                self.metrics.inc("shelby_chunk_cache_evictions_total", amount)
+
+    def get(self, chunk_hash: str) -> Optional[bytes]:
+        """Get a cached chunk, or None if it is missing or corrupt"""
+        path = self._path(chunk_hash)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+
+        if hashlib.sha256(data).hexdigest() != chunk_hash:
+            self._remove(path)
+            self._count("misses")
+            return None
+
+        try:
+            os.utime(path)  # Mark as recently used
+        except FileNotFoundError:
+            pass  # Evicted by another process meanwhile; the data is still good
+        self._count("hits")
+        return data
+
+    def put(self, chunk_hash: str, data: bytes) -> None:
+        """Store a chunk whose SHA-256 is chunk_hash"""
+        path = self._path(chunk_hash)
+        if os.path.exists(path):
+            return
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}{_TMP_SUFFIX}"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        self._size += len(data)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self, target_bytes: Optional[int] = None) -> int:
+        """Remove least recently used chunks until the cache fits
+
+        Args:
+            target_bytes: Size to shrink to (default 90% of max_bytes)
+
+        Returns:
+            Number of chunks removed
+        """
+        if target_bytes is None:
+            target_bytes = int(self.max_bytes * 0.9)
+
+        with self._lock():
+            # Rescan: other processes add and evict too
+            entries = sorted(self._entries(), key=lambda entry: entry[2])
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for path, size, _ in entries:
+                if total <= target_bytes:
+                    break
+                if self._remove(path):
+                    total -= size
+                    removed += 1
+                    self._count("evictions")
+                    self._count("evicted_bytes", size)
+            self._size = total
+        return removed
+
+    def clear(self) -> None:
+        """Remove every cached chunk"""
+        self.evict(target_bytes=0)
+
+    @property
+    def size(self) -> int:
+        """Approximate bytes cached, including other processes' writes at last scan"""
+        return self._size
+
+    def _entries(self) -> List[Tuple[str, int, float]]:
+        """(path, size, mtime) of cached chunks; also drops abandoned temp files"""
+        entries = []
+        now = time.time()
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if entry.name.endswith(_TMP_SUFFIX):
+                    if now - stat.st_mtime > _STALE_TMP_AGE:
+                        self._remove(entry.path)
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        """Exclusive lock on the cache directory across processes"""
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.directory, ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def snapshot(self) -> Dict[str, int]:
+        """Counters plus the current size"""
+        return {**self.stats, "size": self._size}
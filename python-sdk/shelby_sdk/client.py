@@ -5,76 +5,654 @@ Main Shelby SDK Client
 import httpx
 from typing import Optional, Dict, Any
 from .config import ShelbyConfig
-from .exceptions import ShelbyConnectionError, ShelbyError
+from .exceptions import ShelbyConnectionError, ShelbyCircuitOpenError, ShelbyError
+from .retry import RetryPolicy, RetryBudget
+from .breaker import CircuitBreaker, endpoint_family
+from .ratelimit import RateLimiter, AdaptiveConcurrencyLimiter, TransferWindow
+from .routing import EndpointRouter
+from .metrics import Metrics, tracked
+from .tracing import Tracer, JsonLinesExporter, add_to_span
 import json
+import copy
 import asyncio
+import os
+import time
+from collections import OrderedDict
 
 
 class ShelbyClient:
     """Main client for interacting with Shelby Protocol"""
 
-    def __init__(self, config: ShelbyConfig):
-        """Initialize the Shelby client"""
+    # Responses kept for conditional GETs, least recently used dropped first
+    MAX_VALIDATED_RESPONSES = 128
+
+    def __init__(
+        self,
+        config: ShelbyConfig,
+        metrics: Optional[Metrics] = None,
+        tracer: Optional[Tracer] = None,
+    ):
+        """Initialize the Shelby client
+
+        Args:
+            config: Client configuration
+            metrics: Registry to record metrics in (default: a new one if
+                config.metrics is set, otherwise metrics are off)
+            tracer: Tracer for transfer spans (default: one writing to
+                config.trace_file if set, otherwise tracing is off)
+        """
         self.config = config
+        if metrics is None and config.metrics:
+            metrics = Metrics()
+        self.metrics = metrics
+        self._trace_exporter: Optional[JsonLinesExporter] = None
+        if tracer is None and config.trace_file:
+            self._trace_exporter = JsonLinesExporter(os.path.expanduser(config.trace_file))
+            tracer = Tracer(self._trace_exporter)
+        self.tracer = tracer
         self.session = httpx.AsyncClient(
-            timeout=config.timeout,
+            timeout=self._build_timeout(config),
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            http2=config.http2,
             verify=config.verify_ssl,
         )
+        self._capabilities: Optional[Dict[str, Any]] = None
+        self.retry_policy = RetryPolicy(
+            max_retries=config.max_retries,
+            base_delay=config.retry_base_delay,
+            max_delay=config.retry_max_delay,
+        )
+        self.retry_budget = RetryBudget(ratio=config.retry_budget_ratio)
+        self.retry_stats = {"attempts": 0, "retries": 0, "give_ups": 0, "budget_exhausted": 0}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self.coalesced_requests = 0
+        self._validated: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self.not_modified_responses = 0
+        self.rate_limiter: Optional[RateLimiter] = None
+        if config.requests_per_second or config.bytes_per_second or config.rate_limits:
+            self.rate_limiter = RateLimiter(
+                requests_per_second=config.requests_per_second,
+                bytes_per_second=config.bytes_per_second,
+                overrides=config.rate_limits,
+            )
+        self.concurrency_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+        self.router = EndpointRouter(
+            config.api_urls,
+            failure_threshold=config.endpoint_failure_threshold,
+            ejection_time=config.endpoint_ejection_time,
+        )
+        self._pins: Dict[str, str] = {}
+        self._probe_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _build_timeout(config: ShelbyConfig) -> httpx.Timeout:
+        """Per-phase timeouts, each falling back to config.timeout"""
+        def phase(value: Optional[float]) -> float:
+            return config.timeout if value is None else value
+
+        return httpx.Timeout(
+            config.timeout,
+            connect=phase(config.connect_timeout),
+            read=phase(config.read_timeout),
+            write=phase(config.write_timeout),
+            pool=phase(config.pool_timeout),
+        )
+
+    async def __aenter__(self) -> "ShelbyClient":
+        if self.config.prewarm_connections > 0:
+            await self.prewarm()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def prewarm(self, connections: Optional[int] = None) -> int:
+        """Open pooled connections ahead of the first real request
+
+        Issues concurrent health checks so each one needs its own
+        connection. Only up to max_keepalive_connections stay pooled.
+
+        Args:
+            connections: How many to open (default config.prewarm_connections)
+
+        Returns:
+            Number of connections that opened successfully
+        """
+        count = connections if connections is not None else self.config.prewarm_connections
+        count = min(count, self.config.max_keepalive_connections)
+        urls = self.router.urls
+        results = await asyncio.gather(
+            *(self.health_check(urls[i % len(urls)]) for i in range(count))
+        )
+        return sum(results)
 
     async def _request(
         self,
         method: str,
         endpoint: str,
         data: Optional[Dict[str, Any]] = None,
-        retries: int = 0,
+        retries: Optional[int] = None,
+        params: Optional[Dict[str, Any]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        conditional: bool = False,
+        api_url: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Make HTTP request with retry logic"""
-        url = f"{self.config.api_url}/{endpoint.lstrip('/')}"
+        """Make JSON HTTP request with retry logic
 
-        for attempt in range(retries + 1):
-            try:
-                if method.upper() == "GET":
-                    response = await self.session.get(url, params=data)
-                elif method.upper() == "POST":
-                    response = await self.session.post(url, json=data)
-                elif method.upper() == "PUT":
-                    response = await self.session.put(url, json=data)
-                elif method.upper() == "DELETE":
-                    response = await self.session.delete(url)
-                else:
-                    raise ShelbyError(f"Unsupported method: {method}")
+        Identical GETs already in flight are coalesced: one network call
+        serves every caller, and its error, if any, reaches all of them.
+        GETs only count as identical with the same retry settings and
+        conditional flag.
+
+        Args:
+            conditional: For GETs, keep the body with its ETag/Last-Modified
+                and revalidate on later calls; a 304 reuses the kept body
+            api_url: Send to this endpoint instead of routing the request
+        """
+        if method.upper() == "GET" and data is not None:
+            params = {**(params or {}), **data}
+            data = None
 
-                response.raise_for_status()
-                return response.json()
+        if method.upper() != "GET":
+            response = await self._send(
+                method,
+                endpoint,
+                params=params,
+                json_data=data,
+                retries=retries,
+                retry_policy=retry_policy,
+                api_url=api_url,
+            )
+            result: Dict[str, Any] = response.json()
+            return result
 
-            except httpx.HTTPStatusError as e:
-                if attempt == retries:
-                    raise ShelbyConnectionError(
-                        f"Request failed after {retries} retries: {e}"
+        key = (
+            api_url,
+            endpoint.strip("/"),
+            tuple(sorted((k, str(v)) for k, v in (params or {}).items())),
+        )
+        if not self.config.coalesce_gets:
+            return await self._get_json(
+                key, endpoint, params, retries, retry_policy, conditional, api_url
+            )
+
+        # Calls that retry or revalidate differently don't share a result.
+        # The policy is keyed by identity; the in-flight call keeps it alive.
+        inflight_key = (
+            key, retries, None if retry_policy is None else id(retry_policy), conditional
+        )
+        shared = self._inflight.get(inflight_key)
+        if shared is None:
+            shared = asyncio.ensure_future(
+                self._get_json(key, endpoint, params, retries, retry_policy, conditional, api_url)
+            )
+            self._inflight[inflight_key] = shared
+            shared.add_done_callback(lambda task: self._finish_inflight(inflight_key, task))
+        else:
+            self.coalesced_requests += 1
+
+        # Shielded so a cancelled caller doesn't cancel the call others wait on.
+        # Every caller, the one that started the call included, gets its own
+        # copy: callers resume in any order and may change what they got.
+        result = await asyncio.shield(shared)
+        return copy.deepcopy(result)
+
+    async def _get_json(
+        self,
+        key: tuple,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        retries: Optional[int],
+        retry_policy: Optional[RetryPolicy],
+        conditional: bool = False,
+        api_url: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """GET an endpoint and parse its JSON body, revalidating if conditional"""
+        validated = self._validated.get(key) if conditional else None
+        headers = None
+        if validated is not None:
+            headers = {}
+            if validated["etag"]:
+                headers["If-None-Match"] = validated["etag"]
+            if validated["last_modified"]:
+                headers["If-Modified-Since"] = validated["last_modified"]
+
+        response = await self._send(
+            "GET",
+            endpoint,
+            params=params,
+            headers=headers,
+            retries=retries,
+            retry_policy=retry_policy,
+            api_url=api_url,
+        )
+
+        if validated is not None and response.status_code == 304:
+            self.not_modified_responses += 1
+            self._validated.move_to_end(key)
+            # Re-parsed rather than shared so callers can't mutate the kept copy
+            body: Dict[str, Any] = json.loads(validated["body"])
+            return body
+
+        if conditional:
+            self._remember_validators(key, response)
+        body = response.json()
+        return body
+
+    def _remember_validators(self, key: tuple, response: httpx.Response) -> None:
+        """Keep a response body with its validators for later revalidation"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not isinstance(etag, str) and not isinstance(last_modified, str):
+            self._validated.pop(key, None)
+            return
+
+        self._validated[key] = {
+            "etag": etag if isinstance(etag, str) else None,
+            "last_modified": last_modified if isinstance(last_modified, str) else None,
+            "body": response.content,
+        }
+        self._validated.move_to_end(key)
+        while len(self._validated) > self.MAX_VALIDATED_RESPONSES:
+            self._validated.popitem(last=False)
+
+    def _finish_inflight(self, key: tuple, task: asyncio.Future) -> None:
+        """Forget a finished shared GET"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved here in case every waiter was cancelled
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_data: Optional[Dict[str, Any]] = None,
+        content: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        retries: Optional[int] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        api_url: Optional[str] = None,
+    ) -> httpx.Response:
+        """Send HTTP request with retry logic and return the raw response
+
+        Each attempt is routed to the best endpoint, and a retry avoids the
+        endpoint the failed attempt went to.
+
+        Args:
+            retries: Maximum retries for this call (default: the policy's)
+            retry_policy: Policy overriding self.retry_policy for this call
+            api_url: Send every attempt to this endpoint instead of routing
+        """
+        self._ensure_health_probes()
+        policy = retry_policy or self.retry_policy
+        max_retries = policy.max_retries if retries is None else retries
+        family = endpoint_family(endpoint)
+        breaker = self._breaker_for(endpoint)
+        limiter = self._concurrency_limiter_for(family)
+        self.retry_budget.record_request()
+
+        attempt = 0
+        failed_url = None
+        last_error: Optional[ShelbyConnectionError] = None
+        while True:
+            base_url = api_url or self.router.choose(exclude=failed_url)
+            url = f"{base_url}/{endpoint.lstrip('/')}"
+            if breaker is not None and not breaker.allow_request():
+                if last_error is not None:
+                    # This call's own failures opened the circuit; report them
+                    self.retry_stats["give_ups"] += 1
+                    raise last_error
+                raise ShelbyCircuitOpenError(family, breaker.retry_in())
+            if attempt > 0:
+                self.retry_stats["retries"] += 1
+                add_to_span("retries")
+                if self.metrics is not None:
+                    self.metrics.inc("shelby_request_retries_total", endpoint=family)
+
+            started_at = None
+            try:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire(
+                        family, self._body_size(family, json_data, content)
                     )
-                await asyncio.sleep(2 ** attempt)
+                if limiter is not None:
+                    await limiter.acquire()
+                started_at = time.monotonic()
 
-            except httpx.RequestError as e:
-                if attempt == retries:
-                    raise ShelbyConnectionError(
-                        f"Connection error after {retries} retries: {e}"
+                self.retry_stats["attempts"] += 1
+                with tracked(self.metrics, "shelby_requests_in_flight", endpoint=family):
+                    response = await self._dispatch(
+                        method, url, params, json_data, content, headers
                     )
-                await asyncio.sleep(2 ** attempt)
+                # 304 answers a conditional request; the caller reuses its copy
+                if response.status_code != 304:
+                    response.raise_for_status()
+            except (httpx.HTTPStatusError, httpx.RequestError) as e:
+                error = e
+            except BaseException:
+                if breaker is not None:
+                    breaker.release()
+                if limiter is not None and started_at is not None:
+                    limiter.release()
+                raise
+            else:
+                if self.metrics is not None:
+                    self._record_attempt(family, method, started_at, response)
+                if breaker is not None:
+                    breaker.record_success()
+                if limiter is not None:
+                    limiter.release(started_at)
+                self.router.record_success(base_url, time.monotonic() - started_at)
+                if self.rate_limiter is not None and isinstance(response.content, bytes):
+                    self.rate_limiter.charge_bytes(family, len(response.content))
+                return response
+
+            if self.metrics is not None and started_at is not None:
+                self._record_attempt(
+                    family, method, started_at, getattr(error, "response", None), error
+                )
+
+            # Only failures worth retrying say anything about server health
+            retryable = policy.is_retryable(error)
+            if breaker is not None:
+                if retryable:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            if retryable:
+                self.router.record_failure(base_url)
+                failed_url = base_url
+            else:
+                self.router.record_success(base_url)
+            if limiter is not None:
+                limiter.release(started_at, overloaded=self._is_overload(error))
+
+            status_code = None
+            if isinstance(error, httpx.HTTPStatusError):
+                status_code = error.response.status_code
+                description = f"Request failed after {attempt} retries: {error}"
+            else:
+                description = f"Connection error after {attempt} retries: {error}"
+
+            if not retryable:
+                raise ShelbyConnectionError(description, status_code=status_code) from error
+            if attempt >= max_retries:
+                self.retry_stats["give_ups"] += 1
+                raise ShelbyConnectionError(description, status_code=status_code) from error
+            if not self.retry_budget.try_acquire():
+                self.retry_stats["give_ups"] += 1
+                self.retry_stats["budget_exhausted"] += 1
+                raise ShelbyConnectionError(
+                    f"Retry budget exhausted: {description}", status_code=status_code
+                ) from error
+
+            last_error = ShelbyConnectionError(description, status_code=status_code)
+            last_error.__cause__ = error
+            await asyncio.sleep(policy.delay(attempt, error))
+            attempt += 1
+
+    def _record_attempt(
+        self,
+        family: str,
+        method: str,
+        started_at: float,
+        response: Optional[httpx.Response],
+        error: Optional[Exception] = None,
+    ) -> None:
+        """Record latency and body bytes of one HTTP attempt"""
+        metrics = self.metrics
+        if metrics is None:
+            return
+        status = str(response.status_code) if response is not None else "error"
+        metrics.observe(
+            "shelby_request_duration_seconds",
+            time.monotonic() - started_at,
+            endpoint=family,
+            method=method.upper(),
+            status=status,
+        )
 
-    async def health_check(self) -> bool:
-        """Check if the API is healthy"""
         try:
-            response = await self.session.get(f"{self.config.api_url}/health")
+            # httpx raises RuntimeError for an error without a request
+            request = getattr(response if response is not None else error, "request", None)
+        except RuntimeError:
+            request = None
+        sent = getattr(request, "content", None)
+        if isinstance(sent, bytes) and sent:
+            metrics.inc("shelby_bytes_sent_total", len(sent), endpoint=family)
+        received = getattr(response, "content", None)
+        if isinstance(received, bytes) and received:
+            metrics.inc("shelby_bytes_received_total", len(received), endpoint=family)
+
+    def _breaker_for(self, endpoint: str) -> Optional[CircuitBreaker]:
+        """Get (creating on first use) the breaker for an endpoint's family"""
+        if not self.config.circuit_breaker:
+            return None
+
+        family = endpoint_family(endpoint)
+        if family not in self.breakers:
+            self.breakers[family] = CircuitBreaker(
+                failure_threshold=self.config.breaker_failure_threshold,
+                reset_timeout=self.config.breaker_reset_timeout,
+                half_open_max_calls=self.config.breaker_half_open_max_calls,
+            )
+        return self.breakers[family]
+
+    def breaker_states(self) -> Dict[str, Dict[str, Any]]:
+        """Circuit breaker state per endpoint family (upload, blob, account, ...)"""
+        return {family: breaker.snapshot() for family, breaker in self.breakers.items()}
+
+    def _concurrency_limiter_for(self, family: str) -> Optional[AdaptiveConcurrencyLimiter]:
+        """Get (creating on first use) the adaptive concurrency limit of a family"""
+        if not self.config.adaptive_concurrency:
+            return None
+
+        if family not in self.concurrency_limiters:
+            self.concurrency_limiters[family] = AdaptiveConcurrencyLimiter(
+                initial_limit=self.config.max_concurrent_chunks,
+                max_limit=self.config.adaptive_max_concurrency,
+            )
+        return self.concurrency_limiters[family]
+
+    def transfer_concurrency(self) -> int:
+        """Chunk transfers a single file may have in flight
+
+        With adaptive concurrency the family limits decide how many of them
+        are actually sent, so worker pools are sized to the limits' ceiling
+        instead of capping them at max_concurrent_chunks.
+        """
+        if self.config.adaptive_concurrency:
+            return max(1, self.config.adaptive_max_concurrency)
+        return max(1, self.config.max_concurrent_chunks)
+
+    def transfer_window(self, family: str) -> TransferWindow:
+        """Window bounding the chunks a transfer holds in memory
+
+        It follows the family's adaptive limit when there is one, so a
+        throttled transfer holds as few chunks as it may send.
+        """
+        return TransferWindow(self.transfer_concurrency(), self._concurrency_limiter_for(family))
+
+    def select_endpoint(self) -> str:
+        """URL of the endpoint the next request would be routed to"""
+        return self.router.choose()
+
+    def endpoint_states(self) -> Dict[str, Dict[str, Any]]:
+        """Latency and ejection state per API endpoint"""
+        return self.router.snapshot()
+
+    def pin(self, key: str, api_url: str) -> None:
+        """Remember that requests about key (e.g. an upload ID) go to api_url"""
+        self._pins[key] = api_url
+
+    def pinned(self, key: str) -> Optional[str]:
+        """Endpoint pinned for key, or None to route normally"""
+        return self._pins.get(key)
+
+    def unpin(self, key: str) -> None:
+        """Forget a pin"""
+        self._pins.pop(key, None)
+
+    def _ensure_health_probes(self) -> None:
+        """Start background health probes once there is more than one endpoint"""
+        if (
+            self._probe_task is None
+            and len(self.router.endpoints) > 1
+            and self.config.health_probe_interval > 0
+        ):
+            self._probe_task = asyncio.ensure_future(self._probe_loop())
+
+    async def _probe_loop(self) -> None:
+        """Probe every endpoint each health_probe_interval seconds"""
+        while True:
+            await self.probe_endpoints()
+            await asyncio.sleep(self.config.health_probe_interval)
+
+    async def probe_endpoints(self) -> Dict[str, bool]:
+        """Health check every endpoint now, feeding the results to the router
+
+        Returns:
+            Health per endpoint URL
+        """
+        async def probe(url: str) -> bool:
+            started_at = time.monotonic()
+            healthy = await self.health_check(url)
+            if healthy:
+                self.router.record_success(url, time.monotonic() - started_at)
+            else:
+                self.router.record_failure(url)
+            return healthy
+
+        urls = self.router.urls
+        results = await asyncio.gather(*(probe(url) for url in urls))
+        return dict(zip(urls, results))
+
+    def concurrency_states(self) -> Dict[str, Dict[str, Any]]:
+        """Adaptive concurrency limit per endpoint family"""
+        return {family: limiter.snapshot() for family, limiter in self.concurrency_limiters.items()}
+
+    def _body_size(
+        self,
+        family: str,
+        json_data: Optional[Dict[str, Any]],
+        content: Optional[bytes],
+    ) -> int:
+        """Request body size, measured only when the family has a bytes/sec limit"""
+        if self.rate_limiter is None or not self.rate_limiter.limits_bytes(family):
+            return 0
+        if content is not None:
+            return len(content)
+        if json_data is not None:
+            return len(json.dumps(json_data))
+        return 0
+
+    @staticmethod
+    def _is_overload(error: Exception) -> bool:
+        """Check whether a failure means the server is over capacity"""
+        if isinstance(error, httpx.HTTPStatusError):
+            status_code = error.response.status_code
+            return status_code == 429 or 500 <= status_code < 600
+        return isinstance(error, httpx.TimeoutException)
+
+    async def _dispatch(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        json_data: Optional[Dict[str, Any]],
+        content: Optional[bytes],
+        headers: Optional[Dict[str, str]],
+    ) -> httpx.Response:
+        """Issue a single HTTP attempt"""
+        if method.upper() == "GET":
+            return await self.session.get(url, params=params, headers=headers)
+        elif method.upper() == "POST":
+            return await self.session.post(
+                url, params=params, json=json_data, content=content, headers=headers
+            )
+        elif method.upper() == "PUT":
+            return await self.session.put(
+                url, params=params, json=json_data, content=content, headers=headers
+            )
+        elif method.upper() == "DELETE":
+            return await self.session.delete(url, params=params, headers=headers)
+        else:
+            raise ShelbyError(f"Unsupported method: {method}")
+
+    async def health_check(self, api_url: Optional[str] = None) -> bool:
+        """Check if the API is healthy
+
+        Args:
+            api_url: Endpoint to check (default: the one requests go to now)
+        """
+        try:
+            response = await self.session.get(f"{api_url or self.select_endpoint()}/health")
             return response.status_code == 200
         except Exception:
             return False
 
-    async def get_stats(self) -> Dict[str, Any]:
-        """Get platform statistics"""
-        return await self._request("GET", "stats")
+    async def get_capabilities(self) -> Dict[str, Any]:
+        """Get optional protocol features supported by the API
 
-    async def close(self):
-        """Close the HTTP session"""
-        await self.session.aclose()
+        Servers without a capabilities endpoint are treated as supporting
+        none. The answer is cached for the lifetime of the client.
 
+        Returns:
+            Capability flags, e.g. {"binary_chunks": True}
+        """
+        if self._capabilities is not None:
+            return self._capabilities
 
+        try:
+            response = await self.session.get(f"{self.select_endpoint()}/capabilities")
+            response.raise_for_status()
+            capabilities = response.json()
+        except httpx.RequestError:
+            # Transient - don't pin the client to the legacy protocol
+            return {}
+        except (httpx.HTTPStatusError, ValueError):
+            capabilities = {}
+
+        self._capabilities = capabilities if isinstance(capabilities, dict) else {}
+        return self._capabilities
+
+    async def supports_binary_transfer(self) -> bool:
+        """Check whether chunks can be sent as application/octet-stream
+
+        Honors config.transfer_mode ("binary" or "hex") and negotiates with
+        the server when it is "auto".
+        """
+        if self.config.transfer_mode != "auto":
+            return self.config.transfer_mode == "binary"
+
+        capabilities = await self.get_capabilities()
+        return bool(capabilities.get("binary_chunks"))
+
+    def disable_binary_transfer(self) -> None:
+        """Fall back to hex JSON chunks after the server rejected binary ones"""
+        self._capabilities = {**(self._capabilities or {}), "binary_chunks": False}
+
+    async def get_stats(self, conditional: bool = False) -> Dict[str, Any]:
+        """Get platform statistics
+
+        Args:
+            conditional: Revalidate a previous answer instead of re-downloading it
+        """
+        return await self._request("GET", "stats", conditional=conditional)
+
+    async def close(self) -> None:
+        """Close the HTTP session"""
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
+        if self._trace_exporter is not None:
+            self._trace_exporter.close()
+            self._trace_exporter = None
+        await self.session.aclose()
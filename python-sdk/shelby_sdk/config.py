@@ -2,8 +2,8 @@
 Configuration module for Shelby SDK
 """
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, asdict, field
+from typing import Optional, Dict, List, Union
 import os
 import yaml
 
@@ -12,21 +12,111 @@ import yaml
 class ShelbyConfig:
     """Configuration for Shelby SDK client"""
 
-    api_url: str
+    api_url: Union[str, List[str]]  # One endpoint or several to route across
     rpc_url: str
     timeout: int = 30
     max_retries: int = 3
     verify_ssl: bool = True
+    retry_base_delay: float = 0.5  # Full-jitter backoff cap for the first retry
+    retry_max_delay: float = 30.0
+    retry_budget_ratio: float = 0.2  # Retries allowed per request sent
+    circuit_breaker: bool = False  # Fail fast per endpoint family during outages
+    breaker_failure_threshold: int = 5  # Consecutive failures that open a circuit
+    breaker_reset_timeout: float = 30.0  # Seconds before a half-open trial
+    breaker_half_open_max_calls: int = 1
+    coalesce_gets: bool = True  # Share one call among identical in-flight GETs
+    max_concurrent_chunks: int = 4  # Chunk transfers in flight per file
+    chunk_retries: int = 1  # Extra attempts for a chunk after _request gives up
+    transfer_mode: str = "auto"  # Chunk encoding: "auto", "binary" or "hex"
+    max_concurrent_files: int = 4  # Files in flight during batch operations
+    max_batch_bytes_in_flight: int = 1024 * 1024 * 1024  # Batch upload byte budget
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 5.0  # Seconds an idle connection stays pooled
+    http2: bool = False  # Requires the http2 extra
+    connect_timeout: Optional[float] = None  # Phase timeouts default to timeout
+    read_timeout: Optional[float] = None
+    write_timeout: Optional[float] = None
+    pool_timeout: Optional[float] = None
+    prewarm_connections: int = 0  # Connections opened when entering the client
+    requests_per_second: Optional[float] = None  # Per endpoint family, None = unlimited
+    bytes_per_second: Optional[float] = None  # Request + response body bytes per family
+    rate_limits: Dict[str, Dict[str, float]] = field(default_factory=dict)  # Per family overrides
+    adaptive_concurrency: bool = False  # AIMD limit on requests in flight per family
+    adaptive_max_concurrency: int = 64
+    health_probe_interval: float = 10.0  # Seconds between probes of multiple endpoints
+    endpoint_failure_threshold: int = 3  # Consecutive failures that eject an endpoint
+    endpoint_ejection_time: float = 30.0  # First ejection; doubles on repeats
+    pin_uploads: bool = True  # Keep an upload's chunks on the endpoint that started it
+    hedge_downloads: bool = False  # Duplicate chunk requests slower than hedge_percentile
+    hedge_percentile: float = 95.0  # Of recently observed chunk latencies
+    hedge_max_ratio: float = 0.1  # Most hedged requests per chunk request
+    metrics: bool = False  # Record request and transfer metrics in client.metrics
+    trace_file: Optional[str] = None  # JSON-lines file for upload/download spans
+    chunk_cache_dir: Optional[str] = None  # Shared on-disk chunk cache for downloads
+    chunk_cache_max_bytes: int = 10 * 1024 * 1024 * 1024
+
+    @property
+    def api_urls(self) -> List[str]:
+        """API endpoints as a list"""
+        if isinstance(self.api_url, str):
+            return [self.api_url]
+        return list(self.api_url)
 
     @classmethod
     def from_env(cls) -> "ShelbyConfig":
         """Load configuration from environment variables"""
         return cls(
-            api_url=os.getenv("SHELBY_API_URL", "https://api.shelby.io"),
+            api_url=_url_list(os.getenv("SHELBY_API_URL", "https://api.shelby.io")),
             rpc_url=os.getenv("SHELBY_RPC_URL", "https://rpc.shelby.io"),
             timeout=int(os.getenv("SHELBY_TIMEOUT", "30")),
             max_retries=int(os.getenv("SHELBY_MAX_RETRIES", "3")),
             verify_ssl=os.getenv("SHELBY_VERIFY_SSL", "true").lower() == "true",
+            retry_base_delay=float(os.getenv("SHELBY_RETRY_BASE_DELAY", "0.5")),
+            retry_max_delay=float(os.getenv("SHELBY_RETRY_MAX_DELAY", "30.0")),
+            retry_budget_ratio=float(os.getenv("SHELBY_RETRY_BUDGET_RATIO", "0.2")),
+            circuit_breaker=os.getenv("SHELBY_CIRCUIT_BREAKER", "false").lower() == "true",
+            breaker_failure_threshold=int(os.getenv("SHELBY_BREAKER_FAILURE_THRESHOLD", "5")),
+            breaker_reset_timeout=float(os.getenv("SHELBY_BREAKER_RESET_TIMEOUT", "30.0")),
+            breaker_half_open_max_calls=int(
+                os.getenv("SHELBY_BREAKER_HALF_OPEN_MAX_CALLS", "1")
+            ),
+            coalesce_gets=os.getenv("SHELBY_COALESCE_GETS", "true").lower() == "true",
+            max_concurrent_chunks=int(os.getenv("SHELBY_MAX_CONCURRENT_CHUNKS", "4")),
+            chunk_retries=int(os.getenv("SHELBY_CHUNK_RETRIES", "1")),
+            transfer_mode=os.getenv("SHELBY_TRANSFER_MODE", "auto"),
+            max_concurrent_files=int(os.getenv("SHELBY_MAX_CONCURRENT_FILES", "4")),
+            max_batch_bytes_in_flight=int(
+                os.getenv("SHELBY_MAX_BATCH_BYTES_IN_FLIGHT", str(1024 * 1024 * 1024))
+            ),
+            max_connections=int(os.getenv("SHELBY_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("SHELBY_MAX_KEEPALIVE_CONNECTIONS", "20")),
+            keepalive_expiry=float(os.getenv("SHELBY_KEEPALIVE_EXPIRY", "5.0")),
+            http2=os.getenv("SHELBY_HTTP2", "false").lower() == "true",
+            connect_timeout=_optional_float(os.getenv("SHELBY_CONNECT_TIMEOUT")),
+            read_timeout=_optional_float(os.getenv("SHELBY_READ_TIMEOUT")),
+            write_timeout=_optional_float(os.getenv("SHELBY_WRITE_TIMEOUT")),
+            pool_timeout=_optional_float(os.getenv("SHELBY_POOL_TIMEOUT")),
+            prewarm_connections=int(os.getenv("SHELBY_PREWARM_CONNECTIONS", "0")),
+            requests_per_second=_optional_float(os.getenv("SHELBY_REQUESTS_PER_SECOND")),
+            bytes_per_second=_optional_float(os.getenv("SHELBY_BYTES_PER_SECOND")),
+            adaptive_concurrency=(
+                os.getenv("SHELBY_ADAPTIVE_CONCURRENCY", "false").lower() == "true"
+            ),
+            adaptive_max_concurrency=int(os.getenv("SHELBY_ADAPTIVE_MAX_CONCURRENCY", "64")),
+            health_probe_interval=float(os.getenv("SHELBY_HEALTH_PROBE_INTERVAL", "10.0")),
+            endpoint_failure_threshold=int(os.getenv("SHELBY_ENDPOINT_FAILURE_THRESHOLD", "3")),
+            endpoint_ejection_time=float(os.getenv("SHELBY_ENDPOINT_EJECTION_TIME", "30.0")),
+            pin_uploads=os.getenv("SHELBY_PIN_UPLOADS", "true").lower() == "true",
+            hedge_downloads=os.getenv("SHELBY_HEDGE_DOWNLOADS", "false").lower() == "true",
+            hedge_percentile=float(os.getenv("SHELBY_HEDGE_PERCENTILE", "95.0")),
+            hedge_max_ratio=float(os.getenv("SHELBY_HEDGE_MAX_RATIO", "0.1")),
+            metrics=os.getenv("SHELBY_METRICS", "false").lower() == "true",
+            trace_file=os.getenv("SHELBY_TRACE_FILE") or None,
+            chunk_cache_dir=os.getenv("SHELBY_CHUNK_CACHE_DIR") or None,
+            chunk_cache_max_bytes=int(
+                os.getenv("SHELBY_CHUNK_CACHE_MAX_BYTES", str(10 * 1024 * 1024 * 1024))
+            ),
         )
 
     @classmethod
@@ -39,10 +129,15 @@ class ShelbyConfig:
     def to_file(self, path: str) -> None:
         """Save configuration to YAML file"""
         with open(path, "w") as f:
-            yaml.dump({
-                "api_url": self.api_url,
-                "rpc_url": self.rpc_url,
-                "timeout": self.timeout,
-                "max_retries": self.max_retries,
-                "verify_ssl": self.verify_ssl,
-            }, f)
+            yaml.dump(asdict(self), f)
+
+
+def _optional_float(value: Optional[str]) -> Optional[float]:
+    """Parse an optional numeric environment variable"""
+    return float(value) if value else None
+
+
+def _url_list(value: str) -> Union[str, List[str]]:
+    """Parse a comma-separated list of API endpoints"""
+    urls = [url.strip() for url in value.split(",") if url.strip()]
+    return urls if len(urls) > 1 else value
@@ -3,27 +3,247 @@ Download module for Shelby SDK
 """
 
 import os
+import json
 import hashlib
-from typing import Optional, Dict, Any
+import time
+from typing import (
+    Optional, Dict, Any, AsyncIterator, Callable, List, Literal, Tuple, Union, overload
+)
 from .client import ShelbyClient
-from .exceptions import ShelbyDownloadError
+from .exceptions import ShelbyError, ShelbyDownloadError
+from .hedge import HedgePolicy
+from .ratelimit import TransferWindow
+from .chunk_cache import ChunkCache
+from .reader import BlobReader
+from .metrics import timed, tracked
+from .tracing import start_span, current_span, Span
 import asyncio
+import threading
+
+_seek_lock = threading.Lock()
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """Reserve the final file size up front"""
+    if size <= 0:
+        return
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError:
+            pass  # Filesystem without fallocate support
+    os.ftruncate(fd, size)
+
+
+def _write_at(fd: int, data: bytes, offset: int) -> None:
+    """Write data at an absolute offset without moving a shared file position"""
+    view = memoryview(data)
+    if hasattr(os, "pwrite"):
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view = view[written:]
+            offset += written
+        return
+
+    # Windows has no pwrite; serialize seek + write instead
+    with _seek_lock:
+        os.lseek(fd, offset, os.SEEK_SET)
+        while view:
+            view = view[os.write(fd, view):]
+
+
+def _read_at(fd: int, size: int, offset: int) -> bytes:
+    """Read size bytes at an absolute offset"""
+    if hasattr(os, "pread"):
+        return os.pread(fd, size, offset)
+
+    with _seek_lock:
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.read(fd, size)
+
+
+class _PartState:
+    """Completed-chunk bitmap for a .part file, kept in a JSON sidecar
+
+    The sidecar also records which blob the .part file belongs to, so a
+    stale one for a different or changed blob is never resumed. Completed
+    chunks are saved every save_every chunks or save_interval seconds and
+    by flush(), so the event loop isn't rewriting the file per chunk; a
+    crash only costs the chunks since the last save.
+    """
+
+    save_every = 32
+    save_interval = 1.0
+
+    def __init__(self, path: str, blob_id: str, file_hash: str, size: int, chunk_count: int):
+        self.path = path
+        self.identity = {"blob_id": blob_id, "hash": file_hash, "size": size}
+        self.bitmap = bytearray((chunk_count + 7) // 8)
+        self._unsaved = 0
+        self._saved_at = time.monotonic()
+
+    @classmethod
+    def load(cls, path: str, blob_id: str, file_hash: str, size: int,
+             chunk_count: int) -> "_PartState":
+        """Load the sidecar if it matches the blob, else start empty"""
+        state = cls(path, blob_id, file_hash, size, chunk_count)
+        try:
+            with open(path, "r") as f:
+                saved = json.load(f)
+            bitmap = bytearray.fromhex(saved["bitmap"])
+        except (OSError, ValueError, KeyError):
+            return state
+
+        if all(saved.get(k) == v for k, v in state.identity.items()) and \
+                len(bitmap) == len(state.bitmap):
+            state.bitmap = bitmap
+        return state
+
+    def __contains__(self, index: int) -> bool:
+        return bool(self.bitmap[index // 8] & (1 << (index % 8)))
+
+    def __bool__(self) -> bool:
+        return any(self.bitmap)
+
+    def add(self, index: int) -> None:
+        """Mark a chunk as written, persisting the bitmap when a save is due"""
+        self.bitmap[index // 8] |= 1 << (index % 8)
+        self._unsaved += 1
+        if self._unsaved >= self.save_every or \
+                time.monotonic() - self._saved_at >= self.save_interval:
+            self.save()
+
+    def discard(self, index: int) -> None:
+        """Unmark a chunk whose stored data turned out to be bad"""
+        self.bitmap[index // 8] &= ~(1 << (index % 8)) & 0xFF
+        self.save()
+
+    def save(self) -> None:
+        """Atomically replace the sidecar"""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({**self.identity, "bitmap": self.bitmap.hex()}, f)
+        os.replace(tmp_path, self.path)
+        self._unsaved = 0
+        self._saved_at = time.monotonic()
+
+    def flush(self) -> None:
+        """Save chunks marked since the last save"""
+        if self._unsaved:
+            self.save()
+
+    def remove(self) -> None:
+        """Delete the sidecar"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class _OrderedHasher:
+    """SHA-256 over chunks that arrive out of order
+
+    Chunks are buffered until every chunk before them has arrived and then
+    folded in offset order. wait_for_room keeps fetches from running more
+    than reorder_limit chunks ahead of the hash, bounding the buffer; the
+    limit is twice the transfer window's, so it shrinks when the window
+    does.
+    """
+
+    def __init__(self, window: TransferWindow):
+        self.window = window
+        self._sha256 = hashlib.sha256()
+        self._next = 0
+        self._buffer: Dict[int, bytes] = {}
+        self._advanced = asyncio.Condition()
+
+    @property
+    def reorder_limit(self) -> int:
+        """Chunks fetches may run ahead of the hash"""
+        return 2 * self.window.limit
+
+    async def wait_for_room(self, position: int) -> None:
+        """Wait until the chunk at position may be fetched"""
+        async with self._advanced:
+            await self._advanced.wait_for(
+                lambda: position < self._next + self.reorder_limit
+            )
+
+    async def add(self, position: int, data: bytes) -> None:
+        """Record the chunk at position and fold everything now contiguous"""
+        async with self._advanced:
+            self._buffer[position] = data
+            if position != self._next:
+                return
+
+            while self._next in self._buffer:
+                self._sha256.update(self._buffer.pop(self._next))
+                self._next += 1
+            self._advanced.notify_all()
+
+    def hexdigest(self) -> str:
+        """Hash of all chunks folded so far"""
+        return self._sha256.hexdigest()
+
+
+def _chunk_slots(chunks: list) -> int:
+    """Number of bitmap slots needed to address every chunk index"""
+    return max((c["index"] for c in chunks), default=-1) + 1
+
+
+def _chunk_layout(blob_info: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """Chunks of a blob in offset order, with the size of each"""
+    file_size = blob_info.get("size", 0)
+    chunks = sorted(blob_info.get("chunks", []), key=lambda c: c["offset"])
+    sizes = [
+        chunk_info.get("size", end - chunk_info["offset"])
+        for chunk_info, end in zip(
+            chunks, [c["offset"] for c in chunks[1:]] + [file_size]
+        )
+    ]
+    return chunks, sizes
 
 
 class DownloadManager:
     """Handle file downloads from Shelby network"""
 
-    def __init__(self, client: ShelbyClient):
-        """Initialize download manager"""
+    def __init__(
+        self,
+        client: ShelbyClient,
+        hedge: Optional[HedgePolicy] = None,
+        chunk_cache: Optional[ChunkCache] = None,
+    ):
+        """Initialize download manager
+
+        Args:
+            client: Shelby client to download through
+            hedge: Hedging policy for chunk requests (default: one built from
+                the client config when hedge_downloads is set)
+            chunk_cache: On-disk cache consulted before fetching a chunk
+                (default: one at config.chunk_cache_dir if set)
+        """
         self.client = client
         self.chunk_size = 1024 * 1024  # 1MB chunks
+        if hedge is None and client.config.hedge_downloads:
+            hedge = HedgePolicy(
+                percentile=client.config.hedge_percentile,
+                max_hedge_ratio=client.config.hedge_max_ratio,
+            )
+        self.hedge = hedge
+        if chunk_cache is None and client.config.chunk_cache_dir:
+            chunk_cache = ChunkCache(
+                client.config.chunk_cache_dir,
+                max_bytes=client.config.chunk_cache_max_bytes,
+                metrics=client.metrics,
+            )
+        self.chunk_cache = chunk_cache
 
     async def download_file(
         self,
         blob_id: str,
         output_path: str,
         account_name: str,
-        progress_callback: Optional[callable] = None,
+        progress_callback: Optional[Callable[..., Any]] = None,
+        blob_info: Optional[Dict[str, Any]] = None,
     ) -> str:
         """Download a file from Shelby network
 
@@ -32,84 +252,354 @@ class DownloadManager:
             output_path: Where to save the file
             account_name: Account name to download from
             progress_callback: Optional callback for progress updates
+            blob_info: Blob metadata from GET blob/{id}, if already fetched
 
         Returns:
             Path to downloaded file
         """
+        with start_span(
+            self.client.tracer, "download", blob_id=blob_id, output=output_path
+        ) as span:
+            return await self._download_file(
+                blob_id, output_path, account_name, progress_callback, blob_info, span
+            )
+
+    async def _download_file(
+        self,
+        blob_id: str,
+        output_path: str,
+        account_name: str,
+        progress_callback: Optional[Callable[..., Any]],
+        blob_info: Optional[Dict[str, Any]],
+        span: Optional[Span],
+    ) -> str:
+        """Fetch the missing chunks of a blob into its .part file and verify it"""
+        tracer = self.client.tracer
+
         # Get blob metadata
-        blob_info = await self.client._request(
-            "GET",
-            f"blob/{blob_id}",
-            retries=self.client.config.max_retries,
-        )
+        if blob_info is None:
+            with start_span(tracer, "metadata"):
+                blob_info = await self._get_blob_info(blob_id)
 
         file_size = blob_info.get("size", 0)
         file_hash = blob_info.get("hash", "")
-        chunks = blob_info.get("chunks", [])
+        chunks, sizes = _chunk_layout(blob_info)
 
         # Create output directory if needed
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
 
-        # Download chunks and assemble
-        with open(output_path, "wb") as f:
-            for chunk_info in chunks:
-                chunk_data = await self._download_chunk(
-                    blob_id, chunk_info["index"], account_name
-                )
-                f.seek(chunk_info["offset"])
-                f.write(chunk_data)
+        # Data goes to a .part file with a sidecar bitmap of completed
+        # chunks; a restarted download only fetches what is missing
+        part_path = f"{output_path}.part"
+        state = _PartState.load(
+            f"{part_path}.json", blob_id, file_hash, file_size, _chunk_slots(chunks)
+        )
+        resuming = bool(state) and os.path.exists(part_path)
+        if not resuming:
+            state.bitmap = bytearray(len(state.bitmap))
+        if span is not None:
+            span.attributes.update(size=file_size, chunks=len(chunks), resumed=resuming)
 
+        # Fetch chunks concurrently and write each one at its offset as it
+        # arrives into a file preallocated to the final size. The file hash
+        # is folded in offset order as chunks arrive, so verifying it needs
+        # no second read of the output; only chunks kept from an earlier
+        # attempt are read back.
+        concurrency = self.client.transfer_concurrency()
+        hasher = _OrderedHasher(self.client.transfer_window("blob"))
+        pending = enumerate(chunks)
+        completed = 0
+        metrics = self.client.metrics
+
+        def write_block(fd: int, data: bytes, offset: int) -> None:
+            with timed(metrics, "shelby_disk_seconds", operation="write"):
+                _write_at(fd, data, offset)
+
+        def read_block(fd: int, size: int, offset: int) -> bytes:
+            with timed(metrics, "shelby_disk_seconds", operation="read"):
+                return _read_at(fd, size, offset)
+
+        async def worker(fd: int) -> None:
+            nonlocal completed
+            for position, chunk_info in pending:
+                await hasher.wait_for_room(position)
+                index = chunk_info["index"]
+
+                with start_span(
+                    tracer, "chunk", index=index, offset=chunk_info["offset"], size=sizes[position]
+                ) as chunk_span:
+                    chunk_data = None
+                    if index in state:
+                        chunk_data = await asyncio.to_thread(
+                            read_block, fd, sizes[position], chunk_info["offset"]
+                        )
+                        expected = chunk_info.get("hash")
+                        if expected and hashlib.sha256(chunk_data).hexdigest() != expected:
+                            state.discard(index)
+                            chunk_data = None
+                    if chunk_span is not None:
+                        chunk_span.set_attribute("from_disk", chunk_data is not None)
+
+                    if chunk_data is None:
+                        chunk_data = await self._download_chunk(
+                            blob_id, index, account_name, chunk_info.get("hash")
+                        )
+                        await asyncio.to_thread(write_block, fd, chunk_data, chunk_info["offset"])
+                        state.add(index)
+                await hasher.add(position, chunk_data)
+
+                completed += 1
                 if progress_callback:
-                    await progress_callback(
-                        chunk_info["index"] + 1, len(chunks)
-                    )
+                    await progress_callback(completed, len(chunks))
+
+        with open(part_path, "r+b" if resuming else "wb") as f:
+            if not resuming:
+                _preallocate(f.fileno(), file_size)
+            workers = [
+                asyncio.create_task(worker(f.fileno()))
+                for _ in range(min(concurrency, len(chunks)))
+            ]
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                state.flush()
 
         # Verify hash
-        downloaded_hash = await self._hash_file(output_path)
-        if downloaded_hash != file_hash:
-            os.remove(output_path)
-            raise ShelbyDownloadError(
-                f"Hash mismatch: expected {file_hash}, got {downloaded_hash}"
-            )
+        with start_span(tracer, "verify", size=file_size):
+            downloaded_hash = hasher.hexdigest()
+            if downloaded_hash != file_hash:
+                os.remove(part_path)
+                state.remove()
+                raise ShelbyDownloadError(
+                    f"Hash mismatch: expected {file_hash}, got {downloaded_hash}"
+                )
 
+        os.replace(part_path, output_path)
+        state.remove()
         return output_path
 
+    @overload
+    async def read_range(
+        self,
+        blob_id: str,
+        offset: int,
+        length: int,
+        account_name: str,
+        blob_info: Optional[Dict[str, Any]] = None,
+        as_memoryview: Literal[False] = False,
+    ) -> bytes: ...
+
+    @overload
+    async def read_range(
+        self,
+        blob_id: str,
+        offset: int,
+        length: int,
+        account_name: str,
+        blob_info: Optional[Dict[str, Any]] = None,
+        *,
+        as_memoryview: Literal[True],
+    ) -> memoryview: ...
+
+    async def read_range(
+        self,
+        blob_id: str,
+        offset: int,
+        length: int,
+        account_name: str,
+        blob_info: Optional[Dict[str, Any]] = None,
+        as_memoryview: bool = False,
+    ) -> Union[bytes, memoryview]:
+        """Read a byte range of a blob without downloading all of it
+
+        Only the chunks overlapping the range are fetched, concurrently and
+        through the chunk cache and hedging like download_file.
+
+        Args:
+            blob_id: Blob ID to read from
+            offset: First byte to read; negative counts back from the end
+            length: Number of bytes to read; cut short at the end of the blob
+            account_name: Account name to read from
+            blob_info: Blob metadata from GET blob/{id}, if already fetched
+            as_memoryview: Return a memoryview over the assembled range
+                instead of copying it into bytes
+
+        Returns:
+            The bytes in the range
+        """
+        if length < 0:
+            raise ValueError("length must not be negative")
+
+        tracer = self.client.tracer
+        with start_span(
+            tracer, "read_range", blob_id=blob_id, offset=offset, length=length
+        ) as span:
+            if blob_info is None:
+                with start_span(tracer, "metadata"):
+                    blob_info = await self._get_blob_info(blob_id)
+
+            file_size = blob_info.get("size", 0)
+            if offset < 0:
+                offset = max(0, file_size + offset)
+            end = min(file_size, offset + length)
+            buffer = bytearray(max(0, end - offset))
+
+            chunks, sizes = _chunk_layout(blob_info)
+            overlapping = [
+                (chunk_info, size) for chunk_info, size in zip(chunks, sizes)
+                if chunk_info["offset"] < end and chunk_info["offset"] + size > offset
+            ]
+            if span is not None:
+                span.set_attribute("chunks", len(overlapping))
+
+            semaphore = asyncio.Semaphore(self.client.transfer_concurrency())
+
+            async def fetch(chunk_info: Dict[str, Any], size: int) -> None:
+                index = chunk_info["index"]
+                async with semaphore:
+                    with start_span(
+                        tracer, "chunk", index=index, offset=chunk_info["offset"], size=size
+                    ):
+                        chunk_data = await self._download_chunk(
+                            blob_id, index, account_name, chunk_info.get("hash")
+                        )
+
+                start = max(offset, chunk_info["offset"]) - chunk_info["offset"]
+                stop = min(end, chunk_info["offset"] + size) - chunk_info["offset"]
+                if len(chunk_data) < stop:
+                    raise ShelbyDownloadError(f"Chunk {index} is shorter than its metadata")
+                position = chunk_info["offset"] + start - offset
+                buffer[position:position + stop - start] = memoryview(chunk_data)[start:stop]
+
+            tasks = [asyncio.create_task(fetch(*item)) for item in overlapping]
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        return memoryview(buffer) if as_memoryview else bytes(buffer)
+
+    def open(
+        self,
+        blob_id: str,
+        account_name: str,
+        blob_info: Optional[Dict[str, Any]] = None,
+        cache_chunks: int = 8,
+        max_readahead: Optional[int] = None,
+    ) -> BlobReader:
+        """Open a blob for seekable, streaming reads
+
+        Args:
+            blob_id: Blob ID to read
+            account_name: Account name to read from
+            blob_info: Blob metadata from GET blob/{id}, if already fetched
+            cache_chunks: Chunks kept in memory
+            max_readahead: Most chunks prefetched ahead of sequential reads
+                (default: config.max_concurrent_chunks)
+
+        Returns:
+            BlobReader; use it with async with, or close() it when done
+        """
+        if max_readahead is None:
+            max_readahead = self.client.config.max_concurrent_chunks
+        return BlobReader(
+            self, blob_id, account_name, blob_info,
+            cache_chunks=cache_chunks, max_readahead=max_readahead,
+        )
+
     async def _download_chunk(
         self,
         blob_id: str,
         chunk_index: int,
         account_name: str,
+        chunk_hash: Optional[str] = None,
+    ) -> bytes:
+        """Download a single chunk
+
+        With a chunk cache and the chunk's expected hash, the cache is
+        consulted first and fetched chunks are added to it. Slow requests
+        are hedged if enabled.
+        """
+        cache = self.chunk_cache
+        if cache is not None and chunk_hash:
+            cached = await asyncio.to_thread(cache.get, chunk_hash)
+            span = current_span()
+            if span is not None:
+                span.set_attribute("from_cache", cached is not None)
+            if cached is not None:
+                return cached
+
+        metrics = self.client.metrics
+        with tracked(metrics, "shelby_chunks_in_flight", direction="download"), \
+                timed(metrics, "shelby_chunk_duration_seconds", direction="download"):
+            if self.hedge is None:
+                chunk_data = await self._fetch_chunk(blob_id, chunk_index, account_name)
+            else:
+                chunk_data = await self.hedge.run(
+                    lambda: self._fetch_chunk(blob_id, chunk_index, account_name)
+                )
+
+        # Only cache what matches the hash it will be looked up by
+        if cache is not None and chunk_hash and \
+                hashlib.sha256(chunk_data).hexdigest() == chunk_hash:
+            await asyncio.to_thread(cache.put, chunk_hash, chunk_data)
+        return chunk_data
+
+    async def _fetch_chunk(
+        self,
+        blob_id: str,
+        chunk_index: int,
+        account_name: str,
     ) -> bytes:
-        """Download a single chunk"""
-        response = await self.client._request(
+        """Fetch and verify a single chunk
+
+        Binary bodies are requested via the Accept header; servers that only
+        speak hex JSON answer with JSON and are decoded accordingly.
+        """
+        if self.client.config.transfer_mode == "hex":
+            accept = "application/json"
+        else:
+            accept = "application/octet-stream, application/json;q=0.5"
+
+        response = await self.client._send(
             "GET",
             f"blob/{blob_id}/chunk/{chunk_index}",
-            data={"account": account_name},
+            params={"account": account_name},
+            headers={"Accept": accept},
             retries=self.client.config.max_retries,
         )
 
-        chunk_data = response.get("data")
-        chunk_hash = response.get("hash")
+        content_type = response.headers.get("content-type", "")
+        if content_type.startswith("application/octet-stream"):
+            chunk_data = response.content
+            chunk_hash = response.headers.get("x-chunk-hash")
+        else:
+            payload = response.json()
+            chunk_data = bytes.fromhex(payload.get("data", ""))
+            chunk_hash = payload.get("hash")
 
         # Verify chunk hash
-        calculated_hash = hashlib.sha256(bytes.fromhex(chunk_data)).hexdigest()
+        with timed(self.client.metrics, "shelby_chunk_hash_seconds", direction="download"):
+            calculated_hash = hashlib.sha256(chunk_data).hexdigest()
         if calculated_hash != chunk_hash:
             raise ShelbyDownloadError(f"Chunk {chunk_index} hash mismatch")
 
-        return bytes.fromhex(chunk_data)
-
-    async def _hash_file(self, file_path: str) -> str:
-        """Calculate SHA-256 hash of file"""
-        sha256 = hashlib.sha256()
+        return chunk_data
 
-        with open(file_path, "rb") as f:
-            while True:
-                data = f.read(65536)  # 64KB chunks
-                if not data:
-                    break
-                sha256.update(data)
-
-        return sha256.hexdigest()
+    async def _get_blob_info(self, blob_id: str) -> Dict[str, Any]:
+        """Fetch blob metadata including its chunk list"""
+        return await self.client._request(
+            "GET",
+            f"blob/{blob_id}",
+            retries=self.client.config.max_retries,
+        )
 
     async def batch_download(
         self,
@@ -119,37 +609,94 @@ class DownloadManager:
     ) -> list[Dict[str, Any]]:
         """Download multiple files in batch
 
+        Blobs download concurrently; see iter_batch_download.
+
         Args:
             blob_ids: List of blob IDs to download
             output_dir: Directory to save files
             account_name: Account name to download from
 
         Returns:
-            List of download results
+            List of download results, in the order of blob_ids
+        """
+        results: Dict[int, Dict[str, Any]] = {}
+        async for position, result in self._run_batch(blob_ids, output_dir, account_name):
+            results[position] = result
+
+        return [results[position] for position in range(len(blob_ids))]
+
+    async def iter_batch_download(
+        self,
+        blob_ids: list[str],
+        output_dir: str,
+        account_name: str,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Download multiple files, yielding each result as it completes
+
+        At most config.max_concurrent_files blobs download at once. The
+        metadata fetched to name each file is reused for its download.
+
+        Args:
+            blob_ids: List of blob IDs to download
+            output_dir: Directory to save files
+            account_name: Account name to download from
+
+        Yields:
+            Download results in completion order
         """
-        results = []
-        for blob_id in blob_ids:
+        async for _, result in self._run_batch(blob_ids, output_dir, account_name):
+            yield result
+
+    async def _run_batch(
+        self,
+        blob_ids: list[str],
+        output_dir: str,
+        account_name: str,
+    ) -> AsyncIterator[tuple[int, Dict[str, Any]]]:
+        """Run batch downloads and yield (position, result) as they finish"""
+        used_paths: set[str] = set()
+
+        async def download_one(blob_id: str) -> Dict[str, Any]:
             try:
-                # Get blob info for filename
-                blob_info = await self.client._request(
-                    "GET",
-                    f"blob/{blob_id}",
-                    retries=self.client.config.max_retries,
-                )
+                # Get blob info for filename; download_file reuses it
+                blob_info = await self._get_blob_info(blob_id)
                 file_name = blob_info.get("metadata", {}).get("name", blob_id)
                 output_path = os.path.join(output_dir, file_name)
+                if output_path in used_paths:
+                    # Two blobs with the same name in one batch
+                    output_path = os.path.join(output_dir, f"{blob_id}_{file_name}")
+                used_paths.add(output_path)
 
-                result = await self.download_file(blob_id, output_path, account_name)
-                results.append({
+                result = await self.download_file(
+                    blob_id, output_path, account_name, blob_info=blob_info
+                )
+                return {
                     "blob_id": blob_id,
                     "status": "success",
                     "path": result,
-                })
-            except ShelbyDownloadError as e:
-                results.append({
+                }
+            except ShelbyError as e:
+                return {
                     "blob_id": blob_id,
                     "status": "failed",
                     "error": str(e),
-                })
+                }
+
+        pending = iter(enumerate(blob_ids))
+        running: Dict[asyncio.Task, int] = {}
+        max_files = max(1, self.client.config.max_concurrent_files)
+        try:
+            while True:
+                for position, blob_id in pending:
+                    running[asyncio.create_task(download_one(blob_id))] = position
+                    if len(running) >= max_files:
+                        break
+                if not running:
+                    break
 
-        return results
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield running.pop(task), task.result()
+        finally:
+            for task in running:
+                task.cancel()
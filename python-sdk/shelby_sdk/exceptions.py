@@ -2,6 +2,8 @@
 Custom exceptions for Shelby SDK
 """
 
+from typing import Optional
+
 
 class ShelbyError(Exception):
     """Base exception for all Shelby SDK errors"""
@@ -10,7 +12,21 @@ class ShelbyError(Exception):
 
 class ShelbyConnectionError(ShelbyError):
     """Raised when connection to Shelby API fails"""
-    pass
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ShelbyCircuitOpenError(ShelbyConnectionError):
+    """Raised without contacting the API while its circuit breaker is open"""
+
+    def __init__(self, family: str, retry_in: float):
+        super().__init__(
+            f"Circuit open for '{family}' endpoints; retry in {retry_in:.1f}s"
+        )
+        self.family = family
+        self.retry_in = retry_in
 
 
 class ShelbyUploadError(ShelbyError):
@@ -0,0 +1,331 @@
+"""
+fsspec filesystem for Shelby SDK
+Read blobs as shelby://account/blob from pandas, pyarrow, dask and friends
+"""
+
+import asyncio
+from typing import Optional, Dict, Any, List, Tuple
+
+try:
+    from fsspec.asyn import AsyncFileSystem, sync
+    from fsspec.spec import AbstractBufferedFile
+except ImportError as e:  # pragma: no cover - depends on the environment
+    raise ImportError(
+        "shelby_sdk.filesystem requires fsspec; install shelby-sdk[fsspec]"
+    ) from e
+
+from .client import ShelbyClient
+from .config import ShelbyConfig
+from .blob import BlobManager
+from .download import DownloadManager
+
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+LIST_PAGE_SIZE = 1000
+
+
+class ShelbyFileSystem(AsyncFileSystem):
+    """Read-only fsspec filesystem over Shelby blobs
+
+    Paths are account/blob, where blob is a blob's name (its metadata
+    "name") or its ID; the root lists accounts as directories. Byte ranges
+    are served by DownloadManager.read_range, so only the chunks a reader
+    touches are fetched, and files opened with open() cache blocks of
+    block_size bytes. cat_ranges merges overlapping ranges of a blob and
+    fetches the rest concurrently.
+
+    Registered for the shelby:// protocol once the package is installed::
+
+        df = pd.read_csv("shelby://default/data.csv")
+    """
+
+    protocol = "shelby"
+    root_marker = ""
+
+    def __init__(
+        self,
+        config: Optional[ShelbyConfig] = None,
+        client: Optional[ShelbyClient] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        **storage_options: Any,
+    ):
+        """Initialize the filesystem
+
+        Args:
+            config: Client configuration (default: ShelbyConfig.from_env())
+            client: Client to use; it must belong to the event loop the
+                filesystem runs on (default: one created on first use)
+            block_size: Block size of files opened for reading
+            **storage_options: Passed to fsspec's AsyncFileSystem
+        """
+        super().__init__(**storage_options)
+        self.config = config or (client.config if client else ShelbyConfig.from_env())
+        self.block_size = block_size
+        self._client = client
+        self._owns_client = client is None
+        self._blob_manager: Optional[BlobManager] = None
+        self._downloader: Optional[DownloadManager] = None
+        self._blob_infos: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def client(self) -> ShelbyClient:
+        """The client, created on first use inside the filesystem's loop"""
+        if self._client is None:
+            self._client = ShelbyClient(self.config)
+        return self._client
+
+    @property
+    def blobs(self) -> BlobManager:
+        """Blob manager over the client"""
+        if self._blob_manager is None:
+            self._blob_manager = BlobManager(self.client)
+        return self._blob_manager
+
+    @property
+    def downloader(self) -> DownloadManager:
+        """Download manager over the client"""
+        if self._downloader is None:
+            self._downloader = DownloadManager(self.client)
+        return self._downloader
+
+    async def _close(self) -> None:
+        if self._client is not None and self._owns_client:
+            await self._client.close()
+            self._client = None
+            self._blob_manager = None
+            self._downloader = None
+
+    def close(self) -> None:
+        """Close the client if the filesystem created it"""
+        if self._client is not None:
+            sync(self.loop, self._close)
+
+    @staticmethod
+    def _split(path: str) -> List[str]:
+        """(account, blob) parts of a path; blob is empty for an account"""
+        account, _, blob = path.strip("/").partition("/")
+        return [account, blob]
+
+    async def _ls(self, path: str, detail: bool = True, **kwargs: Any) -> List[Any]:
+        path = self._strip_protocol(path).strip("/")
+        account, blob = self._split(path)
+        if blob:
+            info = await self._info(path)
+            return [info] if detail else [info["name"]]
+
+        # Not _ls_from_cache: for an uncached account it answers with the
+        # account's own entry from the root listing
+        entries = self.dircache.get(path)
+        if entries is None:
+            listing = await self._list(account or None)
+            if account:
+                entries = self._file_entries(account, listing)
+                if not entries:
+                    raise FileNotFoundError(path)
+            else:
+                accounts = sorted({blob_info.get("account", "") for blob_info in listing})
+                entries = [
+                    {"name": name, "size": 0, "type": "directory"}
+                    for name in accounts if name
+                ]
+            self.dircache[path] = entries
+        return entries if detail else [entry["name"] for entry in entries]
+
+    async def _list(self, account: Optional[str]) -> List[Dict[str, Any]]:
+        """Every blob of an account (or of all accounts), following pages"""
+        listing: List[Dict[str, Any]] = []
+        while True:
+            page = await self.blobs.list_blobs(
+                account, limit=LIST_PAGE_SIZE, offset=len(listing)
+            )
+            listing.extend(page)
+            if len(page) < LIST_PAGE_SIZE:
+                return listing
+
+    @staticmethod
+    def _file_entries(account: str, listing: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """fsspec entries for listed blobs, named by blob name where unique"""
+        names = [
+            blob_info.get("metadata", {}).get("name") or blob_info["id"]
+            for blob_info in listing
+        ]
+        entries = []
+        for blob_info, name in zip(listing, names):
+            if names.count(name) > 1:
+                name = blob_info["id"]  # Ambiguous name; address it by ID
+            entries.append({
+                "name": f"{account}/{name}",
+                "size": blob_info.get("size", 0),
+                "type": "file",
+                "blob_id": blob_info["id"],
+                "hash": blob_info.get("hash"),
+                "created": blob_info.get("created_at"),
+            })
+        return entries
+
+    async def _info(self, path: str, **kwargs: Any) -> Dict[str, Any]:
+        path = self._strip_protocol(path).strip("/")
+        account, blob = self._split(path)
+        if not blob:
+            if not account:
+                return {"name": "", "size": 0, "type": "directory"}
+            await self._ls(account)
+            return {"name": account, "size": 0, "type": "directory"}
+
+        entries: List[Dict[str, Any]] = await self._ls(account)
+        for entry in entries:
+            if entry["name"] == path or entry["blob_id"] == blob:
+                return entry
+        raise FileNotFoundError(path)
+
+    async def _blob_info(self, path: str) -> Dict[str, Any]:
+        """Full metadata, including chunks, of the blob at path"""
+        entry = await self._info(path)
+        if entry["type"] != "file":
+            raise IsADirectoryError(path)
+        blob_id = entry["blob_id"]
+        if blob_id not in self._blob_infos:
+            self._blob_infos[blob_id] = await self.downloader._get_blob_info(blob_id)
+        return self._blob_infos[blob_id]
+
+    async def _cat_file(
+        self,
+        path: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        **kwargs: Any,
+    ) -> bytes:
+        path = self._strip_protocol(path)
+        blob_info = await self._blob_info(path)
+        size = blob_info.get("size", 0)
+        start, end = _bounds(start, end, size)
+        return await self.downloader.read_range(
+            blob_info["id"], start, max(0, end - start), self._split(path)[0], blob_info
+        )
+
+    async def _cat_ranges(
+        self,
+        paths: List[str],
+        starts: Any,
+        ends: Any,
+        max_gap: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        on_error: str = "return",
+        **kwargs: Any,
+    ) -> List[Any]:
+        """Read many ranges, fetching each overlapping group of a blob once"""
+        count = len(paths)
+        starts = starts if isinstance(starts, list) else [starts] * count
+        ends = ends if isinstance(ends, list) else [ends] * count
+        paths = [self._strip_protocol(path) for path in paths]
+
+        # Look up each blob once, concurrently
+        unique = list(dict.fromkeys(paths))
+        blob_infos = dict(zip(unique, await asyncio.gather(
+            *(self._blob_info(path) for path in unique), return_exceptions=True
+        )))
+
+        # Resolve bounds per blob, then merge ranges that overlap or are
+        # within max_gap of each other
+        results: List[Any] = [None] * count
+        groups: Dict[str, List[List[int]]] = {}
+        for position, (path, start, end) in enumerate(zip(paths, starts, ends)):
+            blob_info = blob_infos[path]
+            if isinstance(blob_info, BaseException):
+                if on_error != "return" or not isinstance(blob_info, Exception):
+                    raise blob_info
+                results[position] = blob_info
+                continue
+            start, end = _bounds(start, end, blob_info.get("size", 0))
+            groups.setdefault(path, []).append([start, max(start, end), position])
+
+        fetches: List[Tuple[str, int, int, List[Tuple[int, int, int]]]] = []
+        gap = max_gap or 0
+        for path, ranges in groups.items():
+            ranges.sort()
+            merged: List[List[Any]] = []
+            for start, end, position in ranges:
+                if merged and start <= merged[-1][1] + gap:
+                    merged[-1][1] = max(merged[-1][1], end)
+                    merged[-1][2].append((position, start, end))
+                else:
+                    merged.append([start, end, [(position, start, end)]])
+            fetches.extend((path, *group) for group in merged)
+
+        semaphore = asyncio.Semaphore(
+            batch_size or self.batch_size or max(1, self.config.max_concurrent_files)
+        )
+
+        async def fetch(path: str, start: int, end: int, members: List[Any]) -> None:
+            async with semaphore:
+                try:
+                    data = await self._cat_file(path, start, end)
+                except Exception as e:
+                    if on_error != "return":
+                        raise
+                    for position, _, _ in members:
+                        results[position] = e
+                    return
+            for position, member_start, member_end in members:
+                results[position] = data[member_start - start:member_end - start]
+
+        await asyncio.gather(*(fetch(*item) for item in fetches))
+        return results
+
+    async def _get_file(self, rpath: str, lpath: str, **kwargs: Any) -> None:
+        rpath = self._strip_protocol(rpath)
+        blob_info = await self._blob_info(rpath)
+        await self.downloader.download_file(
+            blob_info["id"], lpath, self._split(rpath)[0], blob_info=blob_info
+        )
+
+    def _open(
+        self,
+        path: str,
+        mode: str = "rb",
+        block_size: Optional[int] = None,
+        autocommit: bool = True,
+        cache_options: Optional[Dict[str, Any]] = None,
+        cache_type: str = "blockcache",
+        **kwargs: Any,
+    ) -> "ShelbyFile":
+        if mode != "rb":
+            raise NotImplementedError("Shelby filesystem is read-only")
+        return ShelbyFile(
+            self,
+            path,
+            mode=mode,
+            block_size=block_size or self.block_size,
+            cache_options=cache_options,
+            cache_type=cache_type,
+            **kwargs,
+        )
+
+    def invalidate_cache(self, path: Optional[str] = None) -> None:
+        """Forget listings and blob metadata, all or under path"""
+        super().invalidate_cache(path)
+        if path is None:
+            self.dircache.clear()
+            self._blob_infos.clear()
+        else:
+            account = self._split(self._strip_protocol(path))[0]
+            self.dircache.pop(account, None)
+            self._blob_infos.clear()
+
+
+class ShelbyFile(AbstractBufferedFile):
+    """File opened from a ShelbyFileSystem; blocks come from range reads"""
+
+    def _fetch_range(self, start: int, end: int) -> bytes:
+        data: bytes = sync(self.fs.loop, self.fs._cat_file, self.path, start, end)
+        return data
+
+
+def _bounds(start: Optional[int], end: Optional[int], size: int) -> List[int]:
+    """fsspec start/end (None or negative from the end) as absolute offsets"""
+    start = 0 if start is None else start
+    end = size if end is None else end
+    if start < 0:
+        start = max(0, size + start)
+    if end < 0:
+        end = max(0, size + end)
+    return [min(start, size), min(end, size)]
@@ -0,0 +1,119 @@
+"""
+Request hedging for Shelby SDK
+Sends a backup request when the first one is slower than usual
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Optional, Dict, List, Callable, Awaitable, TypeVar
+
+T = TypeVar("T")
+
+
+class HedgePolicy:
+    """Hedge requests that outlive a percentile of recent latency
+
+    Once min_samples latencies have been observed, a request still
+    running after the percentile-th latency of the last window requests
+    gets a duplicate. The first successful response wins and the other
+    request is cancelled; if one fails, the other still gets its chance.
+    Hedges are capped at max_hedge_ratio of requests so a slow server
+    isn't hit with twice the load.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        max_hedge_ratio: float = 0.1,
+        window: int = 256,
+        min_samples: int = 20,
+        min_delay: float = 0.005,
+    ):
+        """Initialize the policy
+
+        Args:
+            percentile: Latency percentile after which a request is hedged
+            max_hedge_ratio: Most hedges allowed per request sent
+            window: Recent latencies the percentile is computed over
+            min_samples: Latencies needed before hedging starts
+            min_delay: Shortest wait before hedging, in seconds
+        """
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._latencies: "deque[float]" = deque(maxlen=window)
+        self.stats = {"requests": 0, "hedges": 0, "hedge_wins": 0, "capped": 0}
+
+    def record(self, latency: float) -> None:
+        """Add an observed latency"""
+        self._latencies.append(latency)
+
+    def delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there is too little data"""
+        if len(self._latencies) < self.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        position = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return max(self.min_delay, ordered[position])
+
+    def _allow_hedge(self) -> bool:
+        """Check the hedge rate cap"""
+        if self.stats["hedges"] + 1 > self.max_hedge_ratio * self.stats["requests"]:
+            self.stats["capped"] += 1
+            return False
+        return True
+
+    async def run(self, request: Callable[[], Awaitable[T]]) -> T:
+        """Run request, hedging it with a second call if it is slow
+
+        Args:
+            request: Starts a fresh attempt each time it is called
+
+        Returns:
+            The first successful result
+        """
+        self.stats["requests"] += 1
+        primary = asyncio.ensure_future(request())
+        tasks = [primary]
+        # Each attempt's latency is measured from its own launch
+        launched_at = {primary: time.monotonic()}
+        try:
+            delay = self.delay()
+            if delay is not None:
+                await asyncio.wait(tasks, timeout=delay)
+
+            if primary.done() or delay is None or not self._allow_hedge():
+                result = await primary
+                self.record(time.monotonic() - launched_at[primary])
+                return result
+
+            self.stats["hedges"] += 1
+            hedge = asyncio.ensure_future(request())
+            tasks.append(hedge)
+            launched_at[hedge] = time.monotonic()
+
+            pending = set(tasks)
+            errors: List[BaseException] = []
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if task is hedge:
+                            self.stats["hedge_wins"] += 1
+                        self.record(time.monotonic() - launched_at[task])
+                        return task.result()
+                    errors.append(error)
+            raise errors[-1]
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # The loser's error was expected; mark it retrieved
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        """Counters plus the current hedge delay"""
+        return {**self.stats, "delay": self.delay()}
@@ -0,0 +1,193 @@
+"""
+Upload journal for Shelby SDK
+Persists upload progress so interrupted uploads can resume
+"""
+
+import os
+import sqlite3
+import time
+from typing import Optional, Dict, Any, List
+from .utils import ensure_config_dir
+
+
+class UploadJournal:
+    """Durable local record of in-progress uploads
+
+    Stores, per upload, the source file identity (path, size, mtime), the
+    file hash when known and the chunk indices the server acknowledged.
+    Backed by SQLite, by default at ~/.shelby/upload_journal.db.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """Open (and create if needed) the journal database"""
+        if path is None:
+            path = str(ensure_config_dir() / "upload_journal.db")
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS uploads (
+                upload_id TEXT PRIMARY KEY,
+                file_path TEXT NOT NULL,
+                file_size INTEGER NOT NULL,
+                file_mtime_ns INTEGER NOT NULL,
+                file_hash TEXT,
+                account TEXT NOT NULL,
+                api_url TEXT NOT NULL,
+                chunk_size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS acknowledged_chunks (
+                upload_id TEXT NOT NULL REFERENCES uploads(upload_id) ON DELETE CASCADE,
+                chunk_index INTEGER NOT NULL,
+                PRIMARY KEY (upload_id, chunk_index)
+            );
+            CREATE INDEX IF NOT EXISTS uploads_by_file
+                ON uploads (file_path, file_size, file_mtime_ns);
+            """
+        )
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.commit()
+
+    def find(
+        self,
+        file_path: str,
+        account_name: str,
+        api_url: str,
+        chunk_size: int,
+    ) -> Optional[Dict[str, Any]]:
+        """Find the latest unfinished upload of an unchanged file
+
+        Args:
+            file_path: Path of the file being uploaded
+            account_name: Account the upload targets
+            api_url: API the upload was started against
+            chunk_size: Chunk size the upload was started with
+
+        Returns:
+            Journal entry with its acknowledged chunk indices, or None
+        """
+        stat = os.stat(file_path)
+        row = self._conn.execute(
+            """
+            SELECT upload_id FROM uploads
+            WHERE file_path = ? AND file_size = ? AND file_mtime_ns = ?
+              AND account = ? AND api_url = ? AND chunk_size = ?
+            ORDER BY updated_at DESC LIMIT 1
+            """,
+            (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns,
+             account_name, api_url, chunk_size),
+        ).fetchone()
+        return self.get(row[0]) if row else None
+
+    def get(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        """Get a journal entry by upload ID"""
+        cursor = self._conn.execute(
+            "SELECT * FROM uploads WHERE upload_id = ?", (upload_id,)
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+
+        entry = dict(zip([c[0] for c in cursor.description], row))
+        entry["acknowledged"] = {
+            index for (index,) in self._conn.execute(
+                "SELECT chunk_index FROM acknowledged_chunks WHERE upload_id = ?",
+                (upload_id,),
+            )
+        }
+        return entry
+
+    def start(
+        self,
+        upload_id: str,
+        file_path: str,
+        account_name: str,
+        api_url: str,
+        chunk_size: int,
+        file_hash: Optional[str] = None,
+    ) -> None:
+        """Record a newly initialized upload"""
+        stat = os.stat(file_path)
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (upload_id, os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns,
+             file_hash, account_name, api_url, chunk_size, now, now),
+        )
+        self._conn.commit()
+
+    def acknowledge(self, upload_id: str, chunk_index: int) -> None:
+        """Record that the server acknowledged a chunk"""
+        self._conn.execute(
+            "INSERT OR IGNORE INTO acknowledged_chunks VALUES (?, ?)",
+            (upload_id, chunk_index),
+        )
+        self._conn.execute(
+            "UPDATE uploads SET updated_at = ? WHERE upload_id = ?",
+            (time.time(), upload_id),
+        )
+        self._conn.commit()
+
+    def complete(self, upload_id: str) -> None:
+        """Forget an upload that finished or can no longer be resumed"""
+        self._conn.execute("DELETE FROM uploads WHERE upload_id = ?", (upload_id,))
+        self._conn.commit()
+
+    def list_uploads(self) -> List[Dict[str, Any]]:
+        """List unfinished uploads, most recently active first
+
+        Returns:
+            Journal entries with an acknowledged_count instead of the index set
+        """
+        cursor = self._conn.execute(
+            """
+            SELECT u.*, COUNT(c.chunk_index) AS acknowledged_count
+            FROM uploads u
+            LEFT JOIN acknowledged_chunks c ON c.upload_id = u.upload_id
+            GROUP BY u.upload_id
+            ORDER BY u.updated_at DESC
+            """
+        )
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def collect_garbage(self, max_age: float = 7 * 24 * 3600) -> List[str]:
+        """Remove stale entries
+
+        An entry is stale when it has been idle for longer than max_age
+        seconds or its source file was deleted or modified.
+
+        Args:
+            max_age: Idle time in seconds after which entries are dropped
+
+        Returns:
+            Upload IDs that were removed
+        """
+        cutoff = time.time() - max_age
+        stale = []
+        for entry in self.list_uploads():
+            try:
+                stat = os.stat(entry["file_path"])
+                changed = (
+                    stat.st_size != entry["file_size"]
+                    or stat.st_mtime_ns != entry["file_mtime_ns"]
+                )
+            except FileNotFoundError:
+                changed = True
+
+            if changed or entry["updated_at"] < cutoff:
+                stale.append(entry["upload_id"])
+
+        self._conn.executemany(
+            "DELETE FROM uploads WHERE upload_id = ?", [(upload_id,) for upload_id in stale]
+        )
+        self._conn.commit()
+        return stale
+
+    def close(self) -> None:
+        """Close the journal database"""
+        self._conn.close()
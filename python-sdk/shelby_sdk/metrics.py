@@ -0,0 +1,173 @@
+"""
+Metrics for Shelby SDK
+Counters, gauges and histograms exported in Prometheus text format
+"""
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Optional, Dict, Callable, Iterator, List, Tuple, ContextManager
+
+# Seconds; covers a fast metadata call up to a slow chunk on a bad link
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Recorded by the SDK: (name, type, help)
+METRICS = (
+    ("shelby_request_duration_seconds", "histogram",
+     "HTTP attempt latency by endpoint family, method and status"),
+    ("shelby_request_retries_total", "counter", "Retried HTTP attempts by endpoint family"),
+    ("shelby_requests_in_flight", "gauge", "HTTP attempts in flight by endpoint family"),
+    ("shelby_bytes_sent_total", "counter", "Request body bytes by endpoint family"),
+    ("shelby_bytes_received_total", "counter", "Response body bytes by endpoint family"),
+    ("shelby_chunk_duration_seconds", "histogram", "Chunk transfer time by direction"),
+    ("shelby_chunks_in_flight", "gauge", "Chunk transfers in flight by direction"),
+    ("shelby_chunk_hash_seconds", "histogram", "Chunk hashing and verification time by direction"),
+    ("shelby_disk_seconds", "histogram", "Chunk disk read and write time by operation"),
+    ("shelby_chunk_cache_requests_total", "counter", "Chunk cache lookups by result"),
+    ("shelby_chunk_cache_evictions_total", "counter", "Chunks evicted from the chunk cache"),
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+Callback = Callable[[str, float, Dict[str, str]], None]
+
+
+class Metrics:
+    """Thread-safe in-process metrics registry
+
+    Every recorded value is aggregated for render() and, if a callback is
+    given, also passed to callback(name, value, labels) as it happens;
+    counters and gauges pass their increment, histograms the observation.
+    """
+
+    def __init__(
+        self,
+        callback: Optional[Callback] = None,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        """Initialize an empty registry"""
+        self.callback = callback
+        self.buckets = tuple(sorted(buckets))
+        self._types = {name: kind for name, kind, _ in METRICS}
+        self._help = {name: text for name, _, text in METRICS}
+        self._values: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, List[float]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(labels: Dict[str, str]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """Increase a counter, or change a gauge by value"""
+        key = self._key(labels)
+        with self._lock:
+            self._types.setdefault(name, "counter")
+            series = self._values.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+        if self.callback is not None:
+            self.callback(name, value, labels)
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Add an observation to a histogram"""
+        key = self._key(labels)
+        with self._lock:
+            self._types.setdefault(name, "histogram")
+            series = self._histograms.setdefault(name, {})
+            # Per-bucket counts, then sum and count
+            state = series.get(key)
+            if state is None:
+                state = series[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+        if self.callback is not None:
+            self.callback(name, value, labels)
+
+    @contextmanager
+    def time(self, name: str, **labels: str) -> Iterator[None]:
+        """Observe the duration of a block in a histogram"""
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started_at, **labels)
+
+    @contextmanager
+    def in_flight(self, name: str, **labels: str) -> Iterator[None]:
+        """Count a block in a gauge while it runs"""
+        self.inc(name, 1, **labels)
+        try:
+            yield
+        finally:
+            self.inc(name, -1, **labels)
+
+    def value(self, name: str, **labels: str) -> float:
+        """Current value of a counter or gauge"""
+        with self._lock:
+            return self._values.get(name, {}).get(self._key(labels), 0.0)
+
+    def count(self, name: str, **labels: str) -> int:
+        """Number of observations in a histogram"""
+        with self._lock:
+            state = self._histograms.get(name, {}).get(self._key(labels))
+            return int(state[-1]) if state else 0
+
+    def render(self) -> str:
+        """Everything recorded so far in Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name in sorted(set(self._values) | set(self._histograms)):
+                kind = self._types[name]
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+
+                for key, value in sorted(self._values.get(name, {}).items()):
+                    lines.append(f"{name}{_labels(key)} {_number(value)}")
+
+                for key, state in sorted(self._histograms.get(name, {}).items()):
+                    cumulative = 0.0
+                    for bound, bucket_count in zip(self.buckets, state):
+                        cumulative += bucket_count
+                        lines.append(
+                            f"{name}_bucket{_labels(key + (('le', _number(bound)),))} "
+                            f"{_number(cumulative)}"
+                        )
+                    lines.append(f"{name}_bucket{_labels(key + (('le', '+Inf'),))} "
+                                 f"{_number(state[-1])}")
+                    lines.append(f"{name}_sum{_labels(key)} {_number(state[-2])}")
+                    lines.append(f"{name}_count{_labels(key)} {_number(state[-1])}")
+        return "\n".join(lines) + "\n"
+
+
+def timed(metrics: Optional[Metrics], name: str, **labels: str) -> ContextManager:
+    """metrics.time(), or a no-op when metrics are disabled"""
+    return metrics.time(name, **labels) if metrics is not None else nullcontext()
+
+
+def tracked(metrics: Optional[Metrics], name: str, **labels: str) -> ContextManager:
+    """metrics.in_flight(), or a no-op when metrics are disabled"""
+    return metrics.in_flight(name, **labels) if metrics is not None else nullcontext()
+
+
+def _labels(key: LabelKey) -> str:
+    """Format a label set, escaping values as the text format requires"""
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in key) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    """Format a sample value, dropping .0 from whole numbers"""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
@@ -0,0 +1,282 @@
+"""
+Rate limiting for Shelby SDK
+Token buckets per endpoint family, an AIMD adaptive concurrency limit and
+transfer windows that follow it
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Optional, Dict, Any, Tuple
+
+
+class TokenBucket:
+    """Token bucket refilled at rate tokens per second, holding up to burst
+
+    Acquiring more tokens than are available puts the bucket in debt and
+    waits until the debt is repaid, so oversized requests (a chunk bigger
+    than the burst) still get through and concurrent callers queue in
+    arrival order.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """Initialize a full bucket
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity (default one second of tokens)
+        """
+        self.rate = rate
+        self.burst = max(1.0, burst if burst is not None else rate)
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def take(self, amount: float) -> float:
+        """Take tokens without waiting
+
+        Returns:
+            Seconds until the bucket is out of debt
+        """
+        self._refill()
+        self._tokens -= amount
+        return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """Take tokens, waiting until the rate allows them"""
+        wait = self.take(amount)
+        if wait <= 0:
+            return
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            self._tokens += amount  # Never sent, give the tokens back
+            raise
+
+
+class RateLimiter:
+    """Requests/sec and bytes/sec token buckets per endpoint family
+
+    Families without an override share the default limits but get their
+    own buckets, so a busy upload family doesn't starve blob lookups.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        bytes_per_second: Optional[float] = None,
+        overrides: Optional[Dict[str, Dict[str, float]]] = None,
+    ):
+        """Initialize the limiter
+
+        Args:
+            requests_per_second: Default request rate per family (None = unlimited)
+            bytes_per_second: Default body byte rate per family (None = unlimited)
+            overrides: Per family {"requests_per_second": ..., "bytes_per_second": ...}
+        """
+        self.requests_per_second = requests_per_second
+        self.bytes_per_second = bytes_per_second
+        self.overrides = overrides or {}
+        self._buckets: Dict[str, Tuple[Optional[TokenBucket], Optional[TokenBucket]]] = {}
+
+    def _buckets_for(self, family: str) -> Tuple[Optional[TokenBucket], Optional[TokenBucket]]:
+        """Get (creating on first use) the request and byte buckets of a family"""
+        if family not in self._buckets:
+            limits = self.overrides.get(family, {})
+            rps = limits.get("requests_per_second", self.requests_per_second)
+            bps = limits.get("bytes_per_second", self.bytes_per_second)
+            self._buckets[family] = (
+                TokenBucket(rps) if rps else None,
+                TokenBucket(bps) if bps else None,
+            )
+        return self._buckets[family]
+
+    def limits_bytes(self, family: str) -> bool:
+        """Check whether a family has a bytes/sec limit"""
+        return self._buckets_for(family)[1] is not None
+
+    async def acquire(self, family: str, nbytes: int = 0) -> None:
+        """Wait until a request with an nbytes body may be sent"""
+        requests, body_bytes = self._buckets_for(family)
+        if requests is not None:
+            await requests.acquire()
+        if body_bytes is not None and nbytes:
+            await body_bytes.acquire(nbytes)
+
+    def charge_bytes(self, family: str, nbytes: int) -> None:
+        """Charge bytes already received; later requests wait off the debt"""
+        body_bytes = self._buckets_for(family)[1]
+        if body_bytes is not None and nbytes:
+            body_bytes.take(nbytes)
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on concurrent requests
+
+    Each success while the limit is in use grows it by 1/limit, about one
+    slot per round trip. Overload (429, 5xx, timeouts) or latency rising
+    to latency_tolerance times its long-run average cuts it by
+    backoff_ratio, at most once per round trip.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff_ratio: float = 0.5,
+        latency_tolerance: float = 2.0,
+        latency_floor: float = 0.005,
+    ):
+        """Initialize the limiter
+
+        Args:
+            latency_floor: Latency increases smaller than this, in seconds, are noise
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(self.max_limit, max(self.min_limit, initial_limit)))
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.latency_floor = latency_floor
+        self._inflight = 0
+        self._waiters: "deque[asyncio.Future]" = deque()
+        self._decreased_at = 0.0
+        self._recent_latency: Optional[float] = None
+        self._baseline_latency: Optional[float] = None
+
+    async def acquire(self) -> None:
+        """Wait for a free slot"""
+        if not self._waiters and self._inflight < int(self.limit):
+            self._inflight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancel
+                self._inflight -= 1
+                self._wake()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, started_at: Optional[float] = None, overloaded: bool = False) -> None:
+        """Free a slot and adjust the limit
+
+        Args:
+            started_at: time.monotonic() when the request was sent, or
+                None if it ended without saying anything about the server
+            overloaded: The server was overloaded (429, 5xx, timeout)
+        """
+        was_saturated = self._inflight >= int(self.limit)
+        self._inflight -= 1
+
+        if started_at is not None:
+            if overloaded:
+                self._decrease(started_at)
+            elif self._latency_rising(time.monotonic() - started_at):
+                self._decrease(started_at)
+            elif was_saturated:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+        self._wake()
+
+    def _latency_rising(self, latency: float) -> bool:
+        """Track short- and long-run latency averages and compare them"""
+        recent, baseline = self._recent_latency, self._baseline_latency
+        if recent is None or baseline is None:
+            self._recent_latency = self._baseline_latency = latency
+            return False
+        recent += 0.3 * (latency - recent)
+        baseline += 0.02 * (latency - baseline)
+        self._recent_latency, self._baseline_latency = recent, baseline
+        return recent > max(
+            baseline * self.latency_tolerance,
+            baseline + self.latency_floor,
+        )
+
+    def _decrease(self, started_at: float) -> None:
+        """Cut the limit, ignoring requests sent before the previous cut"""
+        if started_at < self._decreased_at:
+            return
+        self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+        self._decreased_at = time.monotonic()
+
+    def _wake(self) -> None:
+        """Hand free slots to waiters in arrival order"""
+        while self._waiters and self._inflight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._inflight += 1
+                waiter.set_result(None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Inspectable view of the limiter"""
+        return {
+            "limit": int(self.limit),
+            "in_flight": self._inflight,
+            "waiting": len(self._waiters),
+        }
+
+
+class TransferWindow:
+    """Slots for the chunks one transfer holds in memory
+
+    Without a limiter this is a semaphore of size slots. With an
+    AdaptiveConcurrencyLimiter it admits only as many chunks as the
+    limiter's current limit (at most size), so data isn't read ahead of
+    requests the limiter would hold back.
+    """
+
+    def __init__(self, size: int, limiter: Optional[AdaptiveConcurrencyLimiter] = None):
+        """Initialize the window
+
+        Args:
+            size: Most slots, whatever the limiter allows
+            limiter: Adaptive limit the window follows
+        """
+        self.size = max(1, size)
+        self.limiter = limiter
+        self._held = 0
+        self._waiters: "deque[asyncio.Future]" = deque()
+
+    @property
+    def limit(self) -> int:
+        """Slots currently allowed"""
+        if self.limiter is None:
+            return self.size
+        return max(1, min(self.size, int(self.limiter.limit)))
+
+    async def acquire(self) -> None:
+        """Wait for a free slot"""
+        if not self._waiters and self._held < self.limit:
+            self._held += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # The slot was handed over just before the cancel
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        """Free a slot and hand free slots to waiters in arrival order"""
+        self._held -= 1
+        while self._waiters and self._held < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._held += 1
+                waiter.set_result(None)
@@ -0,0 +1,279 @@
+"""
+Blob reader for Shelby SDK
+Seekable async file-like access to a blob, fetched chunk by chunk
+"""
+
+import asyncio
+import bisect
+import os
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, TYPE_CHECKING
+from .exceptions import ShelbyDownloadError
+
+if TYPE_CHECKING:
+    from .download import DownloadManager
+
+
+class BlobReader:
+    """Async file-like reader over a blob
+
+    Chunks are fetched on demand and kept in a small LRU, so memory stays
+    bounded by cache_chunks chunks whatever the blob size. Reads that
+    continue where the previous one ended grow a readahead window
+    (doubling up to max_readahead chunks) that prefetches the following
+    chunks in the background; a seek elsewhere resets it, so random access
+    only fetches the chunks it touches.
+
+    Use it as an async context manager, or call close() when done::
+
+        async with downloader.open(blob_id, "default") as reader:
+            async for line in reader:
+                ...
+    """
+
+    def __init__(
+        self,
+        downloader: "DownloadManager",
+        blob_id: str,
+        account_name: str,
+        blob_info: Optional[Dict[str, Any]] = None,
+        cache_chunks: int = 8,
+        max_readahead: int = 4,
+    ):
+        """Initialize the reader; metadata is fetched on first use if not given
+
+        Args:
+            downloader: Download manager that fetches chunks
+            blob_id: Blob ID to read
+            account_name: Account name to read from
+            blob_info: Blob metadata from GET blob/{id}, if already fetched
+            cache_chunks: Chunks kept in memory
+            max_readahead: Most chunks prefetched ahead of a sequential read
+        """
+        self.downloader = downloader
+        self.blob_id = blob_id
+        self.account_name = account_name
+        self.max_readahead = max(0, max_readahead)
+        self.cache_chunks = max(1, cache_chunks, self.max_readahead + 1)
+        self._blob_info = blob_info
+        self._chunks: List[Dict[str, Any]] = []
+        self._sizes: List[int] = []
+        self._offsets: List[int] = []
+        self._size = 0
+        self._loaded = False
+        self._position = 0
+        self._sequential_end = 0
+        self._window = 0
+        self._last_chunk: Optional[int] = None
+        self._cache: "OrderedDict[int, asyncio.Task]" = OrderedDict()
+        self.closed = False
+        self.stats = {"fetches": 0, "prefetches": 0, "hits": 0}
+
+    async def _load(self) -> None:
+        """Fetch blob metadata and lay out its chunks"""
+        if self._loaded:
+            return
+        # Imported here: download imports this module for DownloadManager.open
+        from .download import _chunk_layout
+
+        if self._blob_info is None:
+            self._blob_info = await self.downloader._get_blob_info(self.blob_id)
+        self._chunks, self._sizes = _chunk_layout(self._blob_info)
+        self._offsets = [chunk_info["offset"] for chunk_info in self._chunks]
+        self._size = self._blob_info.get("size", 0)
+        self._loaded = True
+
+    @property
+    def size(self) -> int:
+        """Blob size in bytes (0 until metadata is loaded)"""
+        return self._size
+
+    def tell(self) -> int:
+        """Current position"""
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """Move the position; SEEK_END needs metadata, so read or enter first
+
+        Returns:
+            The new position
+        """
+        self._check_open()
+        if whence == os.SEEK_SET:
+            position = offset
+        elif whence == os.SEEK_CUR:
+            position = self._position + offset
+        elif whence == os.SEEK_END:
+            if not self._loaded:
+                raise ValueError("SEEK_END before metadata is loaded")
+            position = self._size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError("Negative seek position")
+        self._position = position
+        return position
+
+    def seekable(self) -> bool:
+        """Always True"""
+        return True
+
+    def readable(self) -> bool:
+        """Always True"""
+        return True
+
+    async def read(self, size: int = -1) -> bytes:
+        """Read up to size bytes, or to the end of the blob if size is negative"""
+        await self._load()
+        end = self._size if size is None or size < 0 else min(self._size, self._position + size)
+        buffer = bytearray(max(0, end - self._position))
+        await self._fill(memoryview(buffer))
+        return bytes(buffer)
+
+    async def readinto(self, buffer: Any) -> int:
+        """Read into a writable buffer
+
+        Returns:
+            Number of bytes read, 0 at the end of the blob
+        """
+        await self._load()
+        view = memoryview(buffer).cast("B")
+        length = min(len(view), max(0, self._size - self._position))
+        await self._fill(view[:length])
+        return length
+
+    async def readline(self, limit: int = -1) -> bytes:
+        """Read through the next newline, up to limit bytes"""
+        await self._load()
+        self._check_open()
+        sequential = self._begin_read()
+        line = bytearray()
+        while self._position < self._size and (limit < 0 or len(line) < limit):
+            position = self._locate(self._position)
+            data = await self._chunk(position, position, sequential)
+            start = self._position - self._offsets[position]
+            stop = len(data) if limit < 0 else min(len(data), start + limit - len(line))
+            newline = data.find(b"\n", start, stop)
+            if newline >= 0:
+                stop = newline + 1
+            line += data[start:stop]
+            self._position += stop - start
+            if newline >= 0 or stop == start:
+                break
+        self._sequential_end = self._position
+        return bytes(line)
+
+    async def readlines(self) -> List[bytes]:
+        """Read every remaining line"""
+        return [line async for line in self]
+
+    def __aiter__(self) -> "BlobReader":
+        return self
+
+    async def __anext__(self) -> bytes:
+        line = await self.readline()
+        if not line:
+            raise StopAsyncIteration
+        return line
+
+    async def __aenter__(self) -> "BlobReader":
+        await self._load()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Cancel prefetches and drop cached chunks"""
+        self.closed = True
+        tasks = list(self._cache.values())
+        self._cache.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _check_open(self) -> None:
+        if self.closed:
+            raise ValueError("I/O operation on closed blob reader")
+
+    def _locate(self, offset: int) -> int:
+        """Position in the chunk list of the chunk holding offset"""
+        return bisect.bisect_right(self._offsets, offset) - 1
+
+    def _begin_read(self) -> bool:
+        """Whether a read continues the previous one; resets readahead if not"""
+        sequential = self._position == self._sequential_end
+        if not sequential:
+            self._window = 0  # Random access: fetch only what is read
+        return sequential
+
+    async def _fill(self, view: memoryview) -> None:
+        """Copy len(view) bytes from the current position into view"""
+        self._check_open()
+        sequential = self._begin_read()
+        last = self._locate(self._position + len(view) - 1)
+        filled = 0
+        while filled < len(view):
+            position = self._locate(self._position)
+            data = await self._chunk(position, last, sequential)
+            start = self._position - self._offsets[position]
+            count = min(len(view) - filled, self._sizes[position] - start)
+            if len(data) < start + count:
+                raise ShelbyDownloadError(
+                    f"Chunk {self._chunks[position]['index']} is shorter than its metadata"
+                )
+            view[filled:filled + count] = memoryview(data)[start:start + count]
+            filled += count
+            self._position += count
+        self._sequential_end = self._position
+
+    async def _chunk(self, position: int, last: int, sequential: bool) -> bytes:
+        """Chunk data at a position in the chunk list, from the LRU or fetched
+
+        Chunks up to last (the end of the current read) are fetched
+        alongside it; on a sequential read the readahead window grows each
+        time a new chunk is entered and the chunks after it are prefetched.
+        """
+        task = self._cache.get(position)
+        if task is None:
+            self.stats["fetches"] += 1
+            task = self._start_fetch(position)
+        else:
+            self.stats["hits"] += 1
+            self._cache.move_to_end(position)
+
+        if position != self._last_chunk and sequential:
+            self._window = min(self.max_readahead, max(1, self._window * 2))
+        self._last_chunk = position
+        stop = max(last, position + (self._window if sequential else 0))
+        stop = min(stop, position + self.cache_chunks - 1, len(self._chunks) - 1)
+        for ahead in range(position + 1, stop + 1):
+            if ahead in self._cache:
+                # About to be read, so keep it ahead of chunks already consumed
+                self._cache.move_to_end(ahead)
+            else:
+                self.stats["prefetches"] += 1
+                self._start_fetch(ahead)
+
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            # Don't keep a failed fetch around; the next read retries it
+            if self._cache.get(position) is task:
+                del self._cache[position]
+            raise
+
+    def _start_fetch(self, position: int) -> asyncio.Task:
+        """Fetch a chunk in the background and cache it, evicting the LRU"""
+        chunk_info = self._chunks[position]
+        task = asyncio.ensure_future(self.downloader._download_chunk(
+            self.blob_id, chunk_info["index"], self.account_name, chunk_info.get("hash")
+        ))
+        self._cache[position] = task
+        while len(self._cache) > self.cache_chunks:
+            _, evicted = self._cache.popitem(last=False)
+            if not evicted.done():
+                evicted.cancel()
+            elif not evicted.cancelled():
+                evicted.exception()  # An unused prefetch may have failed; that's fine
+        return task
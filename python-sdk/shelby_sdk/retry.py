@@ -0,0 +1,115 @@
+"""
+Retry policy for Shelby SDK
+Decides which failed requests are retried and how long to wait
+"""
+
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+import httpx
+
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+@dataclass
+class RetryPolicy:
+    """Retry behavior for API requests
+
+    Only transient failures are retried: timeouts, network errors and the
+    status codes in retry_on_status. Waits use full-jitter exponential
+    backoff unless the server sent a Retry-After header. Subclass and
+    override is_retryable or delay to customize.
+    """
+
+    max_retries: int = 3
+    base_delay: float = 0.5  # Backoff cap for the first retry, in seconds
+    max_delay: float = 30.0
+    retry_on_status: frozenset = RETRYABLE_STATUS_CODES
+    respect_retry_after: bool = True
+    max_retry_after: float = 60.0  # Longest Retry-After honored, in seconds
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Check whether a failed attempt is worth retrying"""
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in self.retry_on_status
+        return isinstance(
+            error,
+            (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for a zero-based retry attempt"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def delay(self, attempt: int, error: Exception) -> float:
+        """Seconds to wait before the next attempt"""
+        if self.respect_retry_after and isinstance(error, httpx.HTTPStatusError):
+            retry_after = parse_retry_after(error.response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+        return self.backoff(attempt)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds
+
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryBudget:
+    """Caps retries at a fraction of the client's request traffic
+
+    Every request deposits ratio tokens and every retry spends one, so
+    retries stay at most ratio of requests. A small reserve refilled at
+    min_retries_per_second lets a quiet client still retry.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_retries_per_second: float = 10.0,
+        max_balance: float = 100.0,
+    ):
+        """Initialize the budget with a full reserve"""
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.max_balance = max_balance
+        self._balance = min_retries_per_second
+        self._refilled_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        reserve = (now - self._refilled_at) * self.min_retries_per_second
+        self._refilled_at = now
+        self._balance = min(self.max_balance, self._balance + reserve)
+
+    def record_request(self) -> None:
+        """Credit the budget for a new (non-retry) request"""
+        self._refill()
+        self._balance = min(self.max_balance, self._balance + self.ratio)
+
+    def try_acquire(self) -> bool:
+        """Spend budget on a retry; False if retries are exhausted"""
+        self._refill()
+        if self._balance < 1:
+            return False
+        self._balance -= 1
+        return True
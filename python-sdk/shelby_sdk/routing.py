@@ -0,0 +1,134 @@
+"""
+Endpoint routing for Shelby SDK
+Picks the healthiest, lowest-latency API endpoint and ejects failing ones
+"""
+
+import time
+from typing import Optional, Dict, Any, List, Iterable
+
+
+class Endpoint:
+    """Health and latency record of one API endpoint"""
+
+    def __init__(self, url: str):
+        """Initialize an endpoint with no samples yet"""
+        self.url = url
+        self.latency: Optional[float] = None  # EWMA, seconds
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+
+    @property
+    def ejected(self) -> bool:
+        """Whether the endpoint is currently taken out of rotation"""
+        return self.ejected_until > time.monotonic()
+
+
+class EndpointRouter:
+    """Routes requests across API endpoints
+
+    Each request goes to the endpoint with the lowest EWMA latency among
+    those not ejected; endpoints without samples are tried first. After
+    failure_threshold consecutive failures an endpoint is ejected for
+    ejection_time seconds, doubling on each repeat up to max_ejection_time.
+    A successful request or health probe reinstates it. If every endpoint
+    is ejected, the one due back soonest is used anyway.
+    """
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        ewma_alpha: float = 0.3,
+        failure_threshold: int = 3,
+        ejection_time: float = 30.0,
+        max_ejection_time: float = 300.0,
+    ):
+        """Initialize the router
+
+        Args:
+            urls: API endpoints, in order of preference when nothing is known
+            ewma_alpha: Weight of the newest latency sample
+            failure_threshold: Consecutive failures that eject an endpoint
+            ejection_time: Seconds an endpoint is first ejected for
+            max_ejection_time: Longest ejection
+        """
+        self.endpoints = [Endpoint(url) for url in urls]
+        if not self.endpoints:
+            raise ValueError("At least one API endpoint is required")
+        self._by_url = {endpoint.url: endpoint for endpoint in self.endpoints}
+        self.ewma_alpha = ewma_alpha
+        self.failure_threshold = max(1, failure_threshold)
+        self.ejection_time = ejection_time
+        self.max_ejection_time = max_ejection_time
+
+    @property
+    def urls(self) -> List[str]:
+        """All endpoint URLs"""
+        return [endpoint.url for endpoint in self.endpoints]
+
+    def choose(self, exclude: Optional[str] = None) -> str:
+        """Pick the endpoint for the next request
+
+        Args:
+            exclude: Endpoint to avoid if any other is available, e.g. the
+                one a failed attempt just went to
+
+        Returns:
+            Endpoint URL
+        """
+        candidates = [
+            endpoint for endpoint in self.endpoints
+            if not endpoint.ejected and endpoint.url != exclude
+        ]
+        if not candidates:
+            candidates = [endpoint for endpoint in self.endpoints if not endpoint.ejected]
+        if not candidates:
+            return min(self.endpoints, key=lambda endpoint: endpoint.ejected_until).url
+
+        return min(
+            candidates,
+            key=lambda endpoint: endpoint.latency if endpoint.latency is not None else 0.0,
+        ).url
+
+    def record_success(self, url: str, latency: Optional[float] = None) -> None:
+        """Record a response from an endpoint, reinstating it if ejected"""
+        endpoint = self._by_url.get(url)
+        if endpoint is None:
+            return
+
+        endpoint.consecutive_failures = 0
+        endpoint.ejections = 0
+        endpoint.ejected_until = 0.0
+        if latency is not None:
+            if endpoint.latency is None:
+                endpoint.latency = latency
+            else:
+                endpoint.latency += self.ewma_alpha * (latency - endpoint.latency)
+
+    def record_failure(self, url: str) -> None:
+        """Record a failed request, ejecting the endpoint past the threshold"""
+        endpoint = self._by_url.get(url)
+        if endpoint is None:
+            return
+
+        endpoint.consecutive_failures += 1
+        if endpoint.consecutive_failures >= self.failure_threshold and not endpoint.ejected:
+            endpoint.ejections += 1
+            duration = min(
+                self.max_ejection_time,
+                self.ejection_time * 2 ** (endpoint.ejections - 1),
+            )
+            endpoint.ejected_until = time.monotonic() + duration
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Inspectable view of every endpoint"""
+        now = time.monotonic()
+        return {
+            endpoint.url: {
+                "latency": endpoint.latency,
+                "consecutive_failures": endpoint.consecutive_failures,
+                "ejected": endpoint.ejected,
+                "ejected_for": max(0.0, endpoint.ejected_until - now),
+            }
+            for endpoint in self.endpoints
+        }
@@ -0,0 +1,351 @@
+"""
+Local stand-in for the Shelby API
+Used by the test suite and benchmarks in place of a real deployment
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any, List, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+
+class StandInServer:
+    """In-memory HTTP server speaking the subset of the API the SDK uses
+
+    Runs on a background thread. With legacy=True it behaves like an older
+    server: no capabilities endpoint, hex JSON chunks only and the file hash
+    required at upload/init.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        chunk_size: int = 1024 * 1024,
+        legacy: bool = False,
+    ):
+        """Initialize the stand-in server"""
+        self.chunk_size = chunk_size
+        self.legacy = legacy
+        self.blobs: Dict[str, Dict[str, Any]] = {}
+        self.uploads: Dict[str, Dict[str, Any]] = {}
+        self.requests: List[Tuple[str, str]] = []
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL clients should use as api_url"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def start(self) -> "StandInServer":
+        """Start serving on a background thread"""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and release its socket"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def add_blob(
+        self,
+        data: bytes,
+        name: Optional[str] = None,
+        account: str = "default",
+    ) -> str:
+        """Store a blob directly, bypassing the upload flow
+
+        Returns:
+            The new blob ID
+        """
+        blob_id = uuid.uuid4().hex
+        chunks = []
+        for index, offset in enumerate(range(0, len(data), self.chunk_size)):
+            chunk = data[offset:offset + self.chunk_size]
+            chunks.append({
+                "index": index,
+                "offset": offset,
+                "size": len(chunk),
+                "hash": hashlib.sha256(chunk).hexdigest(),
+            })
+
+        with self._lock:
+            self.blobs[blob_id] = {
+                "id": blob_id,
+                "account": account,
+                "size": len(data),
+                "hash": hashlib.sha256(data).hexdigest(),
+                "chunks": chunks,
+                "metadata": {"name": name or blob_id},
+                "data": data,
+            }
+        return blob_id
+
+    def blob_data(self, blob_id: str) -> bytes:
+        """Get the stored contents of a blob"""
+        data: bytes = self.blobs[blob_id]["data"]
+        return data
+
+    def count_requests(self, method: str, prefix: str = "") -> int:
+        """Count handled requests by method and path prefix"""
+        return sum(
+            1 for m, path in self.requests
+            if m == method and path.startswith(prefix)
+        )
+
+    def traffic(self) -> Dict[str, int]:
+        """Body bytes received from and sent to clients"""
+        return {"received": self.bytes_received, "sent": self.bytes_sent}
+
+
+def _make_handler(server: StandInServer) -> type:
+    """Build a request handler class bound to a stand-in server"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            self._dispatch("GET")
+
+        def do_POST(self) -> None:
+            self._dispatch("POST")
+
+        def do_PUT(self) -> None:
+            self._dispatch("PUT")
+
+        def do_DELETE(self) -> None:
+            self._dispatch("DELETE")
+
+        def _dispatch(self, method: str) -> None:
+            parts = urlsplit(self.path)
+            self.query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+            length = int(self.headers.get("Content-Length") or 0)
+            self.body = self.rfile.read(length) if length else b""
+            with server._lock:
+                server.requests.append((method, parts.path))
+                server.bytes_received += len(self.body)
+
+            segments = [s for s in parts.path.split("/") if s]
+            route = getattr(self, f"_{method.lower()}_{'_'.join(segments[:1]) or 'root'}", None)
+            if route is None:
+                self._json({"error": "not found"}, 404)
+                return
+            route(segments[1:])
+
+        # Responses
+
+        def _send_body(self, body: bytes, content_type: str, status: int = 200,
+                       headers: Optional[Dict[str, str]] = None) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+            with server._lock:
+                server.bytes_sent += len(body)
+
+        def _json(self, payload: Any, status: int = 200,
+                  headers: Optional[Dict[str, str]] = None) -> None:
+            self._send_body(json.dumps(payload).encode(), "application/json", status, headers)
+
+        def _validated_json(self, payload: Any) -> None:
+            """Send JSON with an ETag, or 304 if the client's copy is current"""
+            body = json.dumps(payload, sort_keys=True).encode()
+            etag = f'"{hashlib.sha256(body).hexdigest()}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self._send_body(body, "application/json", headers={"ETag": etag})
+
+        def _json_body(self) -> Dict[str, Any]:
+            body: Dict[str, Any] = json.loads(self.body or b"{}")
+            return body
+
+        # Routes
+
+        def _get_health(self, rest: List[str]) -> None:
+            self._json({"status": "ok"})
+
+        def _get_capabilities(self, rest: List[str]) -> None:
+            if server.legacy:
+                self._json({"error": "not found"}, 404)
+                return
+            self._json({"binary_chunks": True, "deferred_hash": True})
+
+        def _get__traffic(self, rest: List[str]) -> None:
+            self._json(server.traffic())
+
+        def _get_stats(self, rest: List[str]) -> None:
+            with server._lock:
+                stats = {
+                    "total_uploads": len(server.blobs),
+                    "total_bytes": sum(blob["size"] for blob in server.blobs.values()),
+                }
+            self._validated_json(stats)
+
+        def _post_upload(self, rest: List[str]) -> None:
+            action = rest[0] if rest else ""
+            if action == "init":
+                request = self._json_body()
+                if server.legacy and not request.get("file_hash"):
+                    self._json({"error": "file_hash is required"}, 400)
+                    return
+                upload_id = uuid.uuid4().hex
+                with server._lock:
+                    server.uploads[upload_id] = {**request, "chunks": {}}
+                self._json({"upload_id": upload_id})
+            elif action == "chunk":
+                self._upload_chunk()
+            elif action == "finalize":
+                self._finalize_upload()
+            else:
+                self._json({"error": "not found"}, 404)
+
+        def _upload_chunk(self) -> None:
+            if self.headers.get("Content-Type", "").startswith("application/octet-stream"):
+                if server.legacy:
+                    self._json({"error": "unsupported media type"}, 415)
+                    return
+                upload_id = self.headers.get("X-Upload-Id", "")
+                index = int(self.headers.get("X-Chunk-Index", "-1"))
+                chunk_hash = self.headers.get("X-Chunk-Hash")
+                data = self.body
+            else:
+                request = self._json_body()
+                upload_id = request.get("upload_id", "")
+                index = int(request.get("chunk_index", -1))
+                chunk_hash = request.get("chunk_hash")
+                data = bytes.fromhex(request.get("chunk_data", ""))
+
+            upload = server.uploads.get(upload_id)
+            if upload is None:
+                self._json({"error": "unknown upload"}, 404)
+                return
+            if hashlib.sha256(data).hexdigest() != chunk_hash:
+                self._json({"error": "chunk hash mismatch"}, 400)
+                return
+
+            with server._lock:
+                upload["chunks"][index] = data
+            self._json({"status": "ok", "chunk_index": index})
+
+        def _finalize_upload(self) -> None:
+            request = self._json_body()
+            upload = server.uploads.get(request.get("upload_id", ""))
+            if upload is None:
+                self._json({"error": "unknown upload"}, 404)
+                return
+
+            data = b"".join(upload["chunks"][i] for i in sorted(upload["chunks"]))
+            file_hash = request.get("file_hash") or upload.get("file_hash")
+            if hashlib.sha256(data).hexdigest() != file_hash:
+                self._json({"error": "file hash mismatch"}, 400)
+                return
+
+            blob_id = server.add_blob(
+                data,
+                name=upload.get("file_name"),
+                account=upload.get("account", "default"),
+            )
+            with server._lock:
+                del server.uploads[request["upload_id"]]
+            self._json({"blob_id": blob_id, "file_hash": file_hash, "size": len(data)})
+
+        def _get_blob(self, rest: List[str]) -> None:
+            if rest == ["list"]:
+                self._list_blobs()
+                return
+
+            blob = server.blobs.get(rest[0]) if rest else None
+            if blob is None:
+                self._json({"error": "blob not found"}, 404)
+                return
+
+            if len(rest) == 1:
+                self._json({k: v for k, v in blob.items() if k != "data"})
+            elif len(rest) == 3 and rest[1] == "chunk":
+                self._get_chunk(blob, int(rest[2]))
+            else:
+                self._json({"error": "not found"}, 404)
+
+        def _list_blobs(self) -> None:
+            account = self.query.get("account")
+            offset = int(self.query.get("offset", 0))
+            limit = int(self.query.get("limit", 100))
+            with server._lock:
+                blobs = [
+                    {k: v for k, v in blob.items() if k not in ("data", "chunks")}
+                    for blob in server.blobs.values()
+                    if account is None or blob["account"] == account
+                ]
+            self._validated_json({"blobs": blobs[offset:offset + limit]})
+
+        def _get_chunk(self, blob: Dict[str, Any], index: int) -> None:
+            if not 0 <= index < len(blob["chunks"]):
+                self._json({"error": "chunk not found"}, 404)
+                return
+
+            info = blob["chunks"][index]
+            data = blob["data"][info["offset"]:info["offset"] + info["size"]]
+            accept = self.headers.get("Accept", "")
+            if "application/octet-stream" in accept and not server.legacy:
+                self._send_body(
+                    data,
+                    "application/octet-stream",
+                    headers={"X-Chunk-Hash": info["hash"]},
+                )
+            else:
+                self._json({"index": index, "data": data.hex(), "hash": info["hash"]})
+
+    return Handler
+
+
+def main() -> None:
+    """Run a stand-in server in the foreground"""
+    parser = argparse.ArgumentParser(description="Local stand-in for the Shelby API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=1024 * 1024)
+    parser.add_argument("--legacy", action="store_true", help="emulate a hex-only server")
+    args = parser.parse_args()
+
+    server = StandInServer(args.host, args.port, args.chunk_size, args.legacy)
+    print(server.url, flush=True)
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Tracing for Shelby SDK
+Nested spans around transfer phases with pluggable exporters
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, List, Iterator, ContextManager
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("shelby_current_span", default=None)
+
+
+class Span:
+    """One timed operation; spans started inside it become its children"""
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        """Start a span"""
+        self.name = name
+        self.trace_id: str = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id: str = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = dict(attributes)
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach or overwrite an attribute"""
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form of a finished span"""
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "end": self.end,
+            "duration": (self.end or time.time()) - self.start,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class InMemoryExporter:
+    """Keeps finished spans in a list; handy in tests and notebooks"""
+
+    def __init__(self) -> None:
+        """Initialize an empty exporter"""
+        self.spans: List[Span] = []
+
+    def export(self, span: Span) -> None:
+        """Store a finished span"""
+        self.spans.append(span)
+
+
+class JsonLinesExporter:
+    """Appends each finished span as a JSON line to a local file
+
+    Lines are flushed as they are written, so a trace of a transfer that
+    crashed or is still running can be read while it happens.
+    """
+
+    def __init__(self, path: str):
+        """Open (creating if needed) the trace file for appending"""
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        """Write a finished span"""
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the trace file"""
+        with self._lock:
+            self._file.close()
+
+
+class Tracer:
+    """Creates spans and hands finished ones to an exporter
+
+    Any object with an export(span) method works as an exporter.
+    """
+
+    def __init__(self, exporter: Any):
+        """Initialize the tracer"""
+        self.exporter = exporter
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Run a block inside a new child of the current span"""
+        span = Span(name, _current_span.get(), attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end = time.time()
+            self.exporter.export(span)
+
+
+def start_span(tracer: Optional[Tracer], name: str, **attributes: Any) -> ContextManager:
+    """tracer.span(), or a no-op yielding None when tracing is off"""
+    return tracer.span(name, **attributes) if tracer is not None else nullcontext()
+
+
+def current_span() -> Optional[Span]:
+    """The innermost span of the running task, if any"""
+    return _current_span.get()
+
+
+def add_to_span(key: str, amount: int = 1) -> None:
+    """Increase a numeric attribute of the current span, e.g. retries"""
+    span = _current_span.get()
+    if span is not None:
+        span.attributes[key] = span.attributes.get(key, 0) + amount
@@ -4,26 +4,36 @@ Upload module for Shelby SDK
 
 import os
 import hashlib
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, BinaryIO, Callable
 from .client import ShelbyClient
-from .exceptions import ShelbyUploadError
+from .exceptions import ShelbyError, ShelbyConnectionError, ShelbyUploadError
+from .journal import UploadJournal
+from .metrics import timed, tracked
+from .tracing import start_span, current_span
 import asyncio
 
 
 class UploadManager:
     """Handle file uploads to Shelby network"""
 
-    def __init__(self, client: ShelbyClient):
-        """Initialize upload manager"""
+    def __init__(self, client: ShelbyClient, journal: Optional[UploadJournal] = None):
+        """Initialize upload manager
+
+        Args:
+            client: Shelby client to upload through
+            journal: Optional upload journal; when given, interrupted uploads
+                of an unchanged file resume instead of starting over
+        """
         self.client = client
         self.chunk_size = 1024 * 1024  # 1MB chunks
+        self.journal = journal
 
     async def upload_file(
         self,
         file_path: str,
         account_name: str,
         metadata: Optional[Dict[str, Any]] = None,
-        progress_callback: Optional[callable] = None,
+        progress_callback: Optional[Callable[..., Any]] = None,
     ) -> Dict[str, Any]:
         """Upload a file to Shelby network
 
@@ -36,68 +46,299 @@ class UploadManager:
         Returns:
             Upload result with blob_id, commitment, etc.
         """
+        with start_span(self.client.tracer, "upload", file=file_path, account=account_name):
+            return await self._upload_file(file_path, account_name, metadata, progress_callback)
+
+    async def _upload_file(
+        self,
+        file_path: str,
+        account_name: str,
+        metadata: Optional[Dict[str, Any]],
+        progress_callback: Optional[Callable[..., Any]],
+    ) -> Dict[str, Any]:
+        """Initialize (or resume) an upload and send it"""
         if not os.path.exists(file_path):
             raise ShelbyUploadError(f"File not found: {file_path}")
 
         file_size = os.path.getsize(file_path)
         file_name = os.path.basename(file_path)
+        endpoints = self.client.config.api_urls
+        tracer = self.client.tracer
+
+        entry = None
+        if self.journal is not None:
+            for url in endpoints:
+                entry = self.journal.find(file_path, account_name, url, self.chunk_size)
+                if entry is not None:
+                    break
 
-        # Calculate file hash
-        file_hash = await self._hash_file(file_path)
+        # With several endpoints, chunks and finalize go where the upload
+        # was initialized
+        api_url = None
+        if self.client.config.pin_uploads and len(endpoints) > 1:
+            api_url = entry["api_url"] if entry is not None else self.client.select_endpoint()
 
-        # Initialize upload
-        init_response = await self.client._request(
-            "POST",
-            "upload/init",
-            data={
+        file_hasher = None
+        if entry is not None:
+            # Resume: chunks the server already acknowledged are not resent
+            upload_id = entry["upload_id"]
+            file_hash = entry["file_hash"]
+            acknowledged = set(entry["acknowledged"])
+            if file_hash is None:
+                file_hasher = hashlib.sha256()
+        else:
+            init_data = {
                 "file_name": file_name,
                 "file_size": file_size,
-                "file_hash": file_hash,
                 "account": account_name,
                 "metadata": metadata or {},
-            },
-            retries=self.client.config.max_retries,
-        )
+            }
 
-        upload_id = init_response.get("upload_id")
-        if not upload_id:
-            raise ShelbyUploadError("Failed to initialize upload")
+            # Servers that accept the file hash at finalize let us hash while
+            # streaming; older ones need it up front, costing an extra read
+            capabilities = await self.client.get_capabilities()
+            file_hash = None
+            if capabilities.get("deferred_hash"):
+                file_hasher = hashlib.sha256()
+                init_data["deferred_hash"] = True
+            else:
+                with start_span(tracer, "hash", size=file_size):
+                    file_hash = await self._hash_file(file_path)
+                init_data["file_hash"] = file_hash
 
-        # Upload in chunks
-        with open(file_path, "rb") as f:
-            chunk_index = 0
-            while True:
-                chunk = f.read(self.chunk_size)
-                if not chunk:
-                    break
+            # Initialize upload
+            with start_span(tracer, "init", size=file_size):
+                init_response = await self.client._request(
+                    "POST",
+                    "upload/init",
+                    data=init_data,
+                    retries=self.client.config.max_retries,
+                    api_url=api_url,
+                )
+
+            upload_id = init_response.get("upload_id")
+            if not upload_id:
+                raise ShelbyUploadError("Failed to initialize upload")
 
-                await self._upload_chunk(
-                    upload_id, chunk, chunk_index, progress_callback
+            acknowledged = set()
+            if self.journal is not None:
+                self.journal.start(
+                    upload_id, file_path, account_name, api_url or endpoints[0],
+                    self.chunk_size, file_hash,
                 )
-                chunk_index += 1
+
+        span = current_span()
+        if span is not None:
+            span.attributes.update(
+                size=file_size,
+                upload_id=upload_id,
+                resumed=entry is not None,
+                acknowledged=len(acknowledged),
+            )
+
+        if api_url is not None:
+            self.client.pin(upload_id, api_url)
+        try:
+            return await self._upload_chunks(
+                file_path, account_name, metadata, progress_callback, entry,
+                upload_id, file_hash, file_hasher, acknowledged,
+            )
+        finally:
+            self.client.unpin(upload_id)
+
+    async def _upload_chunks(
+        self,
+        file_path: str,
+        account_name: str,
+        metadata: Optional[Dict[str, Any]],
+        progress_callback: Optional[Callable[..., Any]],
+        entry: Optional[Dict[str, Any]],
+        upload_id: str,
+        file_hash: Optional[str],
+        file_hasher: Optional[Any],
+        acknowledged: set,
+    ) -> Dict[str, Any]:
+        """Send the chunks of an initialized upload and finalize it"""
+        file_size = os.path.getsize(file_path)
+
+        # Upload in chunks, keeping at most the window's limit in memory and
+        # on the wire at once
+        window = self.client.transfer_window("upload")
+        failures: Dict[int, ShelbyError] = {}
+        tasks: list[asyncio.Task] = []
+        chunk_count = -(-file_size // self.chunk_size)
+
+        async def send(index: int, chunk: bytes, chunk_hash: str) -> None:
+            try:
+                await self._upload_chunk_with_retry(upload_id, chunk, index, chunk_hash)
+            except ShelbyError as e:
+                failures[index] = e
+            else:
+                acknowledged.add(index)
+                if self.journal is not None:
+                    self.journal.acknowledge(upload_id, index)
+                if progress_callback:
+                    await progress_callback(len(acknowledged))
+            finally:
+                window.release()
+
+        metrics = self.client.metrics
+
+        def read_block(f: BinaryIO, index: int) -> tuple[bytes, str]:
+            # Runs off the event loop; hashlib releases the GIL on large buffers
+            with timed(metrics, "shelby_disk_seconds", operation="read"):
+                f.seek(index * self.chunk_size)
+                chunk = f.read(self.chunk_size)
+            with timed(metrics, "shelby_chunk_hash_seconds", direction="upload"):
+                if file_hasher is not None:
+                    file_hasher.update(chunk)
+                return chunk, hashlib.sha256(chunk).hexdigest()
+
+        try:
+            with open(file_path, "rb") as f:
+                for index in range(chunk_count):
+                    if failures:
+                        break
+                    if index in acknowledged:
+                        if file_hasher is not None:
+                            # Still needed for the file hash, but not resent
+                            await asyncio.to_thread(read_block, f, index)
+                        continue
+
+                    await window.acquire()
+                    if failures:
+                        window.release()
+                        break
+
+                    chunk, chunk_hash = await asyncio.to_thread(read_block, f, index)
+                    tasks.append(asyncio.create_task(send(index, chunk, chunk_hash)))
+
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if failures:
+            if entry is not None and all(
+                getattr(e, "status_code", None) == 404 for e in failures.values()
+            ):
+                return await self._restart(file_path, account_name, metadata, progress_callback,
+                                           upload_id)
+
+            failed = sorted(failures)
+            raise ShelbyUploadError(
+                f"Upload {upload_id} failed for chunks {failed}: {failures[failed[0]]}"
+            )
+
+        missing = set(range(chunk_count)) - acknowledged
+        if missing:
+            raise ShelbyUploadError(
+                f"Upload {upload_id} missing acknowledgement for chunks {sorted(missing)}"
+            )
+
+        if file_hasher is not None:
+            file_hash = file_hasher.hexdigest()
 
         # Finalize upload
-        final_response = await self.client._request(
-            "POST",
-            "upload/finalize",
-            data={
-                "upload_id": upload_id,
-                "file_hash": file_hash,
-            },
-            retries=self.client.config.max_retries,
-        )
+        try:
+            with start_span(self.client.tracer, "finalize", upload_id=upload_id):
+                final_response = await self.client._request(
+                    "POST",
+                    "upload/finalize",
+                    data={
+                        "upload_id": upload_id,
+                        "file_hash": file_hash,
+                    },
+                    retries=self.client.config.max_retries,
+                    api_url=self.client.pinned(upload_id),
+                )
+        except ShelbyConnectionError as e:
+            # Every chunk was journaled but finalize failed earlier, and the
+            # server has since dropped the session
+            if entry is not None and e.status_code == 404:
+                return await self._restart(file_path, account_name, metadata, progress_callback,
+                                           upload_id)
+            raise
+
+        if self.journal is not None:
+            self.journal.complete(upload_id)
 
         return final_response
 
+    async def _restart(
+        self,
+        file_path: str,
+        account_name: str,
+        metadata: Optional[Dict[str, Any]],
+        progress_callback: Optional[Callable[..., Any]],
+        upload_id: str,
+    ) -> Dict[str, Any]:
+        """Forget a journaled upload the server no longer knows and start over"""
+        if self.journal is not None:
+            self.journal.complete(upload_id)
+        return await self.upload_file(file_path, account_name, metadata, progress_callback)
+
+    async def _upload_chunk_with_retry(
+        self,
+        upload_id: str,
+        chunk: bytes,
+        index: int,
+        chunk_hash: Optional[str] = None,
+    ) -> None:
+        """Upload a single chunk, retrying it up to chunk_retries more times"""
+        attempts = self.client.config.chunk_retries + 1
+        with start_span(self.client.tracer, "chunk", index=index, size=len(chunk)) as span:
+            for attempt in range(attempts):
+                if span is not None:
+                    span.set_attribute("attempts", attempt + 1)
+                try:
+                    await self._upload_chunk(upload_id, chunk, index, chunk_hash)
+                    return
+                except ShelbyError:
+                    if attempt == attempts - 1:
+                        raise
+
     async def _upload_chunk(
         self,
         upload_id: str,
         chunk: bytes,
         index: int,
-        progress_callback: Optional[callable] = None,
-    ):
+        chunk_hash: Optional[str] = None,
+    ) -> None:
         """Upload a single chunk"""
-        chunk_hash = hashlib.sha256(chunk).hexdigest()
+        metrics = self.client.metrics
+        with tracked(metrics, "shelby_chunks_in_flight", direction="upload"), \
+                timed(metrics, "shelby_chunk_duration_seconds", direction="upload"):
+            if chunk_hash is None:
+                with timed(metrics, "shelby_chunk_hash_seconds", direction="upload"):
+                    chunk_hash = hashlib.sha256(chunk).hexdigest()
+            await self._send_chunk(upload_id, chunk, index, chunk_hash)
+
+    async def _send_chunk(
+        self, upload_id: str, chunk: bytes, index: int, chunk_hash: str
+    ) -> None:
+        """Send a chunk as binary, falling back to hex JSON"""
+        if await self.client.supports_binary_transfer():
+            try:
+                await self.client._send(
+                    "POST",
+                    "upload/chunk",
+                    content=chunk,
+                    headers={
+                        "Content-Type": "application/octet-stream",
+                        "X-Upload-Id": upload_id,
+                        "X-Chunk-Index": str(index),
+                        "X-Chunk-Hash": chunk_hash,
+                    },
+                    retries=self.client.config.max_retries,
+                    api_url=self.client.pinned(upload_id),
+                )
+                return
+            except ShelbyConnectionError as e:
+                if e.status_code != 415:
+                    raise
+                # Server advertised binary chunks but rejects them
+                self.client.disable_binary_transfer()
 
         await self.client._request(
             "POST",
@@ -109,11 +350,9 @@ class UploadManager:
                 "chunk_hash": chunk_hash,
             },
             retries=self.client.config.max_retries,
+            api_url=self.client.pinned(upload_id),
         )
 
-        if progress_callback:
-            await progress_callback(index + 1)
-
     async def _hash_file(self, file_path: str) -> str:
         """Calculate SHA-256 hash of file"""
         sha256 = hashlib.sha256()
@@ -132,31 +371,125 @@ class UploadManager:
         file_paths: list[str],
         account_name: str,
         metadata: Optional[Dict[str, Any]] = None,
+        progress_callback: Optional[Callable[..., Any]] = None,
     ) -> list[Dict[str, Any]]:
         """Upload multiple files in batch
 
+        Files upload concurrently; see iter_batch_upload for scheduling.
+
         Args:
             file_paths: List of file paths to upload
             account_name: Account name to upload to
             metadata: Optional metadata for files
+            progress_callback: Optional callback receiving
+                (bytes_uploaded, bytes_total) across the whole batch
 
         Returns:
-            List of upload results
+            List of upload results, in the order of file_paths
+        """
+        results: Dict[int, Dict[str, Any]] = {}
+        async for position, result in self._run_batch(
+            file_paths, account_name, metadata, progress_callback
+        ):
+            results[position] = result
+
+        return [results[position] for position in range(len(file_paths))]
+
+    async def iter_batch_upload(
+        self,
+        file_paths: list[str],
+        account_name: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        progress_callback: Optional[Callable[..., Any]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Upload multiple files, yielding each result as its file completes
+
+        At most config.max_concurrent_files files upload at once, and the
+        files in flight may not add up to more than
+        config.max_batch_bytes_in_flight (a larger file runs on its own).
+        The largest file that fits the remaining byte budget starts first,
+        so small files fill the gaps left by large ones.
+
+        Args:
+            file_paths: List of file paths to upload
+            account_name: Account name to upload to
+            metadata: Optional metadata for files
+            progress_callback: Optional callback receiving
+                (bytes_uploaded, bytes_total) across the whole batch
+
+        Yields:
+            Upload results in completion order
         """
-        results = []
-        for file_path in file_paths:
+        async for _, result in self._run_batch(
+            file_paths, account_name, metadata, progress_callback
+        ):
+            yield result
+
+    async def _run_batch(
+        self,
+        file_paths: list[str],
+        account_name: str,
+        metadata: Optional[Dict[str, Any]],
+        progress_callback: Optional[Callable[..., Any]],
+    ) -> AsyncIterator[tuple[int, Dict[str, Any]]]:
+        """Schedule batch uploads and yield (position, result) as they finish"""
+        config = self.client.config
+        sizes = [
+            os.path.getsize(path) if os.path.isfile(path) else 0 for path in file_paths
+        ]
+        budget = max(1, config.max_batch_bytes_in_flight)
+        max_files = max(1, config.max_concurrent_files)
+        total_bytes = sum(sizes)
+        uploaded = [0] * len(file_paths)
+
+        async def upload_one(position: int) -> Dict[str, Any]:
+            file_path = file_paths[position]
+
+            async def file_progress(chunks_done: int) -> None:
+                uploaded[position] = min(chunks_done * self.chunk_size, sizes[position])
+                if progress_callback:
+                    await progress_callback(sum(uploaded), total_bytes)
+
             try:
-                result = await self.upload_file(file_path, account_name, metadata)
-                results.append({
+                result = await self.upload_file(
+                    file_path, account_name, metadata, file_progress
+                )
+                return {
                     "file": file_path,
                     "status": "success",
                     "result": result,
-                })
-            except ShelbyUploadError as e:
-                results.append({
+                }
+            except ShelbyError as e:
+                return {
                     "file": file_path,
                     "status": "failed",
                     "error": str(e),
-                })
+                }
+
+        pending = sorted(range(len(file_paths)), key=lambda p: sizes[p], reverse=True)
+        running: Dict[asyncio.Task, tuple[int, int]] = {}
+        bytes_in_flight = 0
+        try:
+            while pending or running:
+                while pending and len(running) < max_files:
+                    fits = [p for p in pending if min(sizes[p], budget) <= budget - bytes_in_flight]
+                    if fits:
+                        position = fits[0]
+                    elif not running:
+                        position = pending[0]
+                    else:
+                        break
+
+                    pending.remove(position)
+                    reserved = min(sizes[position], budget)
+                    bytes_in_flight += reserved
+                    running[asyncio.create_task(upload_one(position))] = (position, reserved)
 
-        return results
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    position, reserved = running.pop(task)
+                    bytes_in_flight -= reserved
+                    yield position, task.result()
+        finally:
+            for task in running:
+                task.cancel()
@@ -6,6 +6,8 @@ import pytest
 import sys
 from pathlib import Path
 
+from shelby_sdk.testing import StandInServer
+
 
 def pytest_configure(config):
     """Configure pytest with custom markers"""
@@ -27,3 +29,17 @@ def test_file(test_data_dir):
     file_path = test_data_dir / "test_file.txt"
     file_path.write_text("Test content for upload")
     return str(file_path)
+
+
+@pytest.fixture
+def stand_in_server():
+    """Run a local stand-in Shelby API for the duration of a test"""
+    with StandInServer(chunk_size=1024) as server:
+        yield server
+
+
+@pytest.fixture
+def legacy_server():
+    """Run a stand-in Shelby API that only speaks hex JSON chunks"""
+    with StandInServer(chunk_size=1024, legacy=True) as server:
+        yield server
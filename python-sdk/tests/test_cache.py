@@ -0,0 +1,92 @@
+"""
+Tests for the metadata cache
+"""
+
+import pytest
+from shelby_sdk import (
+    ShelbyClient,
+    ShelbyConfig,
+    BlobManager,
+    AccountManager,
+    MetadataCache,
+)
+
+
+@pytest.fixture
+async def client():
+    """Fixture for test client"""
+    config = ShelbyConfig(
+        api_url="https://test-api.shelby.io",
+        rpc_url="https://test-rpc.shelby.io",
+    )
+    return ShelbyClient(config)
+
+
+def test_cache_expires_and_evicts(mocker):
+    """Test entries expire after their resource TTL and the LRU entry is evicted"""
+    clock = mocker.patch("shelby_sdk.cache.time.monotonic", return_value=100.0)
+    cache = MetadataCache(max_entries=2, ttls={"blob": 10.0, "account": 100.0})
+
+    cache.set("blob", ("a",), {"id": "a"})
+    cache.set("account", ("alice",), {"name": "alice"})
+    assert cache.get("blob", ("a",)) == {"id": "a"}
+
+    # "account" is now least recently used
+    cache.set("blob", ("b",), {"id": "b"})
+    assert cache.get("account", ("alice",)) is None
+
+    clock.return_value = 111.0
+    assert cache.get("blob", ("a",)) is None
+
+    assert cache.stats == {
+        "hits": 1, "misses": 2, "evictions": 1, "expirations": 1, "size": 1,
+    }
+
+
+def test_cache_returns_copies():
+    """Test callers can't mutate cached values"""
+    cache = MetadataCache()
+    value = {"tags": ["x"]}
+    cache.set("blob", ("a",), value)
+
+    value["tags"].append("y")
+    cache.get("blob", ("a",))["tags"].append("z")
+
+    assert cache.get("blob", ("a",)) == {"tags": ["x"]}
+
+
+@pytest.mark.asyncio
+async def test_blob_manager_caches_and_invalidates(client, mocker):
+    """Test blob lookups hit the cache until the blob changes"""
+    cache = MetadataCache()
+    blobs = BlobManager(client, cache=cache)
+    request = mocker.patch.object(client, "_request", return_value={"id": "blob1"})
+
+    await blobs.get_blob("blob1")
+    await blobs.get_blob("blob1")
+    await blobs.get_blob_metadata("blob1", "alice")
+    await blobs.get_blob_metadata("blob1", "alice")
+    assert request.call_count == 2
+
+    await blobs.update_blob_metadata("blob1", "alice", {"k": "v"})
+    await blobs.get_blob("blob1")
+    await blobs.get_blob_metadata("blob1", "alice")
+    assert request.call_count == 5
+    assert cache.stats["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_account_manager_caches_address(client, mocker):
+    """Test get_address reuses the cached account until it is funded"""
+    accounts = AccountManager(client, cache=MetadataCache())
+    request = mocker.patch.object(
+        client, "_request", return_value={"name": "alice", "address": "0xabc"}
+    )
+
+    assert await accounts.get_address("alice") == "0xabc"
+    assert await accounts.get_address("alice") == "0xabc"
+    assert request.call_count == 1
+
+    await accounts.fund_account("alice", 10)
+    await accounts.get_account("alice")
+    assert request.call_count == 3
@@ -0,0 +1,88 @@
+"""
+Tests for the on-disk chunk cache
+"""
+
+import pytest
+import hashlib
+import os
+from shelby_sdk import ShelbyClient, ShelbyConfig, DownloadManager, ChunkCache, Metrics
+
+
+def _chunk(seed: int, size: int = 100) -> tuple:
+    data = bytes([seed]) * size
+    return hashlib.sha256(data).hexdigest(), data
+
+
+def test_chunk_cache_hit_and_miss(tmp_path):
+    """Test a stored chunk is returned and an unknown hash is a miss"""
+    metrics = Metrics()
+    cache = ChunkCache(str(tmp_path), metrics=metrics)
+    chunk_hash, data = _chunk(1)
+
+    assert cache.get(chunk_hash) is None
+    cache.put(chunk_hash, data)
+    assert cache.get(chunk_hash) == data
+    assert os.path.exists(tmp_path / chunk_hash[:2] / chunk_hash)
+
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
+    assert metrics.value("shelby_chunk_cache_requests_total", result="hit") == 1
+    assert metrics.value("shelby_chunk_cache_requests_total", result="miss") == 1
+
+
+def test_chunk_cache_corrupt_file_is_a_miss(tmp_path):
+    """Test a chunk that no longer matches its hash is dropped"""
+    cache = ChunkCache(str(tmp_path))
+    chunk_hash, data = _chunk(2)
+    cache.put(chunk_hash, data)
+    (tmp_path / chunk_hash[:2] / chunk_hash).write_bytes(b"bit rot")
+
+    assert cache.get(chunk_hash) is None
+    assert not (tmp_path / chunk_hash[:2] / chunk_hash).exists()
+
+
+def test_chunk_cache_evicts_least_recently_used(tmp_path):
+    """Test the budget is kept by evicting the chunks used longest ago"""
+    cache = ChunkCache(str(tmp_path), max_bytes=350)
+    chunks = [_chunk(seed) for seed in range(3)]
+    for age, (chunk_hash, data) in enumerate(chunks):
+        cache.put(chunk_hash, data)
+        path = tmp_path / chunk_hash[:2] / chunk_hash
+        os.utime(path, (1000 + age, 1000 + age))
+
+    # A hit makes the oldest chunk the newest
+    assert cache.get(chunks[0][0]) == chunks[0][1]
+    new_hash, new_data = _chunk(9)
+    cache.put(new_hash, new_data)
+
+    assert cache.get(chunks[1][0]) is None
+    assert cache.get(chunks[0][0]) is not None
+    assert cache.get(new_hash) is not None
+    assert cache.size <= 350
+    assert cache.stats["evictions"] >= 1
+
+    # A fresh instance sees what another process left behind
+    assert ChunkCache(str(tmp_path)).size == cache.size
+
+
+@pytest.mark.asyncio
+async def test_download_is_served_from_chunk_cache(stand_in_server, tmp_path):
+    """Test a repeated download fetches no chunks"""
+    data = os.urandom(4096)
+    blob_id = stand_in_server.add_blob(data, name="cached.bin")
+    config = ShelbyConfig(
+        api_url=stand_in_server.url,
+        rpc_url=stand_in_server.url,
+        chunk_cache_dir=str(tmp_path / "chunks"),
+    )
+    async with ShelbyClient(config) as client:
+        downloader = DownloadManager(client)
+        await downloader.download_file(blob_id, str(tmp_path / "first.bin"), "default")
+        fetched = stand_in_server.count_requests("GET", f"/blob/{blob_id}/chunk")
+        assert fetched == 4
+
+        await downloader.download_file(blob_id, str(tmp_path / "second.bin"), "default")
+
+    assert stand_in_server.count_requests("GET", f"/blob/{blob_id}/chunk") == fetched
+    assert (tmp_path / "second.bin").read_bytes() == data
+    assert downloader.chunk_cache.stats["hits"] == 4
@@ -3,8 +3,19 @@ Tests for Shelby Client
 """
 
 import pytest
+import asyncio
+import time
 import httpx
-from shelby_sdk import ShelbyClient, ShelbyConfig, ShelbyConnectionError
+from shelby_sdk import (
+    ShelbyClient,
+    ShelbyConfig,
+    BlobManager,
+    ShelbyConnectionError,
+    ShelbyCircuitOpenError,
+    RetryPolicy,
+    RetryBudget,
+)
+from shelby_sdk.retry import parse_retry_after
 
 
 @pytest.fixture
@@ -94,3 +105,300 @@ async def test_client_close(client):
     """Test client closes session"""
     await client.close()
     assert client.session.is_closed
+
+
+@pytest.mark.asyncio
+async def test_capabilities_negotiation(stand_in_server, legacy_server):
+    """Test binary transfer is negotiated and old servers fall back to hex"""
+    for server, expected in ((stand_in_server, True), (legacy_server, False)):
+        client = ShelbyClient(ShelbyConfig(api_url=server.url, rpc_url=server.url))
+        assert await client.supports_binary_transfer() is expected
+        await client.supports_binary_transfer()
+        assert server.count_requests("GET", "/capabilities") == 1
+        await client.close()
+
+    forced = ShelbyClient(ShelbyConfig(
+        api_url=stand_in_server.url, rpc_url=stand_in_server.url, transfer_mode="hex"
+    ))
+    assert await forced.supports_binary_transfer() is False
+    await forced.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_and_timeout_settings_applied():
+    """Test pool limits and per-phase timeouts reach the HTTP session"""
+    client = ShelbyClient(ShelbyConfig(
+        api_url="https://test-api.shelby.io",
+        rpc_url="https://test-rpc.shelby.io",
+        timeout=10,
+        connect_timeout=2,
+        pool_timeout=1,
+        max_connections=7,
+        max_keepalive_connections=3,
+        keepalive_expiry=12.0,
+    ))
+
+    timeout = client.session.timeout
+    assert (timeout.connect, timeout.read, timeout.write, timeout.pool) == (2, 10, 10, 1)
+    pool = client.session._transport._pool
+    assert pool._max_connections == 7
+    assert pool._max_keepalive_connections == 3
+    assert pool._keepalive_expiry == 12.0
+    await client.close()
+
+
+def test_config_from_env_reads_timeouts_and_retry_settings(monkeypatch):
+    """Test phase timeouts and the retry, coalescing and routing knobs come from the env"""
+    monkeypatch.setenv("SHELBY_CONNECT_TIMEOUT", "2")
+    monkeypatch.setenv("SHELBY_POOL_TIMEOUT", "1.5")
+    monkeypatch.setenv("SHELBY_RETRY_BASE_DELAY", "0.1")
+    monkeypatch.setenv("SHELBY_RETRY_BUDGET_RATIO", "0.5")
+    monkeypatch.setenv("SHELBY_COALESCE_GETS", "false")
+    monkeypatch.setenv("SHELBY_ENDPOINT_EJECTION_TIME", "5")
+    config = ShelbyConfig.from_env()
+
+    assert (config.connect_timeout, config.read_timeout, config.pool_timeout) == (2.0, None, 1.5)
+    assert config.retry_base_delay == 0.1
+    assert config.retry_max_delay == 30.0
+    assert config.retry_budget_ratio == 0.5
+    assert config.coalesce_gets is False
+    assert config.endpoint_failure_threshold == 3
+    assert config.endpoint_ejection_time == 5.0
+
+
+@pytest.mark.asyncio
+async def test_prewarm_opens_connections(stand_in_server):
+    """Test entering the client pre-opens pooled connections"""
+    config = ShelbyConfig(
+        api_url=stand_in_server.url,
+        rpc_url=stand_in_server.url,
+        prewarm_connections=4,
+    )
+
+    async with ShelbyClient(config) as client:
+        assert stand_in_server.count_requests("GET", "/health") == 4
+        assert len(client.session._transport._pool.connections) == 4
+
+    assert client.session.is_closed
+
+
+def _response(status_code, headers=None, json=None):
+    """Build a real httpx response bound to a request"""
+    request = httpx.Request("GET", "https://test-api.shelby.io/test")
+    return httpx.Response(status_code, headers=headers, json=json, request=request)
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_status_fails_fast(client, mocker):
+    """Test client errors such as 404 are not retried"""
+    get = mocker.patch.object(client.session, "get", return_value=_response(404))
+    sleep = mocker.patch("asyncio.sleep")
+
+    with pytest.raises(ShelbyConnectionError) as exc_info:
+        await client._request("GET", "blob/missing", retries=3)
+
+    assert exc_info.value.status_code == 404
+    assert get.call_count == 1
+    sleep.assert_not_called()
+    assert client.retry_stats["give_ups"] == 0
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_honored(client, mocker):
+    """Test a 503 with Retry-After waits the advertised time, then succeeds"""
+    mocker.patch.object(
+        client.session, "get",
+        side_effect=[
+            _response(503, headers={"Retry-After": "7"}),
+            _response(200, json={"ok": True}),
+        ],
+    )
+    sleep = mocker.patch("asyncio.sleep")
+
+    assert await client._request("GET", "stats") == {"ok": True}
+    sleep.assert_awaited_once_with(7.0)
+    assert client.retry_stats["attempts"] == 2
+    assert client.retry_stats["retries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_and_per_call_policy(client, mocker):
+    """Test the retry budget caps retries and policies can be overridden per call"""
+    get = mocker.patch.object(client.session, "get", return_value=_response(500))
+    mocker.patch("asyncio.sleep")
+
+    client.retry_budget = RetryBudget(ratio=0.0, min_retries_per_second=0.0)
+    with pytest.raises(ShelbyConnectionError, match="budget exhausted"):
+        await client._request("GET", "stats")
+    assert get.call_count == 1
+    assert client.retry_stats["budget_exhausted"] == 1
+
+    client.retry_budget = RetryBudget(ratio=1.0)
+    with pytest.raises(ShelbyConnectionError):
+        await client._request("GET", "stats", retry_policy=RetryPolicy(max_retries=1))
+    assert get.call_count == 3
+    assert client.retry_stats["give_ups"] == 2
+
+
+def test_full_jitter_backoff_and_retry_after_parsing():
+    """Test backoff stays within its exponential cap and Retry-After parses"""
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+    for attempt in range(6):
+        assert 0 <= policy.backoff(attempt) <= min(5.0, 2 ** attempt)
+
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_opens_per_family_and_recovers(client, mocker):
+    """Test failing families fail fast, others are unaffected, and half-open recovers"""
+    client.config.circuit_breaker = True
+    client.config.breaker_failure_threshold = 3
+    client.config.breaker_reset_timeout = 0.05
+    client.retry_budget = RetryBudget(ratio=10.0)
+    get = mocker.patch.object(client.session, "get", return_value=_response(503))
+    mocker.patch("asyncio.sleep")
+
+    # The call's own retries open the circuit: its last real error surfaces
+    with pytest.raises(ShelbyConnectionError) as exc_info:
+        await client._request("GET", "blob/abc", retries=5)
+    assert not isinstance(exc_info.value, ShelbyCircuitOpenError)
+    assert exc_info.value.status_code == 503
+    assert isinstance(exc_info.value.__cause__, httpx.HTTPStatusError)
+    assert get.call_count == 3
+    assert client.retry_stats["attempts"] == 3
+    assert client.retry_stats["retries"] == 2
+    assert client.breaker_states()["blob"]["state"] == "open"
+
+    with pytest.raises(ShelbyCircuitOpenError) as exc_info:
+        await client._request("GET", "blob/other")
+    assert exc_info.value.family == "blob"
+    assert get.call_count == 3
+
+    get.return_value = _response(200, json={"total_uploads": 1})
+    assert await client._request("GET", "stats") == {"total_uploads": 1}
+
+    time.sleep(0.06)
+    assert client.breaker_states()["blob"]["state"] == "half_open"
+    get.return_value = _response(200, json={"id": "abc"})
+    assert await client._request("GET", "blob/abc") == {"id": "abc"}
+    assert client.breaker_states()["blob"]["state"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_trip_breaker(client, mocker):
+    """Test 4xx responses count as a healthy server"""
+    client.config.circuit_breaker = True
+    client.config.breaker_failure_threshold = 2
+    mocker.patch.object(client.session, "get", return_value=_response(404))
+
+    for _ in range(5):
+        with pytest.raises(ShelbyConnectionError) as exc_info:
+            await client._request("GET", "account/missing")
+        assert not isinstance(exc_info.value, ShelbyCircuitOpenError)
+
+    assert client.breaker_states()["account"]["state"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_identical_gets_are_coalesced(client, mocker):
+    """Test concurrent identical GETs share one call and get independent results
+
+    GETs with other params, retries or conditional settings are not identical.
+    """
+    release = asyncio.Event()
+
+    async def slow_get(url, params=None, headers=None):
+        await release.wait()
+        return _response(200, json={"id": "abc", "tags": []})
+
+    get = mocker.patch.object(client.session, "get", side_effect=slow_get)
+
+    waiters = [asyncio.create_task(client._request("GET", "blob/abc")) for _ in range(5)]
+    others = [
+        asyncio.create_task(client._request("GET", "blob/abc", params={"v": 2})),
+        asyncio.create_task(client._request("GET", "blob/abc", retries=0)),
+        asyncio.create_task(client._request("GET", "blob/abc", conditional=True)),
+    ]
+    await asyncio.sleep(0)
+    waiters[0].cancel()
+    release.set()
+
+    results = await asyncio.gather(*waiters[1:], *others)
+    assert get.call_count == 4
+    assert client.coalesced_requests == 4
+    assert all(r["id"] == "abc" for r in results)
+    results[0]["tags"].append("mutated")
+    assert results[1]["tags"] == []
+    assert waiters[0].cancelled()
+
+
+@pytest.mark.asyncio
+async def test_coalesced_get_leader_changes_dont_reach_waiters(client, mocker):
+    """Test the caller that started a shared GET can't change what the others get"""
+    async def slow_get(url, params=None, headers=None):
+        await asyncio.sleep(0)
+        return _response(200, json={"name": "blob"})
+
+    mocker.patch.object(client.session, "get", side_effect=slow_get)
+
+    async def first():
+        result = await client._request("GET", "blob/1")
+        result["name"] = "MUTATED"
+        return result
+
+    async def second():
+        await asyncio.sleep(0)  # Joins the shared call, then resumes after first
+        return await client._request("GET", "blob/1")
+
+    changed, other = await asyncio.gather(first(), second())
+    assert client.coalesced_requests == 1
+    assert changed["name"] == "MUTATED"
+    assert other == {"name": "blob"}
+
+
+@pytest.mark.asyncio
+async def test_coalesced_get_errors_reach_every_waiter(client, mocker):
+    """Test a failing shared GET raises in all of its waiters"""
+    async def failing_get(url, params=None, headers=None):
+        await asyncio.sleep(0)
+        return _response(404)
+
+    mocker.patch.object(client.session, "get", side_effect=failing_get)
+
+    results = await asyncio.gather(
+        *(client._request("GET", "account/ghost") for _ in range(3)),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, ShelbyConnectionError) for r in results)
+    assert client.coalesced_requests == 2
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_reuses_unchanged_body(stand_in_server):
+    """Test conditional listings revalidate with If-None-Match and reuse 304s"""
+    stand_in_server.add_blob(b"first", account="alice")
+    config = ShelbyConfig(api_url=stand_in_server.url, rpc_url=stand_in_server.url)
+    async with ShelbyClient(config) as client:
+        blobs = BlobManager(client)
+
+        first = await blobs.list_blobs("alice", conditional=True)
+        first[0]["mutated"] = True
+        second = await blobs.list_blobs("alice", conditional=True)
+        assert second == [{k: v for k, v in first[0].items() if k != "mutated"}]
+        assert client.not_modified_responses == 1
+
+        stand_in_server.add_blob(b"second", account="alice")
+        assert len(await blobs.list_blobs("alice", conditional=True)) == 2
+        assert client.not_modified_responses == 1
+
+        stats = await client.get_stats(conditional=True)
+        assert await client.get_stats(conditional=True) == stats
+        assert client.not_modified_responses == 2
+
+        # Unconditional calls never send validators
+        await client.get_stats()
+        assert client.not_modified_responses == 2
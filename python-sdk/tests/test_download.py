@@ -3,9 +3,13 @@ Tests for Download Manager
 """
 
 import pytest
+import asyncio
+import hashlib
 import httpx
+import os
 
 from shelby_sdk import ShelbyClient, ShelbyConfig, DownloadManager, ShelbyDownloadError
+from shelby_sdk.download import _PartState
 
 
 @pytest.fixture
@@ -35,7 +39,7 @@ async def test_download_file_success(downloader, mocker, test_data_dir):
         downloader.client, "_request",
         return_value={
             "size": 1024,
-            "hash": "test-hash-1234",
+            "hash": hashlib.sha256(b"00" * 512).hexdigest(),
             "chunks": [
                 {"index": 0, "offset": 0, "hash": "chunk0"},
             ],
@@ -49,13 +53,6 @@ async def test_download_file_success(downloader, mocker, test_data_dir):
         return_value=b"00" * 512,  # Mock chunk data
     )
 
-    # Mock hash calculation
-    mocker.patch.object(
-        downloader,
-        "_hash_file",
-        return_value="test-hash-1234",
-    )
-
     await downloader.download_file(
         blob_id="test-blob-123",
         output_path=str(output_path),
@@ -81,20 +78,13 @@ async def test_download_hash_mismatch(downloader, mocker, test_data_dir):
         },
     )
 
-    # Mock chunk download
+    # Mock chunk download whose contents don't match the blob hash
     mocker.patch.object(
         downloader,
         "_download_chunk",
         return_value=b"00" * 512,
     )
 
-    # Mock hash calculation with wrong value
-    mocker.patch.object(
-        downloader,
-        "_hash_file",
-        return_value="wrong-hash",
-    )
-
     with pytest.raises(ShelbyDownloadError, match="Hash mismatch"):
         await downloader.download_file(
             blob_id="test-blob-123",
@@ -143,10 +133,13 @@ async def test_download_with_progress(downloader, mocker, test_data_dir):
     # Mock responses
     mocker.patch.object(
         downloader.client, "_request",
-        return_value={"size": 1024, "hash": "test", "chunks": [{"index": 0, "offset": 0}]},
+        return_value={
+            "size": 1024,
+            "hash": hashlib.sha256(b"00" * 512).hexdigest(),
+            "chunks": [{"index": 0, "offset": 0}],
+        },
     )
     mocker.patch.object(downloader, "_download_chunk", return_value=b"00" * 512)
-    mocker.patch.object(downloader, "_hash_file", return_value="test")
 
     await downloader.download_file(
         blob_id="test-blob",
@@ -156,3 +149,211 @@ async def test_download_with_progress(downloader, mocker, test_data_dir):
     )
 
     assert len(progress_updates) > 0
+
+
+@pytest.mark.asyncio
+async def test_download_binary_and_legacy_transport(stand_in_server, legacy_server, test_data_dir):
+    """Test chunks are decoded from both binary and hex JSON responses"""
+    payload = bytes(range(256)) * 10
+
+    for server in (stand_in_server, legacy_server):
+        blob_id = server.add_blob(payload)
+        client = ShelbyClient(ShelbyConfig(api_url=server.url, rpc_url=server.url))
+        output_path = test_data_dir / f"transport-{server.legacy}.bin"
+
+        await DownloadManager(client).download_file(blob_id, str(output_path), "test-account")
+        await client.close()
+
+        assert output_path.read_bytes() == payload
+
+    assert stand_in_server.traffic()["sent"] < 1.5 * len(payload)
+    assert legacy_server.traffic()["sent"] > 2 * len(payload)
+
+
+@pytest.mark.asyncio
+async def test_download_chunks_concurrently_out_of_order(downloader, mocker, test_data_dir):
+    """Test chunks are fetched in parallel and written at their offsets"""
+    output_path = test_data_dir / "download_parallel.bin"
+    parts = [bytes([i]) * 100 for i in range(8)]
+    payload = b"".join(parts)
+    downloader.client.config.max_concurrent_chunks = 4
+
+    mocker.patch.object(
+        downloader.client, "_request",
+        return_value={
+            "size": len(payload),
+            "hash": hashlib.sha256(payload).hexdigest(),
+            "chunks": [{"index": i, "offset": i * 100} for i in range(8)],
+        },
+    )
+
+    in_flight = 0
+    peak = 0
+
+    async def fake_download_chunk(blob_id, index, account_name, chunk_hash=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Later chunks answer first
+        await asyncio.sleep(0.005 * (8 - index))
+        in_flight -= 1
+        return parts[index]
+
+    mocker.patch.object(downloader, "_download_chunk", side_effect=fake_download_chunk)
+
+    await downloader.download_file("blob-parallel", str(output_path), "test-account")
+
+    assert output_path.read_bytes() == payload
+    assert 1 < peak <= 4
+
+
+@pytest.mark.asyncio
+async def test_download_verifies_hash_without_rereading(downloader, mocker, test_data_dir):
+    """Test the file hash is folded from chunks in offset order, not re-read"""
+    output_path = test_data_dir / "download_no_reread.bin"
+    parts = [bytes([i]) * 64 for i in range(12)]
+    payload = b"".join(parts)
+    downloader.client.config.max_concurrent_chunks = 3
+
+    # Metadata lists chunks out of offset order
+    chunks = [{"index": i, "offset": i * 64} for i in range(12)]
+    mocker.patch.object(
+        downloader.client, "_request",
+        return_value={
+            "size": len(payload),
+            "hash": hashlib.sha256(payload).hexdigest(),
+            "chunks": list(reversed(chunks)),
+        },
+    )
+
+    async def fake_download_chunk(blob_id, index, account_name, chunk_hash=None):
+        await asyncio.sleep(0.002 * (index % 4))
+        return parts[index]
+
+    mocker.patch.object(downloader, "_download_chunk", side_effect=fake_download_chunk)
+    opened = mocker.patch("shelby_sdk.download.open", wraps=open, create=True)
+
+    await downloader.download_file("blob-no-reread", str(output_path), "test-account")
+
+    reads = [call.args[0] for call in opened.call_args_list if call.args[1].startswith("r")]
+    assert str(output_path) not in reads
+    assert f"{output_path}.part" not in reads
+    assert output_path.read_bytes() == payload
+
+
+@pytest.mark.asyncio
+async def test_download_resumes_from_part_file(stand_in_server, mocker, test_data_dir):
+    """Test an interrupted download keeps its progress and fetches only missing chunks"""
+    payload = bytes(range(256)) * 40
+    blob_id = stand_in_server.add_blob(payload)
+    output_path = test_data_dir / "resumed.bin"
+
+    client = ShelbyClient(ShelbyConfig(
+        api_url=stand_in_server.url,
+        rpc_url=stand_in_server.url,
+        max_concurrent_chunks=1,
+    ))
+    downloader = DownloadManager(client)
+    original = downloader._download_chunk
+
+    async def flaky_download_chunk(blob_id, index, account_name, chunk_hash=None):
+        if index == 4:
+            raise ShelbyDownloadError("link dropped")
+        return await original(blob_id, index, account_name)
+
+    mocker.patch.object(downloader, "_download_chunk", side_effect=flaky_download_chunk)
+    with pytest.raises(ShelbyDownloadError):
+        await downloader.download_file(blob_id, str(output_path), "test-account")
+
+    assert not output_path.exists()
+    assert (test_data_dir / "resumed.bin.part").exists()
+
+    mocker.patch.object(downloader, "_download_chunk", side_effect=original)
+    await downloader.download_file(blob_id, str(output_path), "test-account")
+    await client.close()
+
+    assert output_path.read_bytes() == payload
+    assert not (test_data_dir / "resumed.bin.part").exists()
+    assert not (test_data_dir / "resumed.bin.part.json").exists()
+    # 4 chunks before the failure, then the remaining 6
+    assert stand_in_server.count_requests("GET", f"/blob/{blob_id}/chunk") == 10
+
+
+@pytest.mark.asyncio
+async def test_download_batches_part_state_saves(stand_in_server, mocker, test_data_dir):
+    """Test the resume sidecar is saved in batches, not once per chunk"""
+    payload = os.urandom(100 * 1024)
+    blob_id = stand_in_server.add_blob(payload)
+    output_path = test_data_dir / "batched.bin"
+    saves = mocker.spy(_PartState, "save")
+
+    async with ShelbyClient(ShelbyConfig(
+        api_url=stand_in_server.url, rpc_url=stand_in_server.url
+    )) as client:
+        await DownloadManager(client).download_file(blob_id, str(output_path), "test-account")
+
+    assert output_path.read_bytes() == payload
+    # 100 chunks: three batches of 32 plus the final flush
+    assert saves.call_count <= 4
+
+
+@pytest.mark.asyncio
+async def test_batch_download_concurrent_single_metadata_fetch(stand_in_server, test_data_dir):
+    """Test batch downloads run in parallel and fetch each blob's metadata once"""
+    payloads = {f"file_{i}.bin": bytes([i]) * (500 + i) for i in range(6)}
+    blob_ids = [stand_in_server.add_blob(data, name=name) for name, data in payloads.items()]
+
+    client = ShelbyClient(ShelbyConfig(
+        api_url=stand_in_server.url,
+        rpc_url=stand_in_server.url,
+        max_concurrent_files=3,
+    ))
+    downloader = DownloadManager(client)
+
+    streamed = [
+        r async for r in downloader.iter_batch_download(
+            blob_ids, str(test_data_dir / "batch"), "test-account"
+        )
+    ]
+    await client.close()
+
+    assert sorted(r["blob_id"] for r in streamed) == sorted(blob_ids)
+    assert all(r["status"] == "success" for r in streamed)
+    for name, data in payloads.items():
+        assert (test_data_dir / "batch" / name).read_bytes() == data
+
+    metadata_fetches = [
+        path for method, path in stand_in_server.requests
+        if method == "GET" and path.startswith("/blob/") and "/chunk/" not in path
+    ]
+    assert len(metadata_fetches) == len(blob_ids)
+
+
+@pytest.mark.asyncio
+async def test_read_range_fetches_only_overlapping_chunks(stand_in_server):
+    """Test byte ranges map onto the chunk list and fetch nothing else"""
+    data = bytes(range(256)) * 20  # 5 chunks of 1024 bytes
+    blob_id = stand_in_server.add_blob(data, name="ranged.bin")
+
+    async with ShelbyClient(ShelbyConfig(
+        api_url=stand_in_server.url, rpc_url=stand_in_server.url
+    )) as client:
+        downloader = DownloadManager(client)
+
+        # Spans chunks 1 and 2
+        assert await downloader.read_range(blob_id, 1100, 1000, "default") == data[1100:2100]
+        fetched = sorted(
+            path.split("?")[0].rsplit("/", 1)[-1] for method, path in stand_in_server.requests
+            if method == "GET" and "/chunk/" in path
+        )
+        assert fetched == ["1", "2"]
+
+        footer = await downloader.read_range(blob_id, -100, 100, "default", as_memoryview=True)
+        assert isinstance(footer, memoryview)
+        assert footer == data[-100:]
+
+        # Past the end is cut short; an empty range fetches nothing
+        assert await downloader.read_range(blob_id, len(data) - 10, 50, "default") == data[-10:]
+        before = stand_in_server.count_requests("GET", f"/blob/{blob_id}/chunk")
+        assert await downloader.read_range(blob_id, len(data), 10, "default") == b""
+        assert stand_in_server.count_requests("GET", f"/blob/{blob_id}/chunk") == before
@@ -0,0 +1,78 @@
+"""
+Tests for the fsspec filesystem
+"""
+
+import pytest
+import os
+
+pytest.importorskip("fsspec")
+
+from shelby_sdk import ShelbyConfig
+from shelby_sdk.filesystem import ShelbyFileSystem
+
+
+@pytest.fixture
+def fs(stand_in_server):
+    """Filesystem over the stand-in server"""
+    filesystem = ShelbyFileSystem(
+        ShelbyConfig(api_url=stand_in_server.url, rpc_url=stand_in_server.url),
+        block_size=1024,
+        skip_instance_cache=True,
+    )
+    yield filesystem
+    filesystem.close()
+
+
+def _chunk_gets(server) -> int:
+    return sum(1 for method, path in server.requests if method == "GET" and "/chunk/" in path)
+
+
+def test_filesystem_lists_and_reads_blobs(fs, stand_in_server):
+    """Test accounts, blobs by name or ID, and ranged cat"""
+    data = os.urandom(5000)
+    blob_id = stand_in_server.add_blob(data, name="data.csv", account="alice")
+    stand_in_server.add_blob(b"other", name="notes.txt", account="bob")
+
+    assert fs.ls("", detail=False) == ["alice", "bob"]
+    assert fs.ls("shelby://alice", detail=False) == ["alice/data.csv"]
+    assert fs.info("alice/data.csv")["size"] == 5000
+    assert fs.isdir("alice")
+
+    assert fs.cat("shelby://alice/data.csv") == data
+    assert fs.cat_file(f"alice/{blob_id}", start=-100) == data[-100:]
+    assert fs.cat_file("alice/data.csv", start=2000, end=2010) == data[2000:2010]
+    with pytest.raises(FileNotFoundError):
+        fs.cat("alice/missing.csv")
+
+
+def test_filesystem_open_reads_blocks(fs, stand_in_server):
+    """Test opened files fetch only the blocks they read"""
+    data = os.urandom(10 * 1024)
+    stand_in_server.add_blob(data, name="big.bin", account="alice")
+
+    with fs.open("alice/big.bin", "rb") as f:
+        f.seek(4096)
+        assert f.read(100) == data[4096:4196]
+        assert f.read(100) == data[4196:4296]
+    assert _chunk_gets(stand_in_server) == 1
+
+    with pytest.raises(NotImplementedError):
+        fs.open("alice/big.bin", "wb")
+
+
+def test_filesystem_cat_ranges_merges_overlaps(fs, stand_in_server, tmp_path):
+    """Test overlapping ranges of a blob share fetches and results keep order"""
+    first = os.urandom(4096)
+    second = os.urandom(4096)
+    stand_in_server.add_blob(first, name="a.bin", account="alice")
+    stand_in_server.add_blob(second, name="b.bin", account="alice")
+
+    paths = ["alice/a.bin", "alice/b.bin", "alice/a.bin", "alice/missing.bin"]
+    results = fs.cat_ranges(paths, [100, 2100, 50, 0], [200, 2200, 150, 10])
+
+    assert results[:3] == [first[100:200], second[2100:2200], first[50:150]]
+    assert isinstance(results[3], FileNotFoundError)
+    assert _chunk_gets(stand_in_server) == 2
+
+    fs.get("alice/b.bin", str(tmp_path / "b.bin"))
+    assert (tmp_path / "b.bin").read_bytes() == second
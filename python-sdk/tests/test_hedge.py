@@ -0,0 +1,129 @@
+"""
+Tests for hedged chunk requests
+"""
+
+import pytest
+import asyncio
+import hashlib
+from shelby_sdk import ShelbyClient, ShelbyConfig, DownloadManager
+from shelby_sdk.exceptions import ShelbyDownloadError
+from shelby_sdk.hedge import HedgePolicy
+
+
+def _warm_policy(latency: float = 0.01, **kwargs) -> HedgePolicy:
+    """Policy that has already seen enough latencies to hedge"""
+    policy = HedgePolicy(min_samples=5, **kwargs)
+    for _ in range(5):
+        policy.record(latency)
+    # Earn enough requests for the hedge cap
+    policy.stats["requests"] = 100
+    return policy
+
+
+def test_hedge_delay_tracks_percentile():
+    """Test no hedging before min_samples, then the configured percentile"""
+    policy = HedgePolicy(percentile=90, min_samples=10, min_delay=0)
+    assert policy.delay() is None
+    for latency in range(1, 11):
+        policy.record(latency / 100)
+    assert policy.delay() == pytest.approx(0.10)
+
+
+@pytest.mark.asyncio
+async def test_hedge_wins_and_slow_primary_is_cancelled():
+    """Test a slow request is hedged, the hedge wins and the primary is cancelled"""
+    policy = _warm_policy()
+    calls = []
+
+    async def request():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                calls.append("cancelled")
+                raise
+        return "data"
+
+    assert await policy.run(request) == "data"
+    await asyncio.sleep(0)
+    assert "cancelled" in calls
+    assert policy.stats["hedges"] == 1
+    assert policy.stats["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_falls_back_when_one_attempt_fails():
+    """Test an invalid first response doesn't win over a valid second one"""
+    policy = _warm_policy()
+    calls = 0
+
+    async def request():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(0.05)
+            raise ShelbyDownloadError("Chunk 0 hash mismatch")
+        await asyncio.sleep(0.1)
+        return "good"
+
+    assert await policy.run(request) == "good"
+    assert policy.stats["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_rate_is_capped():
+    """Test hedges stop once they exceed max_hedge_ratio of requests"""
+    policy = _warm_policy(max_hedge_ratio=0.0)
+
+    async def request():
+        await asyncio.sleep(0.03)
+        return "slow"
+
+    assert await policy.run(request) == "slow"
+    assert policy.stats["hedges"] == 0
+    assert policy.stats["capped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_download_hedges_slow_chunks(stand_in_server, tmp_path, mocker):
+    """Test DownloadManager hedges through its chunk fetcher when enabled"""
+    data = bytes(range(256)) * 8
+    blob_id = stand_in_server.add_blob(data, name="hedged.bin")
+    config = ShelbyConfig(
+        api_url=stand_in_server.url, rpc_url=stand_in_server.url, hedge_downloads=True
+    )
+    async with ShelbyClient(config) as client:
+        downloader = DownloadManager(client, hedge=_warm_policy())
+        fetch = downloader._fetch_chunk
+        stalled = set()
+
+        async def stall_first_attempt(blob, index, account):
+            if index not in stalled:
+                stalled.add(index)
+                await asyncio.sleep(10)
+            return await fetch(blob, index, account)
+
+        mocker.patch.object(downloader, "_fetch_chunk", side_effect=stall_first_attempt)
+        output = tmp_path / "hedged.bin"
+        await asyncio.wait_for(downloader.download_file(blob_id, str(output), "default"), 5)
+
+    assert hashlib.sha256(output.read_bytes()).digest() == hashlib.sha256(data).digest()
+    assert downloader.hedge.stats["hedge_wins"] == 2
+
+
+@pytest.mark.asyncio
+async def test_hedge_records_winner_latency_from_its_launch():
+    """Test a winning hedge's latency excludes the time waited before hedging"""
+    policy = _warm_policy(latency=0.05)
+    calls = 0
+
+    async def request():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(10 if calls == 1 else 0.01)
+        return "data"
+
+    assert await policy.run(request) == "data"
+    assert policy.stats["hedge_wins"] == 1
+    assert policy._latencies[-1] < 0.05
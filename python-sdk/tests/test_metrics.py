@@ -0,0 +1,65 @@
+"""
+Tests for request and transfer metrics
+"""
+
+import pytest
+from shelby_sdk import ShelbyClient, ShelbyConfig, UploadManager, DownloadManager, Metrics
+
+
+def test_render_prometheus_text():
+    """Test counters, gauges and histograms render in the text exposition format"""
+    metrics = Metrics(buckets=(0.1, 1.0))
+    metrics.inc("shelby_request_retries_total", endpoint="blob")
+    metrics.inc("shelby_requests_in_flight", 2, endpoint='we"ird')
+    metrics.observe("shelby_request_duration_seconds", 0.05, endpoint="blob", status="200")
+    metrics.observe("shelby_request_duration_seconds", 0.5, endpoint="blob", status="200")
+
+    text = metrics.render()
+
+    assert "# TYPE shelby_request_retries_total counter" in text
+    assert 'shelby_request_retries_total{endpoint="blob"} 1' in text
+    assert 'shelby_requests_in_flight{endpoint="we\\"ird"} 2' in text
+    assert "# TYPE shelby_request_duration_seconds histogram" in text
+    assert 'shelby_request_duration_seconds_bucket{endpoint="blob",status="200",le="0.1"} 1' in text
+    assert 'shelby_request_duration_seconds_bucket{endpoint="blob",status="200",le="1"} 2' in text
+    assert 'shelby_request_duration_seconds_bucket{endpoint="blob",status="200",le="+Inf"} 2' in text
+    assert 'shelby_request_duration_seconds_sum{endpoint="blob",status="200"} 0.55' in text
+    assert text.endswith("\n")
+
+
+def test_metrics_disabled_by_default():
+    """Test clients record nothing unless metrics are enabled"""
+    config = ShelbyConfig(api_url="http://localhost", rpc_url="http://localhost")
+    assert ShelbyClient(config).metrics is None
+    assert ShelbyClient(config, metrics=Metrics()).metrics is not None
+
+
+@pytest.mark.asyncio
+async def test_transfer_metrics(stand_in_server, test_data_dir):
+    """Test uploads and downloads record latency, bytes, hashing and disk time"""
+    path = test_data_dir / "metered.bin"
+    path.write_bytes(bytes(range(256)) * 12)
+    events = []
+    config = ShelbyConfig(api_url=stand_in_server.url, rpc_url=stand_in_server.url)
+    metrics = Metrics(callback=lambda name, value, labels: events.append(name))
+
+    async with ShelbyClient(config, metrics=metrics) as client:
+        uploader = UploadManager(client)
+        uploader.chunk_size = 1024
+        result = await uploader.upload_file(str(path), "alice")
+        await DownloadManager(client).download_file(
+            result["blob_id"], str(test_data_dir / "metered.out"), "alice"
+        )
+
+    assert metrics.count("shelby_chunk_duration_seconds", direction="upload") == 3
+    assert metrics.count("shelby_chunk_duration_seconds", direction="download") == 3
+    assert metrics.count("shelby_chunk_hash_seconds", direction="download") == 3
+    assert metrics.count("shelby_disk_seconds", operation="write") == 3
+    assert metrics.count(
+        "shelby_request_duration_seconds", endpoint="upload", method="POST", status="200"
+    ) == 5
+    assert metrics.value("shelby_bytes_sent_total", endpoint="upload") >= 3072
+    assert metrics.value("shelby_bytes_received_total", endpoint="blob") >= 3072
+    assert metrics.value("shelby_requests_in_flight", endpoint="blob") == 0
+    assert metrics.value("shelby_chunks_in_flight", direction="download") == 0
+    assert "shelby_chunk_hash_seconds" in events
@@ -0,0 +1,80 @@
+"""
+Tests for column-projected Parquet reads
+"""
+
+import pytest
+import io
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from shelby_sdk import ShelbyClient, ShelbyConfig, DownloadManager, ShelbyDownloadError
+from shelby_sdk.parquet import read_parquet, column_ranges
+from shelby_sdk.testing import StandInServer
+
+
+def _parquet_bytes(table, **kwargs) -> bytes:
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, **kwargs)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def table():
+    """Table with many numeric columns, a string column and four row groups"""
+    columns = {f"c{i}": pa.array(range(i, i + 8000)) for i in range(12)}
+    columns["name"] = pa.array([f"row-{j}" for j in range(8000)])
+    return pa.table(columns)
+
+
+@pytest.fixture
+def parquet_server():
+    """Stand-in server with chunks small enough to skip columns"""
+    with StandInServer(chunk_size=4096) as server:
+        yield server
+
+
+@pytest.mark.asyncio
+async def test_read_parquet_fetches_only_projected_columns(parquet_server, table):
+    """Test projected reads match pyarrow and transfer a fraction of the blob"""
+    data = _parquet_bytes(table, row_group_size=2000)
+    blob_id = parquet_server.add_blob(data, name="table.parquet")
+
+    async with ShelbyClient(ShelbyConfig(
+        api_url=parquet_server.url, rpc_url=parquet_server.url
+    )) as client:
+        downloader = DownloadManager(client)
+        projected = await read_parquet(
+            downloader, blob_id, "default", columns=["c3", "name"], row_groups=[1, 2]
+        )
+        sent = parquet_server.traffic()["sent"]
+
+        # A tiny first footer guess still finds the whole footer
+        full = await read_parquet(downloader, blob_id, "default", footer_size=16)
+
+    assert projected.equals(table.select(["c3", "name"]).slice(2000, 4000))
+    assert sent < len(data) / 3
+    assert full.equals(table)
+
+
+def test_column_ranges_cover_selected_column_chunks(table):
+    """Test ranges cover exactly the selected column chunks"""
+    metadata = pq.read_metadata(pa.BufferReader(_parquet_bytes(table, row_group_size=4000)))
+    ranges = column_ranges(metadata, columns=["c0"])
+
+    assert len(ranges) == 2
+    for (start, end), group in zip(ranges, range(2)):
+        column = metadata.row_group(group).column(0)
+        assert end - start == column.total_compressed_size
+    assert len(column_ranges(metadata)) == 2 * 13
+
+
+@pytest.mark.asyncio
+async def test_read_parquet_rejects_non_parquet_blob(parquet_server):
+    """Test a blob without the Parquet magic is refused"""
+    blob_id = parquet_server.add_blob(b"not parquet at all", name="notes.txt")
+    async with ShelbyClient(ShelbyConfig(
+        api_url=parquet_server.url, rpc_url=parquet_server.url
+    )) as client:
+        with pytest.raises(ShelbyDownloadError):
+            await read_parquet(DownloadManager(client), blob_id, "default")
@@ -0,0 +1,220 @@
+"""
+Tests for client-side rate limiting
+"""
+
+import pytest
+import asyncio
+import os
+import time
+from shelby_sdk import ShelbyClient, ShelbyConfig, UploadManager, DownloadManager
+from shelby_sdk.ratelimit import (
+    TokenBucket, RateLimiter, AdaptiveConcurrencyLimiter, TransferWindow
+)
+from shelby_sdk.download import _OrderedHasher
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_after_burst():
+    """Test a bucket lets its burst through and then paces at its rate"""
+    bucket = TokenBucket(rate=50, burst=5)
+
+    started = time.monotonic()
+    for _ in range(10):
+        await bucket.acquire()
+    elapsed = time.monotonic() - started
+
+    # 5 free, then 5 more at 50/s
+    assert 0.08 <= elapsed < 0.5
+
+
+def test_rate_limiter_overrides_per_family():
+    """Test families get their own buckets and overrides"""
+    limiter = RateLimiter(
+        requests_per_second=10,
+        overrides={"upload": {"bytes_per_second": 1000}},
+    )
+    assert not limiter.limits_bytes("blob")
+    assert limiter.limits_bytes("upload")
+    assert limiter._buckets_for("blob")[0] is not limiter._buckets_for("account")[0]
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_grows_and_backs_off():
+    """Test AIMD: additive growth while saturated, multiplicative cut on overload"""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=8)
+
+    for _ in range(20):
+        await limiter.acquire()
+        await limiter.acquire()
+        started = time.monotonic()
+        limiter.release(started)
+        limiter.release(started)
+    grown = limiter.limit
+    assert grown > 2
+
+    await limiter.acquire()
+    limiter.release(time.monotonic(), overloaded=True)
+    assert limiter.limit == pytest.approx(max(1, grown * 0.5))
+
+    # Requests sent before the cut don't cut again
+    await limiter.acquire()
+    limiter.release(0.0, overloaded=True)
+    assert limiter.limit == pytest.approx(max(1, grown * 0.5))
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_queues_and_hands_over_slots():
+    """Test waiters block at the limit and cancelled waiters don't leak slots"""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+    await limiter.acquire()
+
+    cancelled = asyncio.create_task(limiter.acquire())
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.snapshot() == {"limit": 1, "in_flight": 1, "waiting": 2}
+
+    cancelled.cancel()
+    limiter.release()
+    await waiting
+    assert limiter.snapshot()["in_flight"] == 1
+    assert cancelled.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_client_rate_limits_requests(stand_in_server):
+    """Test the client waits for tokens before sending"""
+    config = ShelbyConfig(
+        api_url=stand_in_server.url,
+        rpc_url=stand_in_server.url,
+        rate_limits={"stats": {"requests_per_second": 20}},
+        adaptive_concurrency=True,
+    )
+    async with ShelbyClient(config) as client:
+        started = time.monotonic()
+        await asyncio.gather(*(client._request("GET", "stats", params={"n": i}) for i in range(30)))
+        elapsed = time.monotonic() - started
+
+        assert elapsed >= 0.4
+        assert client.concurrency_states()["stats"]["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency_sizes_transfers(stand_in_server, tmp_path):
+    """Test transfers grow past max_concurrent_chunks once the limit allows"""
+    config = ShelbyConfig(
+        api_url=stand_in_server.url,
+        rpc_url=stand_in_server.url,
+        max_concurrent_chunks=2,
+        adaptive_concurrency=True,
+        adaptive_max_concurrency=8,
+    )
+    source = tmp_path / "data.bin"
+    source.write_bytes(os.urandom(200 * 1024))
+
+    async with ShelbyClient(config) as client:
+        peaks = {}
+        original = AdaptiveConcurrencyLimiter.acquire
+
+        async def acquire(limiter):
+            await original(limiter)
+            family = next(f for f, l in client.concurrency_limiters.items() if l is limiter)
+            peaks[family] = max(peaks.get(family, 0), limiter.snapshot()["in_flight"])
+
+        AdaptiveConcurrencyLimiter.acquire = acquire
+        try:
+            uploader = UploadManager(client)
+            uploader.chunk_size = 1024
+            result = await uploader.upload_file(str(source), account_name="default")
+            output = tmp_path / "copy.bin"
+            await DownloadManager(client).download_file(result["blob_id"], str(output), "default")
+        finally:
+            AdaptiveConcurrencyLimiter.acquire = original
+
+        assert output.read_bytes() == source.read_bytes()
+        assert peaks["upload"] > 2
+        assert peaks["blob"] > 2
+        assert client.concurrency_states()["upload"]["limit"] <= 8
+
+
+@pytest.mark.asyncio
+async def test_transfer_window_follows_limiter():
+    """Test a window admits as many slots as the limiter's current limit"""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=16)
+    window = TransferWindow(8, limiter)
+
+    await window.acquire()
+    await window.acquire()
+    third = asyncio.ensure_future(window.acquire())
+    await asyncio.sleep(0)
+    assert not third.done()
+
+    limiter.limit = 3.0
+    window.release()
+    await asyncio.sleep(0)
+    assert third.done()
+    assert window._held == 2
+
+    limiter.limit = 64.0
+    assert window.limit == 8
+
+
+@pytest.mark.asyncio
+async def test_throttled_transfers_hold_few_chunks(stand_in_server, tmp_path, mocker):
+    """Test a low adaptive limit bounds the chunks held, not adaptive_max_concurrency"""
+    config = ShelbyConfig(
+        api_url=stand_in_server.url,
+        rpc_url=stand_in_server.url,
+        adaptive_concurrency=True,
+        adaptive_max_concurrency=64,
+    )
+    source = tmp_path / "data.bin"
+    source.write_bytes(os.urandom(100 * 1024))
+
+    async with ShelbyClient(config) as client:
+        for family in ("upload", "blob"):
+            client.concurrency_limiters[family] = AdaptiveConcurrencyLimiter(
+                initial_limit=2, max_limit=2
+            )
+
+        uploader = UploadManager(client)
+        uploader.chunk_size = 1024
+        held = peak_held = 0
+        send_chunk = uploader._upload_chunk_with_retry
+
+        async def counting_send(*args, **kwargs):
+            nonlocal held, peak_held
+            held += 1
+            peak_held = max(peak_held, held)
+            try:
+                return await send_chunk(*args, **kwargs)
+            finally:
+                held -= 1
+
+        mocker.patch.object(uploader, "_upload_chunk_with_retry", side_effect=counting_send)
+        result = await uploader.upload_file(str(source), account_name="default")
+
+        downloader = DownloadManager(client)
+        fetch_chunk = downloader._download_chunk
+
+        async def slow_first_chunk(blob_id, index, account_name, chunk_hash=None):
+            if index == 0:
+                await asyncio.sleep(0.2)
+            return await fetch_chunk(blob_id, index, account_name, chunk_hash)
+
+        mocker.patch.object(downloader, "_download_chunk", side_effect=slow_first_chunk)
+        peak_buffered = 0
+        add = _OrderedHasher.add
+
+        async def counting_add(hasher, position, data):
+            nonlocal peak_buffered
+            peak_buffered = max(peak_buffered, len(hasher._buffer) + 1)
+            await add(hasher, position, data)
+
+        mocker.patch.object(_OrderedHasher, "add", counting_add)
+        output = tmp_path / "copy.bin"
+        await downloader.download_file(result["blob_id"], str(output), "default")
+
+    assert output.read_bytes() == source.read_bytes()
+    assert peak_held <= 2
+    # Chunks behind the slow first one wait in the reorder buffer: 2 * limit
+    assert peak_buffered <= 4
@@ -0,0 +1,83 @@
+"""
+Tests for the seekable blob reader
+"""
+
+import pytest
+import os
+from shelby_sdk import ShelbyClient, ShelbyConfig, DownloadManager
+
+
+def _chunk_gets(server, blob_id: str) -> int:
+    return server.count_requests("GET", f"/blob/{blob_id}/chunk")
+
+
+@pytest.mark.asyncio
+async def test_reader_sequential_reads_prefetch_with_bounded_memory(stand_in_server):
+    """Test small sequential reads see the whole blob through a bounded LRU"""
+    data = os.urandom(10 * 1024)  # 10 chunks
+    blob_id = stand_in_server.add_blob(data, name="seq.bin")
+
+    async with ShelbyClient(ShelbyConfig(
+        api_url=stand_in_server.url, rpc_url=stand_in_server.url
+    )) as client:
+        downloader = DownloadManager(client)
+        async with downloader.open(blob_id, "default", cache_chunks=3, max_readahead=2) as reader:
+            assert reader.size == len(data)
+            pieces = []
+            while True:
+                piece = await reader.read(300)
+                if not piece:
+                    break
+                pieces.append(piece)
+                assert len(reader._cache) <= 3
+            assert reader.tell() == len(data)
+
+    assert b"".join(pieces) == data
+    assert reader.stats["prefetches"] > 0
+    assert _chunk_gets(stand_in_server, blob_id) == 10
+
+
+@pytest.mark.asyncio
+async def test_reader_random_access_does_not_over_fetch(stand_in_server):
+    """Test seeks read the right bytes and fetch only the chunks touched"""
+    data = os.urandom(10 * 1024)
+    blob_id = stand_in_server.add_blob(data, name="random.bin")
+
+    async with ShelbyClient(ShelbyConfig(
+        api_url=stand_in_server.url, rpc_url=stand_in_server.url
+    )) as client:
+        async with DownloadManager(client).open(blob_id, "default") as reader:
+            reader.seek(5000)
+            assert await reader.read(10) == data[5000:5010]
+            assert _chunk_gets(stand_in_server, blob_id) == 1
+
+            reader.seek(-100, os.SEEK_END)
+            buffer = bytearray(200)
+            assert await reader.readinto(buffer) == 100
+            assert buffer[:100] == data[-100:]
+
+            reader.seek(-3000, os.SEEK_CUR)
+            assert await reader.read(10) == data[-3000:-2990]
+            assert _chunk_gets(stand_in_server, blob_id) == 3
+            assert await reader.read(0) == b""
+
+    with pytest.raises(ValueError):
+        reader.seek(0)
+
+
+@pytest.mark.asyncio
+async def test_reader_iterates_lines_across_chunks(stand_in_server):
+    """Test line-delimited blobs stream line by line"""
+    lines = [f"{{\"event\": {i}, \"pad\": \"{'x' * (i % 97)}\"}}\n".encode() for i in range(200)]
+    data = b"".join(lines) + b"no trailing newline"
+    blob_id = stand_in_server.add_blob(data, name="events.jsonl")
+
+    async with ShelbyClient(ShelbyConfig(
+        api_url=stand_in_server.url, rpc_url=stand_in_server.url
+    )) as client:
+        async with DownloadManager(client).open(blob_id, "default") as reader:
+            streamed = [line async for line in reader]
+            reader.seek(0)
+            assert await reader.readline(5) == lines[0][:5]
+
+    assert streamed == lines + [b"no trailing newline"]
@@ -0,0 +1,97 @@
+"""
+Tests for multi-endpoint routing
+"""
+
+import pytest
+import socket
+from shelby_sdk import ShelbyClient, ShelbyConfig, UploadManager
+from shelby_sdk.routing import EndpointRouter
+from shelby_sdk.testing import StandInServer
+
+
+def _dead_url() -> str:
+    """URL of a local port nothing listens on"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def test_router_prefers_fast_endpoints_and_ejects_failing_ones():
+    """Test latency-based choice, ejection after repeated failures and reinstatement"""
+    router = EndpointRouter(["http://a", "http://b"], failure_threshold=2)
+    router.record_success("http://a", 0.200)
+    router.record_success("http://b", 0.050)
+    assert router.choose() == "http://b"
+    assert router.choose(exclude="http://b") == "http://a"
+
+    router.record_failure("http://b")
+    assert router.choose() == "http://b"
+    router.record_failure("http://b")
+    assert router.snapshot()["http://b"]["ejected"]
+    assert router.choose() == "http://a"
+
+    # Everything ejected: fall back to the endpoint due back soonest
+    router.record_failure("http://a")
+    router.record_failure("http://a")
+    assert router.choose() == "http://b"
+
+    router.record_success("http://a", 0.200)
+    assert router.choose() == "http://a"
+
+
+def test_config_accepts_endpoint_list(monkeypatch):
+    """Test api_url takes a list, also from a comma-separated env var"""
+    config = ShelbyConfig(api_url=["http://a", "http://b"], rpc_url="http://rpc")
+    assert config.api_urls == ["http://a", "http://b"]
+
+    monkeypatch.setenv("SHELBY_API_URL", "http://a, http://b")
+    assert ShelbyConfig.from_env().api_urls == ["http://a", "http://b"]
+
+
+@pytest.mark.asyncio
+async def test_requests_fail_over_to_healthy_endpoint(stand_in_server):
+    """Test retries move off a dead endpoint, which is then ejected"""
+    dead = _dead_url()
+    config = ShelbyConfig(
+        api_url=[dead, stand_in_server.url],
+        rpc_url=stand_in_server.url,
+        retry_base_delay=0.01,
+        endpoint_failure_threshold=1,
+        circuit_breaker=False,
+        health_probe_interval=0,
+    )
+    async with ShelbyClient(config) as client:
+        assert await client.get_stats() == {"total_uploads": 0, "total_bytes": 0}
+        assert client.endpoint_states()[dead]["ejected"]
+        assert client.select_endpoint() == stand_in_server.url
+
+        assert await client.probe_endpoints() == {dead: False, stand_in_server.url: True}
+
+
+@pytest.mark.asyncio
+async def test_upload_pinned_to_one_endpoint(stand_in_server, test_data_dir):
+    """Test every request of an upload goes to the endpoint that initialized it"""
+    path = test_data_dir / "pinned.bin"
+    path.write_bytes(bytes(range(256)) * 40)
+
+    with StandInServer(chunk_size=1024) as other:
+        config = ShelbyConfig(
+            api_url=[stand_in_server.url, other.url],
+            rpc_url=stand_in_server.url,
+            health_probe_interval=0,
+        )
+        async with ShelbyClient(config) as client:
+            # Make the second endpoint look faster once the upload started
+            client.router.record_success(stand_in_server.url, 0.001)
+            client.router.record_success(other.url, 0.5)
+            uploader = UploadManager(client)
+
+            async def prefer_other(chunks_done):
+                client.router.record_success(stand_in_server.url, 5.0)
+
+            result = await uploader.upload_file(str(path), "alice", progress_callback=prefer_other)
+
+        assert result["blob_id"] in stand_in_server.blobs
+        assert other.count_requests("POST", "/upload") == 0
+        assert client.pinned("anything") is None
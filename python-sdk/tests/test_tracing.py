@@ -0,0 +1,71 @@
+"""
+Tests for transfer tracing
+"""
+
+import pytest
+import json
+import asyncio
+from shelby_sdk import ShelbyClient, ShelbyConfig, UploadManager, DownloadManager
+from shelby_sdk.tracing import Tracer, InMemoryExporter, current_span
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_across_tasks():
+    """Test child spans, including ones started in new tasks, point at their parent"""
+    exporter = InMemoryExporter()
+    tracer = Tracer(exporter)
+
+    async def child(i):
+        with tracer.span("child", index=i):
+            await asyncio.sleep(0)
+
+    with tracer.span("root") as root:
+        await asyncio.gather(child(0), asyncio.create_task(child(1)))
+        with pytest.raises(ValueError):
+            with tracer.span("failing"):
+                raise ValueError("boom")
+    assert current_span() is None
+
+    by_name = {}
+    for span in exporter.spans:
+        by_name.setdefault(span.name, []).append(span)
+    assert [s.parent_id for s in by_name["child"]] == [root.span_id] * 2
+    assert {s.trace_id for s in exporter.spans} == {root.trace_id}
+    assert by_name["failing"][0].status == "error"
+    assert by_name["failing"][0].error == "ValueError: boom"
+
+
+@pytest.mark.asyncio
+async def test_transfer_phases_traced_to_json_lines(stand_in_server, test_data_dir):
+    """Test uploads and downloads write their phase spans to the trace file"""
+    path = test_data_dir / "traced.bin"
+    path.write_bytes(bytes(range(256)) * 12)
+    trace_file = test_data_dir / "trace.jsonl"
+    config = ShelbyConfig(
+        api_url=stand_in_server.url,
+        rpc_url=stand_in_server.url,
+        trace_file=str(trace_file),
+    )
+
+    async with ShelbyClient(config) as client:
+        uploader = UploadManager(client)
+        uploader.chunk_size = 1024
+        result = await uploader.upload_file(str(path), "alice")
+        await DownloadManager(client).download_file(
+            result["blob_id"], str(test_data_dir / "traced.out"), "alice"
+        )
+
+    spans = [json.loads(line) for line in trace_file.read_text().splitlines()]
+    upload = next(s for s in spans if s["name"] == "upload")
+    download = next(s for s in spans if s["name"] == "download")
+
+    def children(parent):
+        return sorted(s["name"] for s in spans if s["parent_id"] == parent["span_id"])
+
+    assert children(upload) == ["chunk", "chunk", "chunk", "finalize", "init"]
+    assert children(download) == ["chunk", "chunk", "chunk", "metadata", "verify"]
+    assert upload["attributes"]["size"] == 3072
+    assert upload["attributes"]["upload_id"]
+    chunk = next(s for s in spans if s["name"] == "chunk" and s["parent_id"] == upload["span_id"])
+    assert chunk["attributes"]["size"] == 1024
+    assert chunk["attributes"]["attempts"] == 1
@@ -4,11 +4,19 @@ Tests for Upload Manager
 
 import pytest
 import asyncio
+import os
 import httpx
 from pathlib import Path
 import tempfile
 
-from shelby_sdk import ShelbyClient, ShelbyConfig, UploadManager, ShelbyUploadError
+from shelby_sdk import (
+    ShelbyClient,
+    ShelbyConfig,
+    UploadManager,
+    UploadJournal,
+    ShelbyUploadError,
+    ShelbyConnectionError,
+)
 
 
 @pytest.fixture
@@ -102,4 +110,278 @@ async def test_batch_upload(uploader, mocker, test_data_dir):
     assert len(results) == 3
 
 
+@pytest.mark.asyncio
+async def test_upload_chunks_concurrently_within_window(uploader, mocker, test_data_dir):
+    """Test chunks upload in parallel without exceeding the in-flight window"""
+    path = test_data_dir / "windowed.bin"
+    path.write_bytes(b"x" * 40)
+    uploader.chunk_size = 4
+    uploader.client.config.max_concurrent_chunks = 3
+
+    in_flight = 0
+    peak = 0
+    uploaded = []
+
+    async def fake_upload_chunk(upload_id, chunk, index, chunk_hash=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        uploaded.append(index)
+
+    async def fake_request(method, endpoint, data=None, retries=0, api_url=None):
+        if endpoint == "upload/finalize":
+            assert sorted(uploaded) == list(range(10))
+            return {"blob_id": "blob-windowed"}
+        return {"upload_id": "upload-windowed"}
+
+    mocker.patch.object(uploader, "_upload_chunk", side_effect=fake_upload_chunk)
+    mocker.patch.object(uploader.client, "_request", side_effect=fake_request)
+
+    result = await uploader.upload_file(str(path), account_name="test-account")
+
+    assert result["blob_id"] == "blob-windowed"
+    assert 1 < peak <= 3
+
+
+@pytest.mark.asyncio
+async def test_upload_chunk_failure_skips_finalize(uploader, mocker, test_data_dir):
+    """Test a chunk failing after retries is reported and finalize is not called"""
+    path = test_data_dir / "failing.bin"
+    path.write_bytes(b"y" * 16)
+    uploader.chunk_size = 4
+    uploader.client.config.chunk_retries = 2
+
+    attempts = {}
+
+    async def fake_upload_chunk(upload_id, chunk, index, chunk_hash=None):
+        attempts[index] = attempts.get(index, 0) + 1
+        if index == 2:
+            raise ShelbyConnectionError("chunk rejected")
+
+    request = mocker.patch.object(
+        uploader.client, "_request",
+        return_value={"upload_id": "upload-failing"},
+    )
+    mocker.patch.object(uploader, "_upload_chunk", side_effect=fake_upload_chunk)
+
+    with pytest.raises(ShelbyUploadError, match=r"chunks \[2\]"):
+        await uploader.upload_file(str(path), account_name="test-account")
+
+    assert attempts[2] == 3
+    endpoints = [call.args[1] for call in request.call_args_list]
+    assert "upload/finalize" not in endpoints
+
+
+@pytest.mark.asyncio
+async def test_upload_binary_and_legacy_transport(stand_in_server, legacy_server, test_data_dir):
+    """Test chunks go as raw bytes when supported and as hex JSON otherwise"""
+    path = test_data_dir / "transport.bin"
+    payload = bytes(range(256)) * 20
+    path.write_bytes(payload)
+
+    for server, wire_factor in ((stand_in_server, 1), (legacy_server, 2)):
+        client = ShelbyClient(ShelbyConfig(api_url=server.url, rpc_url=server.url))
+        result = await UploadManager(client).upload_file(str(path), "test-account")
+        await client.close()
+
+        assert server.blob_data(result["blob_id"]) == payload
+        received = server.traffic()["received"]
+        assert wire_factor * len(payload) <= received < (wire_factor + 0.5) * len(payload)
+
+
+@pytest.mark.asyncio
+async def test_upload_reads_file_once_with_deferred_hash(stand_in_server, mocker, test_data_dir):
+    """Test the file hash is computed while streaming when the server defers it"""
+    path = test_data_dir / "single-pass.bin"
+    path.write_bytes(b"single pass" * 500)
+
+    client = ShelbyClient(
+        ShelbyConfig(api_url=stand_in_server.url, rpc_url=stand_in_server.url)
+    )
+    uploader = UploadManager(client)
+    hash_file = mocker.spy(uploader, "_hash_file")
+
+    result = await uploader.upload_file(str(path), "test-account")
+    await client.close()
+
+    hash_file.assert_not_called()
+    assert stand_in_server.blob_data(result["blob_id"]) == path.read_bytes()
+
+
+@pytest.mark.asyncio
+async def test_upload_resumes_from_journal(stand_in_server, mocker, test_data_dir):
+    """Test a failed upload resumes and only sends unacknowledged chunks"""
+    path = test_data_dir / "resumable.bin"
+    payload = bytes(range(256)) * 40
+    path.write_bytes(payload)
+
+    client = ShelbyClient(ShelbyConfig(
+        api_url=stand_in_server.url,
+        rpc_url=stand_in_server.url,
+        max_concurrent_chunks=1,
+        chunk_retries=0,
+    ))
+    journal = UploadJournal(str(test_data_dir / "journal.db"))
+    uploader = UploadManager(client, journal=journal)
+    uploader.chunk_size = 1024
+
+    original = uploader._upload_chunk
+
+    async def flaky_upload_chunk(upload_id, chunk, index, chunk_hash=None):
+        if index == 6:
+            raise ShelbyConnectionError("link dropped")
+        await original(upload_id, chunk, index, chunk_hash)
+
+    mocker.patch.object(uploader, "_upload_chunk", side_effect=flaky_upload_chunk)
+    with pytest.raises(ShelbyUploadError):
+        await uploader.upload_file(str(path), "test-account")
+
+    [entry] = journal.list_uploads()
+    assert entry["acknowledged_count"] == 6
+
+    mocker.patch.object(uploader, "_upload_chunk", side_effect=original)
+    result = await uploader.upload_file(str(path), "test-account")
+    await client.close()
+
+    assert stand_in_server.blob_data(result["blob_id"]) == payload
+    assert stand_in_server.count_requests("POST", "/upload/init") == 1
+    assert stand_in_server.count_requests("POST", "/upload/chunk") == 10
+    assert journal.list_uploads() == []
+
+
+@pytest.mark.asyncio
+async def test_upload_restarts_when_server_lost_finalized_session(
+    stand_in_server, mocker, test_data_dir
+):
+    """Test a fully acknowledged upload whose session vanished starts over"""
+    path = test_data_dir / "lost.bin"
+    payload = bytes(range(256)) * 12
+    path.write_bytes(payload)
+
+    client = ShelbyClient(ShelbyConfig(
+        api_url=stand_in_server.url,
+        rpc_url=stand_in_server.url,
+        max_retries=0,
+    ))
+    journal = UploadJournal(str(test_data_dir / "lost.db"))
+    uploader = UploadManager(client, journal=journal)
+    uploader.chunk_size = 1024
+
+    original = client._request
+
+    async def failing_finalize(method, endpoint, *args, **kwargs):
+        if endpoint == "upload/finalize":
+            raise ShelbyConnectionError("finalize dropped", status_code=503)
+        return await original(method, endpoint, *args, **kwargs)
+
+    mocker.patch.object(client, "_request", side_effect=failing_finalize)
+    with pytest.raises(ShelbyConnectionError):
+        await uploader.upload_file(str(path), "test-account")
+    [entry] = journal.list_uploads()
+    assert entry["acknowledged_count"] == 3
+
+    # The server forgets the session before the retry
+    stand_in_server.uploads.clear()
+    mocker.patch.object(client, "_request", side_effect=original)
+    result = await uploader.upload_file(str(path), "test-account")
+    await client.close()
+
+    assert stand_in_server.blob_data(result["blob_id"]) == payload
+    assert stand_in_server.count_requests("POST", "/upload/init") == 2
+    assert journal.list_uploads() == []
+
+
+def test_journal_garbage_collection(test_data_dir):
+    """Test stale and orphaned journal entries are collected"""
+    journal = UploadJournal(str(test_data_dir / "gc.db"))
+    kept = test_data_dir / "kept.bin"
+    kept.write_bytes(b"kept")
+    changed = test_data_dir / "changed.bin"
+    changed.write_bytes(b"before")
+
+    journal.start("upload-kept", str(kept), "acct", "https://api", 4)
+    journal.start("upload-changed", str(changed), "acct", "https://api", 4)
+    journal.acknowledge("upload-kept", 0)
+    changed.write_bytes(b"after the edit")
+
+    assert journal.collect_garbage() == ["upload-changed"]
+    assert [e["upload_id"] for e in journal.list_uploads()] == ["upload-kept"]
+    assert journal.find(str(kept), "acct", "https://api", 4)["acknowledged"] == {0}
+
+    assert journal.collect_garbage(max_age=-1) == ["upload-kept"]
+    assert journal.list_uploads() == []
+    journal.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_upload_limits_and_largest_first(uploader, mocker, test_data_dir):
+    """Test batch uploads respect file and byte limits and start large files first"""
+    sizes = [10, 80, 30, 60, 20]
+    files = []
+    for i, size in enumerate(sizes):
+        path = test_data_dir / f"sized_{i}.bin"
+        path.write_bytes(b"z" * size)
+        files.append(str(path))
+
+    uploader.client.config.max_concurrent_files = 3
+    uploader.client.config.max_batch_bytes_in_flight = 100
+
+    started = []
+    active = {}
+    peaks = {"files": 0, "bytes": 0}
+
+    async def fake_upload_file(file_path, account_name, metadata=None, progress_callback=None):
+        size = os.path.getsize(file_path)
+        started.append(size)
+        active[file_path] = size
+        peaks["files"] = max(peaks["files"], len(active))
+        peaks["bytes"] = max(peaks["bytes"], sum(active.values()))
+        await asyncio.sleep(0.001 * size)
+        del active[file_path]
+        return {"blob_id": f"blob-{size}"}
+
+    mocker.patch.object(uploader, "upload_file", side_effect=fake_upload_file)
+
+    results = await uploader.batch_upload(files, account_name="test-account")
+
+    assert [r["result"]["blob_id"] for r in results] == [f"blob-{size}" for size in sizes]
+    assert started[:2] == [80, 20]
+    assert peaks["files"] <= 3
+    assert peaks["bytes"] <= 100
+
+
+@pytest.mark.asyncio
+async def test_iter_batch_upload_streams_results(stand_in_server, test_data_dir):
+    """Test results are yielded as files complete, with batch-wide progress"""
+    files = []
+    for i, size in enumerate([5000, 300, 2500]):
+        path = test_data_dir / f"stream_{i}.bin"
+        path.write_bytes(bytes([i]) * size)
+        files.append(str(path))
+
+    client = ShelbyClient(
+        ShelbyConfig(api_url=stand_in_server.url, rpc_url=stand_in_server.url)
+    )
+    uploader = UploadManager(client)
+    uploader.chunk_size = 1024
+    progress = []
+
+    async def on_progress(done, total):
+        progress.append((done, total))
+
+    results = [
+        r async for r in uploader.iter_batch_upload(
+            files, "test-account", progress_callback=on_progress
+        )
+    ]
+    await client.close()
+
+    assert sorted(r["file"] for r in results) == sorted(files)
+    assert all(r["status"] == "success" for r in results)
+    assert progress[-1] == (7800, 7800)
+    assert all(a[0] <= b[0] for a, b in zip(progress, progress[1:]))
+
+
 # Removed the broken local tmp_path fixture as we use conftest.py fixtures